@@ -0,0 +1,84 @@
+import asyncio
+import sys
+import time
+from benchmarks.support import report, reset_schema, use_bench_database
+
+# 작성자 키를 email 문자열로 조인할 때와 정수 author_id 로 조인할 때의 인덱스 크기/조인 시간
+# 실행: BENCH_DATABASE_URL=... python -m benchmarks.author_keys [피드 수 (기본 10M)]
+
+USERS = 100000
+RUNS = 3
+
+
+async def load_data(conn, feeds: int):
+    await conn.exec_driver_sql(
+        "INSERT INTO users (email, nickname) "
+        f"SELECT 'user' || g || '@example.com', 'N' || g FROM generate_series(1, {USERS}) g"
+    )
+    await conn.exec_driver_sql(
+        "INSERT INTO feeds (title, author_email, author_id, create_dt) "
+        f"SELECT 't', 'user' || (g % {USERS} + 1) || '@example.com', g % {USERS} + 1, "
+        "now() - g * interval '1 second' "
+        f"FROM generate_series(1, {feeds}) g"
+    )
+    await conn.exec_driver_sql("VACUUM ANALYZE")
+
+
+async def best_ms(conn, statement: str) -> float:
+    best = float("inf")
+    for _ in range(RUNS):
+        started_at = time.perf_counter()
+        await conn.exec_driver_sql(statement)
+        best = min(best, time.perf_counter() - started_at)
+    return best * 1000
+
+
+async def main():
+    feeds = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    engine = use_bench_database()
+    await reset_schema(engine)
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        started_at = time.perf_counter()
+        await load_data(conn, feeds)
+        print(f"loaded {feeds:,} feeds in {time.perf_counter() - started_at:.0f}s")
+
+        for index in ("ix_feeds_author_email_create_dt", "ix_feeds_author_id_create_dt"):
+            size = await conn.exec_driver_sql(f"SELECT pg_relation_size('{index}')")
+            report(index, {"size_mb": size.scalar() / 1024 / 1024})
+
+        for key, condition in (
+            ("email", "u.email = f.author_email"),
+            ("id", "u.id = f.author_id"),
+        ):
+            report(
+                f"full join on {key}",
+                {
+                    "ms": await best_ms(
+                        conn, f"SELECT count(u.nickname) FROM feeds f JOIN users u ON {condition}"
+                    )
+                },
+            )
+
+        # 작성자별 목록 첫 페이지 (list-by-user / mypage) - 사용자 조회 + 인덱스 범위 스캔
+        for key, condition in (
+            ("email", "u.email = f.author_email"),
+            ("id", "u.id = f.author_id"),
+        ):
+            report(
+                f"author page on {key}",
+                {
+                    "ms": await best_ms(
+                        conn,
+                        f"SELECT f.id, u.nickname FROM feeds f JOIN users u ON {condition} "
+                        "WHERE u.nickname = 'N4242' ORDER BY f.create_dt DESC, f.id DESC LIMIT 20",
+                    )
+                },
+            )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
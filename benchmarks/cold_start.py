@@ -0,0 +1,90 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from benchmarks.support import make_client, percentile, report, use_bench_database
+
+# 워커 콜드 스타트 - main import 시간과 lifespan 시작부터 readiness 200 까지의 시간
+# 매 측정마다 새 프로세스를 띄운다 (첫 실행은 빈 스키마에 마이그레이션 적용)
+# 실행: BENCH_DATABASE_URL=... python -m benchmarks.cold_start
+
+RUNS = 10
+READY_TIMEOUT = 30
+
+
+async def boot() -> dict:
+    import config.db
+
+    engine = use_bench_database(
+        pool_size=config.db.DB_POOL_SIZE, max_overflow=config.db.DB_MAX_OVERFLOW
+    )
+    started_at = time.perf_counter()
+    import main
+
+    imported_at = time.perf_counter()
+
+    async with main.app.router.lifespan_context(main.app), make_client(main.app) as client:
+        # 이벤트 루프는 시작 즉시 응답 (liveness)
+        live = await client.get("/health/live")
+        live_at = time.perf_counter()
+        while time.perf_counter() - imported_at < READY_TIMEOUT:
+            response = await client.get("/health/ready")
+            if response.status_code == 200:
+                break
+            await asyncio.sleep(0.005)
+        ready_at = time.perf_counter()
+
+    await engine.dispose()
+    return {
+        "import_ms": (imported_at - started_at) * 1000,
+        "live_ms": (live_at - imported_at) * 1000 if live.status_code == 200 else None,
+        "ready_ms": (ready_at - imported_at) * 1000 if response.status_code == 200 else None,
+    }
+
+
+def run_boot() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.cold_start", "--boot"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONWARNINGS": "ignore"},
+    ).stdout
+    # 앱 로그와 섞이지 않도록 마지막 줄만 결과로 읽는다
+    return json.loads(output.strip().splitlines()[-1])
+
+
+async def drop_schema():
+    engine = use_bench_database()
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("DROP SCHEMA public CASCADE")
+        await conn.exec_driver_sql("CREATE SCHEMA public")
+    await engine.dispose()
+
+
+def main():
+    if sys.argv[1:] == ["--boot"]:
+        print(json.dumps(asyncio.run(boot())))
+        return
+
+    # 빈 스키마에서 첫 시작 (마이그레이션 적용) 후 재시작 (적용 확인만)
+    asyncio.run(drop_schema())
+    report("first boot (migrations)", run_boot())
+
+    results = [run_boot() for _ in range(RUNS)]
+    for key in ("import_ms", "live_ms", "ready_ms"):
+        values = [result[key] for result in results if result[key] is not None]
+        report(
+            f"restart {key}",
+            {
+                "p50": percentile(values, 0.5),
+                "max": max(values),
+                "failed": len(results) - len(values),
+            },
+        )
+
+
+if __name__ == "__main__":
+    main()
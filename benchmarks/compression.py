@@ -0,0 +1,64 @@
+import asyncio
+import time
+from benchmarks.support import make_client, report, reset_schema, signup, use_bench_database
+from config.compression_config import ENCODINGS
+
+# 응답 압축 - 페이지 크기별 전송 바이트와 요청당 CPU 시간
+# dynamic: 요청마다 압축 (list-by-user), cached: 캐시에 보관된 압축 결과 재사용 (list)
+# 실행: BENCH_DATABASE_URL=... python -m benchmarks.compression
+
+FEEDS = 50
+PAGE_SIZES = (10, 20, 50)
+RUNS = 100
+PATHS = {
+    "dynamic": "/api/feed/list-by-user?user_id=1&limit={limit}",
+    "cached": "/api/feed/list?limit={limit}",
+}
+
+
+async def cpu_ms_per_request(client, url: str, headers: dict) -> dict:
+    # 첫 요청은 캐시 적재/압축 결과 생성이므로 제외
+    await client.get(url, headers=headers)
+    cpu = 0.0
+    for _ in range(RUNS):
+        started_at = time.process_time()
+        response = await client.get(url, headers=headers)
+        cpu += time.process_time() - started_at
+    return {
+        "bytes": int(response.headers["content-length"]),
+        "encoding": response.headers.get("content-encoding", "identity"),
+        "cpu_ms": cpu / RUNS * 1000,
+    }
+
+
+async def main():
+    engine = use_bench_database()
+    await reset_schema(engine)
+
+    from main import app
+
+    async with make_client(app) as client:
+        headers = await signup(client, "a")
+        for i in range(FEEDS):
+            await client.post(
+                "/api/feed/create",
+                data={"title": f"title {i}", "content": "some content " * 20},
+                headers=headers[0],
+            )
+
+        # 설치되지 않은 인코딩 (brotli/zstandard) 은 건너뛴다
+        encodings = ["identity", *reversed(ENCODINGS)]
+        for label, path in PATHS.items():
+            for limit in PAGE_SIZES:
+                url = path.format(limit=limit)
+                for encoding in encodings:
+                    report(
+                        f"{label} limit={limit} {encoding}",
+                        await cpu_ms_per_request(client, url, {"Accept-Encoding": encoding}),
+                    )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.support import make_client, report, reset_schema, signup, use_bench_database
+
+# 로깅 설정에 따른 요청 처리량
+# old: 모듈별 basicConfig(DEBUG) + SQL echo (이벤트 루프에서 동기 출력)
+# new: config.logging_config (큐 핸들러, JSON, INFO, 모듈별 레벨)
+# 두 경우 모두 같은 파일에 출력한다
+# 실행: BENCH_DATABASE_URL=... python -m benchmarks.logging_overhead
+
+REQUESTS = 1000
+PATHS = ("/api/feed/list-by-user?user_id=1&limit=20", "/api/feed/read/1")
+
+
+async def run(mode: str, log_path: str):
+    engine = use_bench_database()
+    from main import app
+    from config import logging_config
+
+    log_file = open(log_path, "w")
+    if mode == "old":
+        logging_config.stop_logging()
+        logging.basicConfig(level=logging.DEBUG, stream=log_file, force=True)
+        # echo=True 와 같은 SQL 로그 (stdout 대신 같은 파일로)
+        logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
+    else:
+        logging_config.listener.handlers[0].setStream(log_file)
+
+    # 준비 단계의 로그는 측정에서 제외
+    logging.disable(logging.CRITICAL)
+    await reset_schema(engine)
+    async with make_client(app) as client:
+        headers = await signup(client, "a")
+        for i in range(20):
+            await client.post(
+                "/api/feed/create",
+                data={"title": f"title {i}", "content": "content " * 20},
+                headers=headers[0],
+            )
+        logging.disable(logging.NOTSET)
+        # make_client 가 httpx 로거를 WARNING 으로 올리므로 이전 방식에서는 다시 DEBUG 로
+        if mode == "old":
+            logging.getLogger("httpx").setLevel(logging.DEBUG)
+
+        for path in PATHS:
+            for _ in range(20):
+                await client.get(path)
+            started_at = time.perf_counter()
+            for _ in range(REQUESTS):
+                await client.get(path)
+            elapsed = time.perf_counter() - started_at
+            report(f"{mode} {path}", {"req_per_s": REQUESTS / elapsed})
+
+    logging_config.stop_logging()
+    log_file.close()
+    report(f"{mode} log file", {"bytes": os.path.getsize(log_path)})
+    await engine.dispose()
+
+
+def main():
+    if len(sys.argv) > 1:
+        asyncio.run(run(sys.argv[1], sys.argv[2]))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in ("old", "new"):
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.logging_overhead",
+                    mode,
+                    os.path.join(directory, f"{mode}.log"),
+                ],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
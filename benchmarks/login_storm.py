@@ -0,0 +1,79 @@
+import asyncio
+import time
+from benchmarks.support import (
+    make_client,
+    percentile,
+    report,
+    reset_schema,
+    signup,
+    use_bench_database,
+)
+
+# 로그인이 몰리는 동안 다른 엔드포인트(/health/live)의 지연 시간
+# bcrypt 를 이벤트 루프에서 직접 실행 (이전 방식) vs 스레드 풀 실행 비교
+# 실행: BENCH_DATABASE_URL=... python -m benchmarks.login_storm
+
+LOGINS = 48
+PING_INTERVAL = 0.005
+
+
+async def storm(client) -> dict:
+    latencies = []
+    stop = asyncio.Event()
+
+    async def ping():
+        # 대기 시간도 포함 - 루프가 막혀 늦게 깨어난 만큼 지연으로 잡힌다
+        while not stop.is_set():
+            started_at = time.perf_counter()
+            await asyncio.sleep(PING_INTERVAL)
+            await client.get("/health/live")
+            latencies.append((time.perf_counter() - started_at - PING_INTERVAL) * 1000)
+
+    pinger = asyncio.create_task(ping())
+    started_at = time.perf_counter()
+    responses = await asyncio.gather(
+        *[
+            client.post("/api/auth/login", json={"email": "a@bench.com", "password": "password"})
+            for _ in range(LOGINS)
+        ]
+    )
+    elapsed = time.perf_counter() - started_at
+    stop.set()
+    await pinger
+
+    assert all(response.status_code == 200 for response in responses)
+    return {
+        "logins_per_s": LOGINS / elapsed,
+        "ping_p50_ms": percentile(latencies, 0.5),
+        "ping_p99_ms": percentile(latencies, 0.99),
+        "pings": len(latencies),
+    }
+
+
+async def main():
+    from services import auth_service
+
+    engine = use_bench_database()
+    await reset_schema(engine)
+
+    async with make_client() as client:
+        await signup(client, "a")
+
+        executor_verify = auth_service.verify_password
+
+        async def inline_verify(plain_password, hashed_password):
+            return auth_service.pwd_context.verify(plain_password, hashed_password)
+
+        auth_service.verify_password = inline_verify
+        report("bcrypt on event loop", await storm(client))
+        auth_service.verify_password = executor_verify
+        report(
+            f"bcrypt executor ({auth_service.PASSWORD_HASH_CONCURRENCY} threads)",
+            await storm(client),
+        )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+import asyncio
+import time
+from benchmarks.support import report, reset_schema, use_bench_database
+
+# 목록 조회에서 ORM 엔티티 (select(Feed, ...)) 와 컬럼 projection 의 초당 hydrate 행 수
+# 실행: BENCH_DATABASE_URL=... python -m benchmarks.projection
+
+FEEDS = 5000
+PAGE_SIZE = 1000
+RUNS = 40
+
+
+async def load_data(engine):
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(
+            "INSERT INTO users (email, nickname) VALUES ('author@bench.com', 'AUTHOR')"
+        )
+        await conn.exec_driver_sql(
+            "INSERT INTO feeds (title, content, author_email, author_id, image_urls, "
+            "image_variants, pending_media_ids, create_dt, update_dt) "
+            "SELECT 't' || g, repeat('c', 200), 'author@bench.com', 1, "
+            "json_build_array('https://bench/' || g || '/original.jpg'), "
+            "json_build_object('https://bench/' || g || '/original.jpg', "
+            "json_build_object('thumbnail', json_build_object('webp', 'u'))), "
+            "'[]'::json, now(), now() "
+            f"FROM generate_series(1, {FEEDS}) g"
+        )
+
+
+async def rows_per_second(query) -> float:
+    from config.db import AsyncSessionLocal
+
+    best = float("inf")
+    for _ in range(RUNS):
+        # 세션마다 새 identity map - 요청 하나와 같은 조건
+        async with AsyncSessionLocal() as db:
+            started_at = time.perf_counter()
+            rows = (await db.execute(query)).all()
+            best = min(best, time.perf_counter() - started_at)
+    return len(rows) / best
+
+
+async def main():
+    from sqlalchemy import select
+    from models import comment, like, follow  # noqa: F401 - relationship 설정에 필요
+    from models.feed import Feed, FEED_RESPONSE_COLUMNS
+    from models.user import User
+
+    engine = use_bench_database()
+    await reset_schema(engine)
+    await load_data(engine)
+
+    queries = {
+        "entity select(Feed, nickname)": select(Feed, User.nickname),
+        "columns FEED_RESPONSE_COLUMNS": select(*FEED_RESPONSE_COLUMNS, User.nickname),
+    }
+    # 캐시/플래너 워밍업 순서 영향을 줄이기 위해 번갈아 두 번씩 측정
+    for _ in range(2):
+        for label, query in queries.items():
+            query = query.join(User, User.id == Feed.author_id).order_by(Feed.id).limit(PAGE_SIZE)
+            report(label, {"rows_per_s": await rows_per_second(query)})
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
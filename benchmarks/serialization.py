@@ -0,0 +1,80 @@
+import timeit
+from datetime import datetime, timezone
+from benchmarks.support import report
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+# 목록 응답의 행당 직렬화 비용 (DB 없이 응답 만들기만 측정)
+# 이전: 행마다 FeedResponse 생성 + model_dump -> FeedListResponse 재검증 -> jsonable_encoder
+# 현재: feed_to_response 로 dict 를 한 번 만들고 orjson 으로 바로 직렬화
+# 실행: python -m benchmarks.serialization
+
+PAGE_SIZES = (10, 100, 1000)
+
+
+def make_rows(count: int):
+    from models import user, comment, like, follow  # noqa: F401 - relationship 설정에 필요
+    from models.feed import Feed
+
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(count):
+        image_url = f"https://bucket.s3.amazonaws.com/{i:064x}/original.jpg"
+        variants = {
+            name: {"avif": image_url, "webp": image_url} for name in ("thumbnail", "medium")
+        }
+        feed = Feed(
+            id=i,
+            title=f"title {i}",
+            content="content " * 20,
+            author_email="author@bench.com",
+            image_urls=[image_url],
+            image_variants={image_url: variants},
+            pending_media_ids=[],
+            create_dt=now,
+            update_dt=now,
+            like_count=3,
+        )
+        rows.append((feed, "NICK"))
+    return rows
+
+
+def validated_response(rows) -> bytes:
+    from models.feed import FeedListResponse, FeedResponse, feed_to_response
+
+    feeds = [
+        FeedResponse(**feed_to_response(feed, nickname)).model_dump() for feed, nickname in rows
+    ]
+    content = FeedListResponse(total_count=len(feeds), feeds=feeds, next_cursor=None)
+    # response_model 이 있는 라우트에서 FastAPI 가 하는 검증 + 인코딩
+    content = FeedListResponse.model_validate(content)
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def direct_response(rows) -> bytes:
+    from config.response_config import FastJSONResponse
+    from models.feed import feed_to_response
+
+    feeds = [feed_to_response(feed, nickname) for feed, nickname in rows]
+    return FastJSONResponse({"total_count": len(feeds), "feeds": feeds, "next_cursor": None}).body
+
+
+def per_row_us(fn, rows) -> float:
+    number = max(1, 2000 // len(rows))
+    best = min(timeit.repeat(lambda: fn(rows), number=number, repeat=5))
+    return best / number / len(rows) * 1e6
+
+
+def main():
+    for count in PAGE_SIZES:
+        rows = make_rows(count)
+        before = per_row_us(validated_response, rows)
+        after = per_row_us(direct_response, rows)
+        report(
+            f"{count} rows",
+            {"validated_us_per_row": before, "direct_us_per_row": after, "speedup": before / after},
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import os
+import sys
+import time
+import types
+import logging
+from typing import Awaitable, Callable, List
+
+try:
+    from config import settings  # noqa: F401
+except ImportError:  # settings 가 없는 로컬 환경에서는 기본값으로 실행
+    import config
+
+    config.settings = sys.modules["config.settings"] = types.ModuleType("config.settings")
+
+# 벤치마크용 Postgres - public 스키마를 지우고 다시 만드므로 반드시 전용 DB 를 지정할 것
+# 예: BENCH_DATABASE_URL=postgresql+asyncpg://postgres@localhost:5432/bench python -m benchmarks.timeline
+BENCH_DATABASE_URL = os.environ.get("BENCH_DATABASE_URL")
+
+
+def use_bench_database(**engine_options):
+    # 앱 코드가 쓰는 config.db.engine / AsyncSessionLocal 을 벤치마크 DB 로 교체
+    from sqlalchemy.ext.asyncio import create_async_engine
+    import config.db
+
+    if not BENCH_DATABASE_URL:
+        sys.exit("BENCH_DATABASE_URL is not set")
+    engine = create_async_engine(BENCH_DATABASE_URL, **engine_options)
+    config.db.engine = engine
+    config.db.AsyncSessionLocal.configure(bind=engine)
+    return engine
+
+
+async def reset_schema(engine):
+    from migrations import run_migrations
+
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("DROP SCHEMA public CASCADE")
+        await conn.exec_driver_sql("CREATE SCHEMA public")
+    async with engine.begin() as conn:
+        await conn.run_sync(run_migrations)
+
+
+def make_client(app=None):
+    # lifespan 없이 라우터만 호출 (스키마는 reset_schema 로 준비)
+    import httpx
+
+    if app is None:
+        from main import app
+    # 요청마다 남는 httpx INFO 로그가 측정에 섞이지 않도록
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+
+
+async def signup(client, names: str = "a") -> List[dict]:
+    headers = []
+    for name in names:
+        email = f"{name}@bench.com"
+        await client.post(
+            "/api/auth/signup",
+            json={"email": email, "password": "password", "nickname": name.upper()},
+        )
+        response = await client.post(
+            "/api/auth/login", json={"email": email, "password": "password"}
+        )
+        headers.append({"Authorization": f"Bearer {response.json()['access_token']}"})
+    return headers
+
+
+def percentile(values: List[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def measure(fn: Callable[[], Awaitable], runs: int, warmup: int = 3) -> dict:
+    # 각 실행의 경과 시간(ms) 분포
+    for _ in range(warmup):
+        await fn()
+    elapsed = []
+    for _ in range(runs):
+        started_at = time.perf_counter()
+        await fn()
+        elapsed.append((time.perf_counter() - started_at) * 1000)
+    return {"p50_ms": percentile(elapsed, 0.5), "p99_ms": percentile(elapsed, 0.99)}
+
+
+def report(label: str, result: dict):
+    fields = "  ".join(
+        f"{key}={value:,.3f}" if isinstance(value, float) else f"{key}={value}"
+        for key, value in result.items()
+    )
+    print(f"{label:<40} {fields}")
@@ -0,0 +1,116 @@
+import asyncio
+from benchmarks.support import measure, report, reset_schema, use_bench_database
+
+# 홈 타임라인 (fan-out-on-write 저장소 + 읽을 때 합치는 인기 작성자) 과
+# 매번 follows 를 조인하는 단순 쿼리 비교
+# 실행: BENCH_DATABASE_URL=... python -m benchmarks.timeline
+
+USERS = 10001
+# 1번 사용자는 나머지 모두에게 팔로우되는 인기 작성자 (팔로워 10k - FANOUT_FOLLOWER_LIMIT 초과)
+FOLLOWINGS = 200  # 2번 사용자 (측정 대상) 가 팔로우하는 일반 작성자 수
+# 마지막 사용자는 팔로워가 FANOUT_FOLLOWER_LIMIT 과 같아 실제로 push 하는 가장 큰 작성자
+FEEDS = 200000
+PAGE_SIZE = 20
+RUNS = 200
+
+
+async def load_data(engine, fanout_followers: int):
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(
+            "INSERT INTO users (email, nickname) "
+            f"SELECT 'user' || g || '@bench.com', 'N' || g FROM generate_series(1, {USERS}) g"
+        )
+        await conn.exec_driver_sql(
+            "INSERT INTO follows (follower_id, following_id) "
+            f"SELECT g, 1 FROM generate_series(2, {USERS}) g"
+        )
+        await conn.exec_driver_sql(
+            "INSERT INTO follows (follower_id, following_id) "
+            f"SELECT 2, g FROM generate_series(3, {FOLLOWINGS + 2}) g"
+        )
+        # 측정 대상(2번)이나 그가 팔로우하는 작성자와 겹치지 않는 사용자들이 팔로우
+        await conn.exec_driver_sql(
+            "INSERT INTO follows (follower_id, following_id) "
+            f"SELECT g, {USERS} FROM generate_series({FOLLOWINGS + 3}, "
+            f"{FOLLOWINGS + 2 + fanout_followers}) g"
+        )
+        await conn.exec_driver_sql(
+            "INSERT INTO feeds (title, content, author_email, author_id, create_dt, update_dt) "
+            "SELECT 't' || g, 'content', 'user' || (g % 1000 + 1) || '@bench.com', g % 1000 + 1, "
+            "now() - g * interval '1 second', now() - g * interval '1 second' "
+            f"FROM generate_series(1, {FEEDS}) g"
+        )
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.exec_driver_sql("VACUUM ANALYZE")
+
+
+async def main():
+    from sqlalchemy import select
+    from config.db import AsyncSessionLocal
+    from models.feed import Feed, FEED_RESPONSE_COLUMNS, feed_to_response
+    from models.follow import Follow
+    from models.user import User
+    from services import counter_service, timeline_service
+
+    engine = use_bench_database()
+    await reset_schema(engine)
+    await load_data(engine, timeline_service.FANOUT_FOLLOWER_LIMIT)
+
+    async with AsyncSessionLocal() as db:
+        await counter_service.rebuild_counters(db)
+        reader = await db.get(User, 2)
+        celebrity = await db.get(User, 1)
+        author = await db.get(User, 3)
+        popular_author = await db.get(User, USERS)
+
+        async def naive_join():
+            result = await db.execute(
+                select(*FEED_RESPONSE_COLUMNS, User.nickname)
+                .join(User, User.id == Feed.author_id)
+                .join(Follow, Follow.following_id == Feed.author_id)
+                .where(Follow.follower_id == reader.id)
+                .order_by(Feed.id.desc())
+                .limit(PAGE_SIZE)
+            )
+            return [feed_to_response(feed, feed.nickname) for feed in result.all()]
+
+        async def timeline():
+            return await timeline_service.get_home_timeline(db, reader, PAGE_SIZE)
+
+        async def rebuilt_timeline():
+            await timeline_service.invalidate_timeline(reader.id)
+            return await timeline_service.get_home_timeline(db, reader, PAGE_SIZE)
+
+        report("JOIN follows (naive)", await measure(naive_join, RUNS))
+        report("timeline (store warm)", await measure(timeline, RUNS))
+        report("timeline (rebuild each read)", await measure(rebuilt_timeline, RUNS // 4))
+
+        # 쓰기 비용 - push 는 이미 구성된 타임라인에만 하므로 팔로워의 타임라인을 먼저 채운다
+        feed_id = FEEDS + 1
+        follower_ids = range(
+            FOLLOWINGS + 3, FOLLOWINGS + 3 + timeline_service.FANOUT_FOLLOWER_LIMIT
+        )
+        full_timeline = list(range(FEEDS, FEEDS - timeline_service.TIMELINE_MAX_LENGTH, -1))
+        for user_id in (3, *follower_ids):
+            await timeline_service.timeline_store.replace(user_id, full_timeline)
+
+        async def fan_out(user):
+            await timeline_service.fan_out_feed(db, user, feed_id)
+
+        report("fan-out write (1 follower, push)", await measure(lambda: fan_out(author), RUNS))
+        report(
+            f"fan-out write ({timeline_service.FANOUT_FOLLOWER_LIMIT} followers, push)",
+            await measure(lambda: fan_out(popular_author), RUNS),
+        )
+        # 한도를 넘는 작성자는 팔로워 목록을 읽지 않고 본인 타임라인에만 넣는다
+        report(
+            f"fan-out skip ({USERS - 1} followers, over limit)",
+            await measure(lambda: fan_out(celebrity), RUNS),
+        )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+import io
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from benchmarks.support import report
+from PIL import Image
+
+# 업로드 이미지 변환 (EXIF 제거 + 크기별 변형 + AVIF/WebP 인코딩) 처리량
+# 프로세스 풀 크기별 초당 이미지 수와 코어당 처리량
+# 실행: python -m benchmarks.transcode [이미지 수]
+
+IMAGE_SIZE = (2000, 1500)
+
+
+def make_photo(path: str, seed: int):
+    # 단색 이미지는 너무 쉽게 압축되므로 그라데이션에 약한 노이즈를 섞는다
+    noise = Image.effect_noise(IMAGE_SIZE, 10 + seed % 10).convert("RGB")
+    gradient = Image.linear_gradient("L").resize(IMAGE_SIZE).convert("RGB")
+    photo = Image.blend(noise, gradient, 0.7)
+    buffer = io.BytesIO()
+    photo.save(buffer, format="JPEG", quality=90)
+    with open(path, "wb") as f:
+        f.write(buffer.getvalue())
+
+
+def run(paths, workers: int) -> float:
+    from services.media_service import process_image
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # 프로세스 기동/모듈 import 는 측정에서 제외
+        list(pool.map(process_image, paths[:workers], ["jpeg"] * workers))
+        started_at = time.perf_counter()
+        results = list(pool.map(process_image, paths, ["jpeg"] * len(paths)))
+        elapsed = time.perf_counter() - started_at
+    assert all(results)
+    return elapsed
+
+
+def main():
+    from services.media_service import TRANSCODE_FORMATS
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    cores = os.cpu_count() or 1
+    print(f"{count} images {IMAGE_SIZE[0]}x{IMAGE_SIZE[1]}, formats={TRANSCODE_FORMATS}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i in range(count):
+            path = os.path.join(directory, f"{i}.jpg")
+            make_photo(path, i)
+            paths.append(path)
+
+        workers = 1
+        while True:
+            elapsed = run(paths, workers)
+            report(
+                f"process pool ({workers} workers)",
+                {
+                    "images_per_s": count / elapsed,
+                    "images_per_s_per_worker": count / elapsed / workers,
+                },
+            )
+            if workers >= cores:
+                break
+            workers = min(workers * 2, cores)
+
+
+if __name__ == "__main__":
+    main()
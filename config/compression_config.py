@@ -0,0 +1,146 @@
+from starlette.datastructures import Headers, MutableHeaders
+from config import settings
+from typing import Dict, Optional
+import gzip
+
+try:
+    import brotli
+except ImportError:  # brotli 가 없으면 zstd/gzip 만 사용
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard 가 없으면 br/gzip 만 사용
+    zstandard = None
+
+# 이보다 작은 응답은 압축 이득보다 CPU/헤더 비용이 크다 (bytes)
+COMPRESSION_MIN_SIZE = getattr(settings, "COMPRESSION_MIN_SIZE", 1024)
+# 요청마다 압축하는 응답은 빠른 레벨, 캐시에 보관해 재사용하는 응답은 높은 레벨
+COMPRESSION_LEVELS = {"br": 4, "zstd": 3, "gzip": 5}
+COMPRESSION_CACHED_LEVELS = {"br": 6, "zstd": 9, "gzip": 9}
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+# 클라이언트가 여러 개를 허용하면 앞쪽을 우선
+ENCODINGS = [
+    encoding
+    for encoding, available in (("br", brotli), ("zstd", zstandard), ("gzip", gzip))
+    if available is not None
+]
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    if not accept_encoding:
+        return None
+
+    accepted = set()
+    rejected = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        params = params.replace(" ", "")
+        # q=0 은 명시적으로 거부한 인코딩 - "*" 가 함께 와도 고르지 않는다
+        if params.startswith("q=") and params[2:] in ("0", "0.0", "0.00", "0.000"):
+            rejected.add(name)
+        else:
+            accepted.add(name)
+
+    for encoding in ENCODINGS:
+        if encoding in rejected:
+            continue
+        if encoding in accepted or ("*" in accepted and "*" not in rejected):
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, cached: bool = False) -> bytes:
+    level = (COMPRESSION_CACHED_LEVELS if cached else COMPRESSION_LEVELS)[encoding]
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(body)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class CompressedBody:
+    # 캐시된 응답 본문과 인코딩별 압축 결과 - 한 번 압축하면 만료될 때까지 재사용
+    def __init__(self, body: bytes):
+        self.body = body
+        self._encoded: Dict[str, bytes] = {}
+
+    def encode(self, encoding: str) -> bytes:
+        encoded = self._encoded.get(encoding)
+        if encoded is None:
+            encoded = self._encoded[encoding] = compress(self.body, encoding, cached=True)
+        return encoded
+
+
+def encode_cached(accept_encoding: Optional[str], cached: CompressedBody, headers: dict) -> bytes:
+    # 캐시된 응답은 저장해 둔 압축 결과를 보낸다 (미들웨어는 Content-Encoding 이 있으면 건너뜀)
+    if len(cached.body) < COMPRESSION_MIN_SIZE:
+        return cached.body
+
+    headers["Vary"] = "Accept-Encoding"
+    encoding = negotiate(accept_encoding)
+    if encoding is None:
+        return cached.body
+
+    headers["Content-Encoding"] = encoding
+    return cached.encode(encoding)
+
+
+def compressible(headers, body_size: int) -> bool:
+    return (
+        body_size >= COMPRESSION_MIN_SIZE
+        and "content-encoding" not in headers
+        and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+    )
+
+
+class CompressionMiddleware:
+    # 한 번에 보내는 응답 본문만 압축 (스트리밍 응답은 그대로 통과)
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # 본문을 보기 전까지 헤더 전송을 미룬다
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            if message.get("more_body", False) or not compressible(headers, len(body)):
+                await send(start)
+                await send(message)
+                return
+
+            body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+
+def setup_compression(app):
+    app.add_middleware(CompressionMiddleware)
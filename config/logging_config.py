@@ -0,0 +1,117 @@
+from logging.handlers import QueueHandler, QueueListener
+from datetime import datetime, timezone
+from config import settings
+from typing import Optional
+import logging
+import orjson
+import queue
+import random
+import sys
+
+LOG_LEVEL = getattr(settings, "LOG_LEVEL", "INFO")
+# 모듈(로거 이름)별 레벨 - 라이브러리 로그가 애플리케이션 로그를 덮지 않도록
+LOG_LEVELS = {
+    "sqlalchemy.engine": "WARNING",
+    "botocore": "WARNING",
+    "aiobotocore": "WARNING",
+    **getattr(settings, "LOG_LEVELS", {}),
+}
+# 로거 이름별 샘플링 비율 (0~1) - WARNING 미만 레코드만 샘플링하고 경고/에러는 항상 남긴다
+LOG_SAMPLE_RATES = getattr(settings, "LOG_SAMPLE_RATES", {})
+# 개발 중에는 False 로 두면 사람이 읽기 쉬운 한 줄 형식
+LOG_JSON = getattr(settings, "LOG_JSON", True)
+
+# LogRecord 기본 속성 - 이외의 속성(extra=...)은 JSON 필드로 그대로 출력
+RESERVED_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in RESERVED_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+
+        return orjson.dumps(entry, option=orjson.OPT_UTC_Z, default=str).decode()
+
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, rates: dict):
+        super().__init__()
+        self.rates = rates
+
+    def _rate(self, name: str) -> Optional[float]:
+        # services.feed_service -> services 순으로 가장 가까운 설정을 사용
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        return rate is None or random.random() < rate
+
+
+class LogQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 포맷은 리스너 스레드에서 - 여기서는 메시지 인자와 예외만 문자열로 고정
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+listener: Optional[QueueListener] = None
+
+
+def setup_logging() -> QueueListener:
+    # 이벤트 루프에서는 큐에 넣기만 하고, 포맷/출력은 별도 스레드가 처리
+    global listener
+    if listener is not None:
+        return listener
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if LOG_JSON:
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        )
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = LogQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(LOG_SAMPLE_RATES))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(LOG_LEVEL)
+    for name, level in LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(level)
+
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def stop_logging():
+    # 큐에 남은 레코드를 모두 출력한 뒤 리스너 스레드 종료
+    global listener
+    if listener is not None:
+        listener.stop()
+        listener = None
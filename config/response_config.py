@@ -0,0 +1,63 @@
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Optional, Tuple
+import hashlib
+import orjson
+
+
+def dump_json(content) -> bytes:
+    # UTC datetime 은 pydantic 과 같은 "Z" 형식으로 출력
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+class FastJSONResponse(ORJSONResponse):
+    # 이미 dict 로 만든 응답을 검증/jsonable_encoder 없이 한 번에 직렬화
+    def render(self, content) -> bytes:
+        return dump_json(content)
+
+
+def make_etag(version) -> str:
+    # 본문(bytes) 또는 버전 값(tuple 등)에서 만든 약한 ETag
+    data = version if isinstance(version, bytes) else repr(version).encode()
+    return f'W/"{hashlib.blake2b(data, digest_size=16).hexdigest()}"'
+
+
+def has_validator(request: Request) -> bool:
+    # 검증 요청일 때만 본문보다 싼 버전 조회를 먼저 한다 (일반 200 응답은 읽은 본문으로 ETag 생성)
+    return "if-none-match" in request.headers
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match 는 약한 비교 - W/ 접두어는 무시
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def conditional(
+    request: Request,
+    version,
+    last_modified: Optional[datetime] = None,
+    extra_headers: Optional[dict] = None,
+) -> Tuple[Optional[Response], dict]:
+    # 본문을 만들기 전에 호출 - 바뀌지 않았으면 304 응답을, 아니면 200 응답에 붙일 헤더를 돌려준다
+    # If-Modified-Since 는 보지 않는다 (like/미디어 처리는 update_dt 를 바꾸지 않으므로 ETag 로만 판단)
+    # no-cache: 브라우저가 Last-Modified 로 휴리스틱 캐시하지 않고 매번 검증하도록
+    # extra_headers (X-Cache 등) 는 304 와 200 응답 모두에 붙는다
+    headers = {"ETag": make_etag(version), "Cache-Control": "no-cache", **(extra_headers or {})}
+    if last_modified is not None:
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(
+            last_modified.astimezone(timezone.utc), usegmt=True
+        )
+
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers), headers
+    return None, headers
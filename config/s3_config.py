@@ -1,11 +1,61 @@
+import asyncio
 import aioboto3
+from botocore.config import Config
+from contextlib import AsyncExitStack
 from config import settings
 
+S3_REGION = "ap-northeast-2"
+# 로컬 S3 (moto 등) 를 쓸 때만 지정
+S3_ENDPOINT_URL = getattr(settings, "S3_ENDPOINT_URL", None)
+# 클라이언트 하나가 유지하는 HTTP 커넥션 수와 동시에 진행할 업로드 수
+S3_MAX_POOL_CONNECTIONS = getattr(settings, "S3_MAX_POOL_CONNECTIONS", 20)
+S3_UPLOAD_CONCURRENCY = getattr(settings, "S3_UPLOAD_CONCURRENCY", 8)
+
+upload_semaphore = asyncio.Semaphore(S3_UPLOAD_CONCURRENCY)
+
+_client = None
+_exit_stack = None
+_client_lock = asyncio.Lock()
+
 
 async def get_s3_client():
-    session = aioboto3.Session(
-        aws_access_key_id=settings.S3_ACCESS_KEY,
-        aws_secret_access_key=settings.S3_SECRET_KEY,
-        region_name="ap-northeast-2",
-    )
-    return session.client("s3")
+    # 요청마다 세션/클라이언트를 만들지 않고 앱 전체에서 하나의 클라이언트(커넥션 풀)를 공유
+    global _client, _exit_stack
+
+    if _client is None:
+        async with _client_lock:
+            if _client is None:
+                session = aioboto3.Session(
+                    aws_access_key_id=settings.S3_ACCESS_KEY,
+                    aws_secret_access_key=settings.S3_SECRET_KEY,
+                    region_name=S3_REGION,
+                )
+                exit_stack = AsyncExitStack()
+                _client = await exit_stack.enter_async_context(
+                    session.client(
+                        "s3",
+                        endpoint_url=S3_ENDPOINT_URL,
+                        config=Config(max_pool_connections=S3_MAX_POOL_CONNECTIONS),
+                    )
+                )
+                _exit_stack = exit_stack
+
+    return _client
+
+
+async def close_s3_client():
+    global _client, _exit_stack
+
+    if _exit_stack is not None:
+        await _exit_stack.aclose()
+    _client = None
+    _exit_stack = None
+
+
+def get_s3_url(key: str) -> str:
+    return f"https://{settings.S3_BUCKET}.s3.{S3_REGION}.amazonaws.com/{key}"
+
+
+def get_s3_key(url: str) -> str:
+    # 버킷 주소 뒤의 경로 전체가 key (변형 이미지는 "{media_id}/{variant}.{ext}")
+    return url.split(".amazonaws.com/", 1)[-1]
@@ -0,0 +1,58 @@
+import asyncio
+import logging
+from sqlalchemy import select, update, func
+from config.db import AsyncSessionLocal
+from config.logging_config import setup_logging, stop_logging
+from models.user import User
+from models.feed import Feed
+from models.comment import Comment
+from models.like import Like
+from models import follow  # noqa: F401 - relationship 설정에 필요
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 잠그는 행 수 - 배치마다 commit 하므로 서비스 중에도 실행 가능
+BATCH_SIZE = 5000
+
+
+async def backfill(db, model, id_column, email_column) -> int:
+    max_id = (await db.execute(select(func.max(model.id)))).scalar() or 0
+    values = {id_column.key: User.id}
+    if hasattr(model, "update_dt"):
+        # backfill 로 update_dt(onupdate)가 바뀌지 않도록 현재 값을 그대로 지정
+        values["update_dt"] = model.update_dt
+
+    filled = 0
+    for start in range(0, max_id, BATCH_SIZE):
+        result = await db.execute(
+            update(model)
+            .where(
+                model.id > start,
+                model.id <= start + BATCH_SIZE,
+                id_column.is_(None),
+                User.email == email_column,
+            )
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        filled += result.rowcount
+
+    logger.info("Backfilled %s on %d rows", id_column, filled)
+    return filled
+
+
+async def main():
+    async with AsyncSessionLocal() as db:
+        await backfill(db, Feed, Feed.author_id, Feed.author_email)
+        await backfill(db, Comment, Comment.author_id, Comment.author_email)
+        await backfill(db, Like, Like.user_id, Like.user_email)
+
+
+if __name__ == "__main__":
+    # python -m jobs.backfill_author_ids (모든 인스턴스가 dual write 로 배포된 뒤 실행)
+    setup_logging()
+    try:
+        asyncio.run(main())
+    finally:
+        stop_logging()
@@ -0,0 +1,20 @@
+import asyncio
+from config.db import AsyncSessionLocal
+from config.logging_config import setup_logging, stop_logging
+from models import user, feed, comment, like, follow  # noqa: F401 - relationship 설정에 필요
+from services import counter_service, like_service
+
+
+async def main():
+    async with AsyncSessionLocal() as db:
+        await counter_service.rebuild_counters(db)
+        await like_service.reconcile_like_counts(db)
+
+
+if __name__ == "__main__":
+    # python -m jobs.reconcile_counters
+    setup_logging()
+    try:
+        asyncio.run(main())
+    finally:
+        stop_logging()
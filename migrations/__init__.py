@@ -0,0 +1,44 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from migrations import (
+    m0001_initial,
+    m0002_backfill_columns,
+    m0003_list_indexes,
+    m0004_author_ids,
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 적용 순서대로 나열 - 이미 배포된 항목은 수정하지 말고 새 항목을 추가
+MIGRATIONS = (
+    ("0001_initial", m0001_initial),
+    ("0002_backfill_columns", m0002_backfill_columns),
+    ("0003_list_indexes", m0003_list_indexes),
+    ("0004_author_ids", m0004_author_ids),
+)
+
+# 여러 워커가 동시에 시작해도 한 곳에서만 적용되도록 하는 advisory lock 키
+MIGRATION_LOCK_KEY = 7240317
+
+
+def run_migrations(conn: Connection):
+    # 호출한 쪽의 트랜잭션 안에서 실행 (engine.begin() / AsyncConnection.run_sync)
+    conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    conn.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version VARCHAR PRIMARY KEY, "
+            "applied_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now())"
+        )
+    )
+
+    applied = set(conn.execute(text("SELECT version FROM schema_migrations")).scalars())
+    for version, migration in MIGRATIONS:
+        if version in applied:
+            continue
+        logger.info("Applying migration %s", version)
+        migration.upgrade(conn)
+        conn.execute(
+            text("INSERT INTO schema_migrations (version) VALUES (:version)"), {"version": version}
+        )
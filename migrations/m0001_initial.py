@@ -0,0 +1,9 @@
+from sqlalchemy.engine import Connection
+from config.db import Base
+from models import user, feed, comment, like, follow, counter, image_ref  # noqa: F401
+
+
+def upgrade(conn: Connection):
+    # 기존에 main.py 가 시작할 때마다 하던 create_all - 없는 테이블만 만든다
+    # 새 DB 는 현재 모델 그대로 만들어지므로 이후 마이그레이션은 IF NOT EXISTS 로 작성
+    Base.metadata.create_all(bind=conn)
@@ -0,0 +1,46 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# create_all 은 이미 있는 테이블을 바꾸지 않으므로 그 뒤에 추가된 컬럼/제약을 기존 DB 에 반영
+STATEMENTS = (
+    "ALTER TABLE feeds ADD COLUMN IF NOT EXISTS like_count INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE comments ADD COLUMN IF NOT EXISTS like_count INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE feeds ADD COLUMN IF NOT EXISTS pending_media_ids JSON",
+    "ALTER TABLE feeds ADD COLUMN IF NOT EXISTS image_variants JSON",
+    "ALTER TABLE feeds ADD COLUMN IF NOT EXISTS pending_media_since TIMESTAMP WITH TIME ZONE",
+    # 기존 pending 목록은 언제 생겼는지 알 수 없으므로 마이그레이션 시점부터 만료 시간을 센다
+    "UPDATE feeds SET pending_media_since = now() "
+    "WHERE pending_media_since IS NULL AND pending_media_ids IS NOT NULL "
+    "AND json_array_length(pending_media_ids) > 0",
+    "CREATE INDEX IF NOT EXISTS ix_feeds_pending_media_since "
+    "ON feeds (pending_media_since) WHERE pending_media_since IS NOT NULL",
+    # 대상이 삭제된 좋아요 (이전에는 피드/댓글 삭제 시 FK 를 NULL 로 남겼다) 는
+    # ck_like_single_target 을 어기므로 제약 추가 전에 삭제
+    "DELETE FROM likes WHERE feed_id IS NULL AND comment_id IS NULL",
+    # 중복 좋아요는 가장 먼저 생긴 것만 남긴다 (unique 인덱스 생성 전에 필요)
+    "DELETE FROM likes a USING likes b "
+    "WHERE a.id > b.id AND a.user_email = b.user_email "
+    "AND a.feed_id IS NOT DISTINCT FROM b.feed_id "
+    "AND a.comment_id IS NOT DISTINCT FROM b.comment_id",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_like_user_feed "
+    "ON likes (user_email, feed_id) WHERE feed_id IS NOT NULL",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_like_user_comment "
+    "ON likes (user_email, comment_id) WHERE comment_id IS NOT NULL",
+)
+
+
+def upgrade(conn: Connection):
+    for statement in STATEMENTS:
+        conn.execute(text(statement))
+
+    # CHECK 제약은 IF NOT EXISTS 가 없으므로 카탈로그를 확인
+    exists = conn.execute(
+        text("SELECT 1 FROM pg_constraint WHERE conname = 'ck_like_single_target'")
+    ).first()
+    if exists is None:
+        conn.execute(
+            text(
+                "ALTER TABLE likes ADD CONSTRAINT ck_like_single_target "
+                "CHECK ((feed_id IS NULL) <> (comment_id IS NULL))"
+            )
+        )
@@ -0,0 +1,24 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# 목록 조회의 필터 + keyset 정렬 키와 같은 순서의 복합 인덱스
+# 큰 테이블에서는 쓰기를 막지 않도록 배포 전에 CREATE INDEX CONCURRENTLY 로 먼저 만들어 두면
+# 여기서는 IF NOT EXISTS 로 건너뛴다
+STATEMENTS = (
+    "CREATE INDEX IF NOT EXISTS ix_feeds_author_email_create_dt "
+    "ON feeds (author_email, create_dt DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_feeds_create_dt ON feeds (create_dt DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_feeds_update_dt ON feeds (update_dt DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_comments_feed_id_create_dt "
+    "ON comments (feed_id, create_dt DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_comments_author_email_create_dt "
+    "ON comments (author_email, create_dt DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_follows_following_id_follower_id "
+    "ON follows (following_id, follower_id)",
+    "CREATE INDEX IF NOT EXISTS ix_users_nickname ON users (nickname)",
+)
+
+
+def upgrade(conn: Connection):
+    for statement in STATEMENTS:
+        conn.execute(text(statement))
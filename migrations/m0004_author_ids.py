@@ -0,0 +1,27 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# email 문자열 FK 를 users.id 정수 FK 로 옮기는 첫 단계 (확장 단계)
+# 1. nullable 컬럼과 인덱스 추가 - 기존 행은 건드리지 않아 테이블을 오래 잠그지 않는다
+# 2. 앱은 email 과 id 를 함께 기록 (dual write)
+# 3. 모든 인스턴스 배포 후 python -m jobs.backfill_author_ids 로 기존 행을 나눠서 채운다
+# 4. settings.AUTHOR_ID_READS = True 로 id 기반 조인으로 전환
+# 5. 이후 마이그레이션에서 NOT NULL 지정 및 email 컬럼/인덱스 제거 (축소 단계)
+STATEMENTS = (
+    "ALTER TABLE feeds ADD COLUMN IF NOT EXISTS author_id INTEGER REFERENCES users (id)",
+    "ALTER TABLE comments ADD COLUMN IF NOT EXISTS author_id INTEGER REFERENCES users (id)",
+    "ALTER TABLE likes ADD COLUMN IF NOT EXISTS user_id INTEGER REFERENCES users (id)",
+    "CREATE INDEX IF NOT EXISTS ix_feeds_author_id_create_dt "
+    "ON feeds (author_id, create_dt DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_comments_author_id_create_dt "
+    "ON comments (author_id, create_dt DESC, id DESC)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_like_user_id_feed "
+    "ON likes (user_id, feed_id) WHERE feed_id IS NOT NULL",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_like_user_id_comment "
+    "ON likes (user_id, comment_id) WHERE comment_id IS NOT NULL",
+)
+
+
+def upgrade(conn: Connection):
+    for statement in STATEMENTS:
+        conn.execute(text(statement))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from config.db import Base
 from pydantic import BaseModel
@@ -12,14 +12,24 @@ class Comment(Base):
     id = Column(Integer, primary_key=True, index=True)
     content = Column(String)
     author_email = Column(String, ForeignKey("users.email"))
+    # author_email 을 대체할 정수 FK - 전환 기간에는 둘 다 기록 (AUTHOR_ID_READS 참고)
+    author_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     feed_id = Column(Integer, ForeignKey("feeds.id"))
     create_dt = Column(DateTime(timezone=True), server_default=func.now())
     update_dt = Column(DateTime(timezone=True), onupdate=func.now())
+    # likes 테이블의 비정규화 카운터 - toggle_like 트랜잭션 안에서 갱신
+    like_count = Column(Integer, nullable=False, default=0, server_default="0")
 
-    author = relationship("User", back_populates="comments")
+    author = relationship("User", back_populates="comments", foreign_keys=[author_email])
     feed = relationship("Feed", back_populates="comments")
     likes = relationship("Like", back_populates="comment")
 
+    __table_args__ = (
+        Index("ix_comments_feed_id_create_dt", feed_id, create_dt.desc(), id.desc()),
+        Index("ix_comments_author_email_create_dt", author_email, create_dt.desc(), id.desc()),
+        Index("ix_comments_author_id_create_dt", author_id, create_dt.desc(), id.desc()),
+    )
+
 
 class CommentCreate(BaseModel):
     content: str
@@ -41,8 +51,49 @@ class CommentResponse(CommentCreate):
     author_nickname: str
     create_dt: datetime
     update_dt: datetime
+    like_count: int = 0
 
 
 class CommentListResponse(BaseModel):
     total_count: int
     comments: List[CommentResponse]
+
+
+# 목록 조회용 컬럼 - ORM 객체 없이 Row 로 바로 읽는다
+COMMENT_RESPONSE_COLUMNS = (
+    Comment.id,
+    Comment.content,
+    Comment.author_email,
+    Comment.feed_id,
+    Comment.create_dt,
+    Comment.update_dt,
+    Comment.like_count,
+)
+
+
+# 조건부 요청(ETag) 검증용 컬럼
+COMMENT_VERSION_COLUMNS = (Comment.id, Comment.update_dt, Comment.like_count)
+
+
+def comment_version(comment) -> tuple:
+    # 응답 dict 또는 COMMENT_VERSION_COLUMNS Row 의 mapping 에서 같은 값을 뽑는다
+    return (comment["id"], comment["update_dt"], comment["like_count"])
+
+
+def comment_list_version(comments, next_cursor: Optional[str]) -> tuple:
+    # 다음 커서(X-Next-Cursor)가 바뀌어도 304 가 되지 않도록 함께 비교
+    return next_cursor, [comment_version(comment) for comment in comments]
+
+
+def comment_to_response(comment: Comment, author_nickname: str) -> dict:
+    # CommentResponse 와 같은 모양의 dict 를 ORM 객체나 COMMENT_RESPONSE_COLUMNS Row 에서 바로 만든다
+    return {
+        "id": comment.id,
+        "content": comment.content,
+        "author_email": comment.author_email,
+        "author_nickname": author_nickname,
+        "feed_id": comment.feed_id,
+        "create_dt": comment.create_dt,
+        "update_dt": comment.update_dt,
+        "like_count": comment.like_count,
+    }
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, BigInteger
+from config.db import Base
+
+
+class Counter(Base):
+    __tablename__ = "counters"
+
+    # scope: feeds / user_feeds / user_comments / followers / followings
+    scope = Column(String, primary_key=True)
+    # 전역 카운터는 빈 문자열, 사용자별 카운터는 email 또는 user id
+    key = Column(String, primary_key=True, default="")
+    value = Column(BigInteger, nullable=False, default=0, server_default="0")
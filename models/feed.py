@@ -1,8 +1,8 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, JSON, DateTime, func
+from sqlalchemy import Column, String, Integer, ForeignKey, JSON, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from config.db import Base
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 
@@ -13,14 +13,37 @@ class Feed(Base):
     title = Column(String, index=True)
     content = Column(String)
     author_email = Column(String, ForeignKey("users.email"))
+    # author_email 을 대체할 정수 FK - 전환 기간에는 둘 다 기록 (AUTHOR_ID_READS 참고)
+    author_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     image_urls = Column(JSON, nullable=True)
+    # 원본 URL -> {변형 이름: {포맷: URL}}
+    image_variants = Column(JSON, nullable=True)
+    # 백그라운드에서 처리 중인 이미지의 media id 목록
+    pending_media_ids = Column(JSON, nullable=True)
+    # 마지막으로 pending 이미지를 추가한 시각 - 워커가 죽어 남은 목록을 만료시킬 때 사용
+    pending_media_since = Column(DateTime(timezone=True), nullable=True)
     create_dt = Column(DateTime(timezone=True), server_default=func.now())
     update_dt = Column(DateTime(timezone=True), onupdate=func.now())
+    # likes 테이블의 비정규화 카운터 - toggle_like 트랜잭션 안에서 갱신
+    like_count = Column(Integer, nullable=False, default=0, server_default="0")
 
-    author = relationship("User", back_populates="feeds")
+    author = relationship("User", back_populates="feeds", foreign_keys=[author_email])
     comments = relationship("Comment", back_populates="feed", post_update=True)
     likes = relationship("Like", back_populates="feed")
 
+    # 목록 조회의 (필터, 정렬 키, id) 순서와 같게 - 역방향 스캔으로 오름차순도 처리
+    __table_args__ = (
+        Index("ix_feeds_author_email_create_dt", author_email, create_dt.desc(), id.desc()),
+        Index("ix_feeds_author_id_create_dt", author_id, create_dt.desc(), id.desc()),
+        Index("ix_feeds_create_dt", create_dt.desc(), id.desc()),
+        Index("ix_feeds_update_dt", update_dt.desc(), id.desc()),
+        Index(
+            "ix_feeds_pending_media_since",
+            pending_media_since,
+            postgresql_where=pending_media_since.is_not(None),
+        ),
+    )
+
 
 class FeedCreate(BaseModel):
     title: str
@@ -39,15 +62,106 @@ class FeedInDB(FeedCreate):
     update_dt: datetime
 
 
+class FeedImage(BaseModel):
+    url: str
+    # {"thumbnail": {"avif": url, "webp": url}, "medium": {...}, "original": {...}}
+    variants: Dict[str, Dict[str, str]] = {}
+
+
 class FeedResponse(FeedCreate):
     id: int
     author_email: str
     author_nickname: str
     image_urls: Optional[List[str]]
+    images: List[FeedImage] = []
+    pending_media_ids: Optional[List[str]] = []
     create_dt: datetime
     update_dt: datetime
+    like_count: int = 0
+
+
+class FeedUploadFile(BaseModel):
+    content_type: str
+    size: int
+
+
+class FeedUploadRequest(BaseModel):
+    files: List[FeedUploadFile]
+
+
+class FeedUploadFinalize(BaseModel):
+    media_ids: List[str]
 
 
 class FeedListResponse(BaseModel):
-    total_count: int
+    total_count: Optional[int]
     feeds: List[FeedResponse]
+    next_cursor: Optional[str] = None
+
+
+# 목록 조회용 컬럼 - ORM 객체(identity map, 변경 추적) 없이 Row 로 바로 읽는다
+FEED_RESPONSE_COLUMNS = (
+    Feed.id,
+    Feed.title,
+    Feed.content,
+    Feed.author_email,
+    Feed.image_urls,
+    Feed.image_variants,
+    Feed.pending_media_ids,
+    Feed.create_dt,
+    Feed.update_dt,
+    Feed.like_count,
+)
+
+
+# 조건부 요청(ETag) 검증용 컬럼 - 응답을 바꾸는 값만 join/본문 없이 읽는다
+# (like 와 미디어 처리는 update_dt 를 바꾸지 않으므로 like_count 와 이미지 목록을 함께 본다)
+FEED_VERSION_COLUMNS = (
+    Feed.id,
+    Feed.update_dt,
+    Feed.like_count,
+    Feed.image_urls,
+    Feed.pending_media_ids,
+)
+
+
+def feed_version(feed) -> tuple:
+    # 응답 dict 또는 FEED_VERSION_COLUMNS Row 의 mapping 에서 같은 값을 뽑는다
+    # 검증용 조회와 이미 읽은 본문이 같은 ETag 를 만들어야 한다 (Redis 캐시의 update_dt 는 문자열)
+    update_dt = feed["update_dt"]
+    if isinstance(update_dt, str):
+        update_dt = datetime.fromisoformat(update_dt)
+    return (
+        feed["id"],
+        update_dt,
+        feed["like_count"],
+        tuple(feed["image_urls"] or []),
+        tuple(feed["pending_media_ids"] or []),
+    )
+
+
+def feed_list_version(total_count: Optional[int], feeds, next_cursor: Optional[str]) -> tuple:
+    # 다음 커서가 생기거나 없어져도 (다음 페이지 유무) 본문이 바뀌므로 함께 비교
+    return total_count, next_cursor, [feed_version(feed) for feed in feeds]
+
+
+def feed_to_response(feed: Feed, author_nickname: str) -> dict:
+    # FeedResponse 와 같은 모양의 dict 를 ORM 객체나 FEED_RESPONSE_COLUMNS Row 에서 바로 만든다
+    image_variants = feed.image_variants or {}
+    return {
+        "id": feed.id,
+        "title": feed.title,
+        "content": feed.content,
+        "author_email": feed.author_email,
+        "author_nickname": author_nickname,
+        "image_urls": feed.image_urls,
+        # image_urls 순서대로 이미지별 변형 맵 (이전에 올린 이미지는 빈 맵)
+        "images": [
+            {"url": image_url, "variants": image_variants.get(image_url, {})}
+            for image_url in feed.image_urls or []
+        ],
+        "pending_media_ids": feed.pending_media_ids or [],
+        "create_dt": feed.create_dt,
+        "update_dt": feed.update_dt,
+        "like_count": feed.like_count,
+    }
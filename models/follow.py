@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint, Index
 from config.db import Base
 
 
@@ -9,4 +9,8 @@ class Follow(Base):
     following_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
 
     # 두 필드의 조합이 고유해야 함
-    __table_args__ = (UniqueConstraint("follower_id", "following_id", name="unique_follow"),)
+    # 팔로워 목록(following_id 로 조회)은 기본 키 (follower_id, following_id) 를 쓸 수 없다
+    __table_args__ = (
+        UniqueConstraint("follower_id", "following_id", name="unique_follow"),
+        Index("ix_follows_following_id_follower_id", "following_id", "follower_id"),
+    )
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, Integer, JSON
+from config.db import Base
+
+
+class ImageRef(Base):
+    __tablename__ = "image_refs"
+
+    # 원본 바이트의 sha256 - S3 키의 prefix 로도 사용
+    media_id = Column(String, primary_key=True)
+    # 업로드가 끝나기 전에는 None
+    image_url = Column(String, nullable=True)
+    image_variants = Column(JSON, nullable=True)
+    # 이 이미지를 image_urls 에 가진 피드 수 (0이 되면 S3 에서 삭제)
+    ref_count = Column(Integer, nullable=False, default=0, server_default="0")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Integer
+from sqlalchemy import Column, String, ForeignKey, Integer, Index, CheckConstraint, text
 from sqlalchemy.orm import relationship
 from config.db import Base
 
@@ -8,9 +8,44 @@ class Like(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_email = Column(String, ForeignKey("users.email"), index=True)
+    # user_email 을 대체할 정수 FK - 전환 기간에는 둘 다 기록 (AUTHOR_ID_READS 참고)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     feed_id = Column(Integer, ForeignKey("feeds.id"), index=True, nullable=True)
     comment_id = Column(Integer, ForeignKey("comments.id"), index=True, nullable=True)
 
-    user = relationship("User", back_populates="likes")
+    user = relationship("User", back_populates="likes", foreign_keys=[user_email])
     feed = relationship("Feed", back_populates="likes")
     comment = relationship("Comment", back_populates="likes")
+
+    # 사용자당 대상별 좋아요는 하나 - NULL 은 서로 다른 값으로 취급되므로 부분 unique 인덱스 사용
+    __table_args__ = (
+        CheckConstraint("(feed_id IS NULL) <> (comment_id IS NULL)", name="ck_like_single_target"),
+        Index(
+            "uq_like_user_feed",
+            "user_email",
+            "feed_id",
+            unique=True,
+            postgresql_where=text("feed_id IS NOT NULL"),
+        ),
+        Index(
+            "uq_like_user_comment",
+            "user_email",
+            "comment_id",
+            unique=True,
+            postgresql_where=text("comment_id IS NOT NULL"),
+        ),
+        Index(
+            "uq_like_user_id_feed",
+            "user_id",
+            "feed_id",
+            unique=True,
+            postgresql_where=text("feed_id IS NOT NULL"),
+        ),
+        Index(
+            "uq_like_user_id_comment",
+            "user_id",
+            "comment_id",
+            unique=True,
+            postgresql_where=text("comment_id IS NOT NULL"),
+        ),
+    )
@@ -12,12 +12,14 @@ class User(Base):
     id = Column(Integer, primary_key=True)
     email = Column(String, unique=True, index=True)
     password = Column(String())
-    nickname = Column(String())
+    nickname = Column(String(), index=True)
     create_dt = Column(DateTime(timezone=True), server_default=func.now())
 
-    feeds = relationship("Feed", back_populates="author")
-    comments = relationship("Comment", back_populates="author", post_update=True)
-    likes = relationship("Like", back_populates="user")
+    feeds = relationship("Feed", back_populates="author", foreign_keys="Feed.author_email")
+    comments = relationship(
+        "Comment", back_populates="author", post_update=True, foreign_keys="Comment.author_email"
+    )
+    likes = relationship("Like", back_populates="user", foreign_keys="Like.user_email")
 
 
 class UserCreate(BaseModel):
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from models.comment import CommentCreate, CommentUpdate, CommentResponse
+from models.comment import CommentCreate, CommentUpdate, CommentResponse, comment_list_version
+from models.user import User
 from services import comment_service, auth_service
 from config.db import get_db
-from typing import List
+from config.response_config import FastJSONResponse, conditional, has_validator
+from typing import List, Optional
 
 router = APIRouter()
 
@@ -12,21 +14,47 @@ router = APIRouter()
 async def create_comment(
     comment: CommentCreate,
     db: AsyncSession = Depends(get_db),
-    email: str = Depends(auth_service.get_current_user_authorization),
+    user: User = Depends(auth_service.get_current_user),
 ):
-    return await comment_service.create_comment(db, comment, email)
+    return await comment_service.create_comment(db, comment, user)
+
+
+def cursor_header(next_cursor: Optional[str]) -> dict:
+    # 응답 본문(리스트) 형태를 유지하기 위해 다음 커서는 헤더로 전달 - 304 에도 같은 헤더를 붙인다
+    return {"X-Next-Cursor": next_cursor} if next_cursor else {}
 
 
 @router.get("/feed/{feed_id}", response_model=List[CommentResponse])
 async def get_comments_by_feed_id(
     feed_id: int,
+    request: Request,
     skip: int = 0,
     limit: int = 10,
     sort_by: str = "create_dt_desc",  # default 정렬 옵션을 작성일 내림차순으로 설정
+    cursor: Optional[str] = None,  # 지정하면 skip 대신 keyset 페이지네이션
     db: AsyncSession = Depends(get_db),
 ):
-    comments = await comment_service.get_comment_by_feed_id(db, feed_id, skip, limit, sort_by)
-    return comments
+    if has_validator(request):
+        # 본문을 만들기 전에 페이지의 버전 값만 읽어 If-None-Match 와 비교
+        version, next_cursor = await comment_service.get_comment_version_by_feed_id(
+            db, feed_id, skip, limit, sort_by, cursor
+        )
+        not_modified, _ = conditional(request, version, extra_headers=cursor_header(next_cursor))
+        if not_modified:
+            return not_modified
+
+    comments, next_cursor = await comment_service.get_comment_by_feed_id(
+        db, feed_id, skip, limit, sort_by, cursor
+    )
+    not_modified, headers = conditional(
+        request,
+        comment_list_version(comments, next_cursor),
+        extra_headers=cursor_header(next_cursor),
+    )
+    if not_modified:
+        return not_modified
+
+    return FastJSONResponse(comments, headers=headers)
 
 
 @router.patch("/update/{comment_id}", response_model=CommentResponse)
@@ -34,9 +62,9 @@ async def update_comment(
     comment_id: int,
     comment: CommentUpdate,
     db: AsyncSession = Depends(get_db),
-    email: str = Depends(auth_service.get_current_user_authorization),
+    user: User = Depends(auth_service.get_current_user),
 ):
-    return await comment_service.update_comment(db, comment_id, comment, email)
+    return await comment_service.update_comment(db, comment_id, comment, user)
 
 
 @router.delete("/delete/{comment_id}")
@@ -1,12 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from models.feed import FeedCreate, FeedResponse, FeedUpdate, FeedListResponse
-from services import feed_service, auth_service
-from config.db import get_db
-from typing import List
-import logging
-
-logging.basicConfig(level=logging.DEBUG)
+from models.feed import (
+    FeedCreate,
+    FeedResponse,
+    FeedUpdate,
+    FeedListResponse,
+    FeedUploadRequest,
+    FeedUploadFinalize,
+    feed_version,
+    feed_list_version,
+)
+from models.user import User
+from services import feed_service, auth_service, timeline_service, counter_service
+from config.db import get_db, AsyncSessionLocal
+from config.response_config import FastJSONResponse, dump_json, conditional, has_validator
+from config.compression_config import encode_cached
+from services.pagination import build_pagination
+from services.feed_list_cache import feed_list_cache, BYPASS
+from typing import List, Optional
 
 router = APIRouter()
 
@@ -17,59 +28,139 @@ async def create(
     content: str = Form(...),
     images: List[UploadFile] = File(None),
     db: AsyncSession = Depends(get_db),
-    email: str = Depends(auth_service.get_current_user_authorization),
+    user: User = Depends(auth_service.get_current_user),
 ):
-    if email is None:
-        raise HTTPException(status_code=401, detail="Not authorized")
-
     feed = FeedCreate(title=title, content=content)
 
-    return await feed_service.create_feed(db, feed, email, images)
+    return await feed_service.create_feed(db, feed, user, images)
 
 
 @router.get("/read/{feed_id}", response_model=FeedResponse)
-async def read_feed(feed_id: int, db: AsyncSession = Depends(get_db)):
-    return await feed_service.get_feed_by_id(db, feed_id)
+async def read_feed(feed_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    # 상세 캐시에서 꺼낸 값으로 버전을 비교 - 바뀌지 않았으면 직렬화 없이 304
+    feed = await feed_service.get_feed_by_id(db, feed_id)
+    version = feed_version(feed)
+    not_modified, headers = conditional(request, version, version[1])
+    if not_modified:
+        return not_modified
+
+    return FastJSONResponse(feed, headers=headers)
 
 
 @router.get("/list-by-user", response_model=FeedListResponse)
 async def list_feeds_by_user(
+    request: Request,
     user_id: int = None,
     nickname: str = None,
     email: str = None,
     skip: int = 0,
     limit: int = 10,
     sort_by: str = "id_desc",  # 정렬 옵션 추가
+    cursor: Optional[str] = None,  # 지정하면 skip 대신 keyset 페이지네이션
+    count_mode: str = "exact",  # exact | cached | none
     db: AsyncSession = Depends(get_db),
 ):
-    total_count, feed_responses = await feed_service.get_feeds_by_user(
-        db, user_id=user_id, nickname=nickname, email=email, skip=skip, limit=limit, sort_by=sort_by
+    if has_validator(request):
+        # 본문을 만들기 전에 페이지의 버전 값만 읽어 If-None-Match 와 비교
+        version = await feed_service.get_feeds_by_user_version(
+            db, user_id, nickname, email, skip, limit, sort_by, cursor, count_mode
+        )
+        not_modified, _ = conditional(request, version)
+        if not_modified:
+            return not_modified
+
+    total_count, feed_responses, next_cursor = await feed_service.get_feeds_by_user(
+        db,
+        user_id=user_id,
+        nickname=nickname,
+        email=email,
+        skip=skip,
+        limit=limit,
+        sort_by=sort_by,
+        cursor=cursor,
+        count_mode=count_mode,
+    )
+    not_modified, headers = conditional(
+        request, feed_list_version(total_count, feed_responses, next_cursor)
+    )
+    if not_modified:
+        return not_modified
+
+    # 서비스가 만든 dict 를 다시 검증하지 않고 바로 직렬화 (response_model 은 문서용)
+    return FastJSONResponse(
+        {"total_count": total_count, "feeds": feed_responses, "next_cursor": next_cursor},
+        headers=headers,
     )
-    return FeedListResponse(total_count=total_count, feeds=feed_responses)
 
 
 @router.get("/list")
 async def list_feeds(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     skip: int = 0,
     limit: int = 10,
     sort_by: str = "create_dt_desc",
+    cursor: Optional[str] = None,
+    count_mode: str = "exact",  # exact | cached | none
 ):
-    total_count, feeds = await feed_service.get_feeds(db, skip, limit, sort_by)
+    async def load(session: AsyncSession) -> dict:
+        total_count, feeds, next_cursor = await feed_service.get_feeds(
+            session, skip, limit, sort_by, cursor, count_mode
+        )
+        return {
+            "feeds": feeds,
+            "pagination": build_pagination(skip, limit, total_count, next_cursor, cursor),
+        }
+
+    if not feed_list_cache.cacheable(skip, limit, cursor):
+        if has_validator(request):
+            version = await feed_service.get_feeds_version(
+                db, skip, limit, sort_by, cursor, count_mode
+            )
+            not_modified, _ = conditional(request, version, extra_headers={"X-Cache": BYPASS})
+            if not_modified:
+                return not_modified
+
+        content = await load(db)
+        pagination = content["pagination"]
+        version = feed_list_version(
+            pagination["total_count"], content["feeds"], pagination["next_cursor"]
+        )
+        not_modified, headers = conditional(request, version, extra_headers={"X-Cache": BYPASS})
+        if not_modified:
+            return not_modified
+        return FastJSONResponse(content, headers=headers)
+
+    # 캐시 갱신은 요청이 끝난 뒤에도 진행될 수 있으므로 별도 세션을 사용
+    async def render() -> bytes:
+        async with AsyncSessionLocal() as session:
+            return dump_json(await load(session))
+
+    # 캐시된 페이지는 DB 조회 없이 본문 자체로 ETag 를 만든다
+    # 키에는 검증된 값만 넣는다 (알 수 없는 sort_by 는 기본 정렬과 같은 항목)
+    counter_service.check_count_mode(count_mode)
+    key = (skip, limit, feed_service.resolve_sort_by(sort_by), count_mode)
+    cached, cache_status = await feed_list_cache.get(key, render)
+    not_modified, headers = conditional(
+        request, cached.body, extra_headers={"X-Cache": cache_status}
+    )
+    if not_modified:
+        return not_modified
+
+    body = encode_cached(request.headers.get("accept-encoding"), cached, headers)
+    return Response(body, media_type="application/json", headers=headers)
+
 
-    current_page = (skip // limit) + 1
-    total_pages = -(-total_count // limit)
-    is_last_page = (skip + limit) >= total_count
+@router.get("/timeline")
+async def home_timeline(
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(auth_service.get_current_user),
+):
+    feeds, next_cursor = await timeline_service.get_home_timeline(db, user, limit, cursor)
 
-    return {
-        "feeds": feeds,
-        "pagination": {
-            "current_page": current_page,
-            "total_pages": total_pages,
-            "is_last_page": is_last_page,
-            "total_count": total_count,
-        },
-    }
+    return FastJSONResponse({"feeds": feeds, "next_cursor": next_cursor})
 
 
 @router.patch("/update/{feed_id}", response_model=FeedResponse)
@@ -80,19 +171,37 @@ async def update(
     new_images: List[UploadFile] = File(None),
     target_image_urls: List[str] = Form(None),
     db: AsyncSession = Depends(get_db),
-    email: str = Depends(auth_service.get_current_user_authorization),
+    user: User = Depends(auth_service.get_current_user),
 ):
-    if email is None:
-        raise HTTPException(status_code=401, detail="Not authorized")
-
     feed_update = FeedUpdate(title=title, content=content)
     updated_feed = await feed_service.update_feed(
-        db, feed_id, feed_update, email, new_images=new_images, target_image_urls=target_image_urls
+        db, feed_id, feed_update, user, new_images=new_images, target_image_urls=target_image_urls
     )
 
     return updated_feed
 
 
+@router.post("/upload-url/{feed_id}")
+async def create_upload_urls(
+    feed_id: int,
+    upload_request: FeedUploadRequest,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(auth_service.get_current_user),
+):
+    # 클라이언트는 받은 url/fields 로 S3 에 직접 POST 한 뒤 upload-finalize 를 호출
+    return await feed_service.create_upload_urls(db, feed_id, upload_request.files, user)
+
+
+@router.post("/upload-finalize/{feed_id}", response_model=FeedResponse)
+async def finalize_uploads(
+    feed_id: int,
+    upload_finalize: FeedUploadFinalize,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(auth_service.get_current_user),
+):
+    return await feed_service.finalize_uploads(db, feed_id, upload_finalize.media_ids, user)
+
+
 @router.delete("/delete/{feed_id}", response_model=None)
 async def delete(
     feed_id: int,
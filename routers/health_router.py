@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+router = APIRouter()
+
+
+@router.get("/live")
+async def liveness():
+    # 이벤트 루프가 응답할 수 있으면 살아 있는 것 - DB 상태와 무관
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def readiness(request: Request):
+    # 마이그레이션 확인과 커넥션 풀 예열이 끝나야 트래픽을 받는다
+    if not getattr(request.app.state, "ready", False):
+        if getattr(request.app.state, "startup_error", None) is not None:
+            # 재시도해도 해결되지 않는 오류 (마이그레이션 실패 등) - 원인은 로그에 남는다
+            return JSONResponse(status_code=503, content={"status": "failed"})
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return {"status": "ready", "startup_ms": request.app.state.startup_ms}
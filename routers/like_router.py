@@ -3,20 +3,23 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from config.db import get_db
 from services import auth_service
 from services.like_service import toggle_like
+from services.token_cache import Principal
 
 router = APIRouter()
 
 
 @router.patch("/")
 async def toggle(
-    user_email: str = Depends(auth_service.get_current_user_authorization),
+    principal: Principal = Depends(auth_service.get_current_principal),
     feed_id: int = None,
     comment_id: int = None,
     db: AsyncSession = Depends(get_db),
 ):
     try:
-        await toggle_like(db, user_email, feed_id=feed_id, comment_id=comment_id)
+        liked = await toggle_like(
+            db, principal.email, principal.user_id, feed_id=feed_id, comment_id=comment_id
+        )
     except HTTPException as e:
         raise e
 
-    return {"message": "Like toggled successfully"}
+    return {"message": "Like toggled successfully", "liked": liked}
@@ -0,0 +1,32 @@
+from fastapi import APIRouter
+from services import auth_service, media_service
+from services.feed_cache import feed_cache
+from services.feed_list_cache import feed_list_cache
+from config.db import get_pool_metrics
+
+router = APIRouter()
+
+
+@router.get("/token-cache")
+async def token_cache_metrics():
+    return auth_service.token_cache.metrics()
+
+
+@router.get("/media")
+async def media_metrics():
+    return media_service.get_media_metrics()
+
+
+@router.get("/feed-cache")
+async def feed_cache_metrics():
+    return feed_cache.metrics()
+
+
+@router.get("/feed-list-cache")
+async def feed_list_cache_metrics():
+    return feed_list_cache.metrics()
+
+
+@router.get("/db-pool")
+async def db_pool_metrics():
+    return get_pool_metrics()
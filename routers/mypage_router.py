@@ -1,14 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from config.db import get_db
+from config.response_config import FastJSONResponse, conditional, has_validator
 from services.mypage_service import (
     get_user_profile,
     get_user_feeds,
     get_user_comments,
     get_user_followers,
     get_user_followings,
+    get_user_followers_version,
+    get_user_followings_version,
+    follow_list_version,
 )
 from services.auth_service import get_current_user_authorization
+from services.pagination import build_pagination
+from typing import Optional
 
 router = APIRouter()
 
@@ -30,22 +36,19 @@ async def user_feeds(
     skip: int = 0,
     limit: int = 10,
     sort_by: str = "create_dt_desc",
+    cursor: Optional[str] = None,
+    count_mode: str = "exact",  # exact | cached | none
 ):
-    total_count, feeds = await get_user_feeds(db, email, skip, limit, sort_by)
-
-    current_page = (skip // limit) + 1
-    total_pages = -(-total_count // limit)
-    is_last_page = (skip + limit) >= total_count
-
-    return {
-        "feeds": feeds,
-        "pagination": {
-            "current_page": current_page,
-            "total_pages": total_pages,
-            "is_last_page": is_last_page,
-            "total_count": total_count,
-        },
-    }
+    total_count, feeds, next_cursor = await get_user_feeds(
+        db, email, skip, limit, sort_by, cursor, count_mode
+    )
+
+    return FastJSONResponse(
+        {
+            "feeds": feeds,
+            "pagination": build_pagination(skip, limit, total_count, next_cursor, cursor),
+        }
+    )
 
 
 @router.get("/comments")
@@ -55,69 +58,90 @@ async def user_comments(
     skip: int = 0,
     limit: int = 10,
     sort_by: str = "create_dt_desc",
+    cursor: Optional[str] = None,
+    count_mode: str = "exact",  # exact | cached | none
 ):
-    result = await get_user_comments(db, email, skip, limit, sort_by)
+    result = await get_user_comments(db, email, skip, limit, sort_by, cursor, count_mode)
     total_count = result["total_count"]
     comments = result["comments"]
+    next_cursor = result["next_cursor"]
 
-    current_page = (skip // limit) + 1
-    total_pages = -(-total_count // limit)  # Ceiling division in Python
-    is_last_page = (skip + limit) >= total_count
-
-    return {
-        "comments": comments,
-        "pagination": {
-            "current_page": current_page,
-            "total_pages": total_pages,
-            "is_last_page": is_last_page,
-            "total_count": total_count,
-        },
-    }
+    return FastJSONResponse(
+        {
+            "comments": comments,
+            "pagination": build_pagination(skip, limit, total_count, next_cursor, cursor),
+        }
+    )
 
 
 @router.get("/{user_id}/followers")
 async def user_followers(
-    user_id: int, skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_db)
+    user_id: int,
+    request: Request,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    count_mode: str = "exact",  # exact | cached | none
+    db: AsyncSession = Depends(get_db),
 ):
-    result_dict = await get_user_followers(db, user_id, skip, limit)
+    if has_validator(request):
+        # 본문을 만들기 전에 페이지의 버전 값만 읽어 If-None-Match 와 비교
+        version = await get_user_followers_version(db, user_id, skip, limit, cursor, count_mode)
+        not_modified, _ = conditional(request, version)
+        if not_modified:
+            return not_modified
+
+    result_dict = await get_user_followers(db, user_id, skip, limit, cursor, count_mode)
 
     total_count = result_dict["total_count"]
     followers = result_dict["followers"]
-
-    current_page = (skip // limit) + 1
-    total_pages = -(-total_count // limit)
-    is_last_page = (skip + limit) >= total_count
-
-    return {
-        "followers": followers,
-        "pagination": {
-            "current_page": current_page,
-            "total_pages": total_pages,
-            "is_last_page": is_last_page,
-            "total_count": total_count,
+    next_cursor = result_dict["next_cursor"]
+    not_modified, headers = conditional(
+        request, follow_list_version(total_count, followers, next_cursor)
+    )
+    if not_modified:
+        return not_modified
+
+    return FastJSONResponse(
+        {
+            "followers": followers,
+            "pagination": build_pagination(skip, limit, total_count, next_cursor, cursor),
         },
-    }
+        headers=headers,
+    )
 
 
 @router.get("/{user_id}/followings")
 async def user_followings(
-    user_id: int, skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_db)
+    user_id: int,
+    request: Request,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    count_mode: str = "exact",  # exact | cached | none
+    db: AsyncSession = Depends(get_db),
 ):
-    result_dict = await get_user_followings(db, user_id, skip, limit)
+    if has_validator(request):
+        version = await get_user_followings_version(db, user_id, skip, limit, cursor, count_mode)
+        not_modified, _ = conditional(request, version)
+        if not_modified:
+            return not_modified
+
+    result_dict = await get_user_followings(db, user_id, skip, limit, cursor, count_mode)
 
     total_count = result_dict["total_count"]
     followings = result_dict["followings"]
-
-    current_page = (skip // limit) + 1
-    total_pages = -(-total_count // limit)
-    is_last_page = (skip + limit) >= total_count
-
-    return {
-        "followings": followings,
-        "pagination": {
-            "current_page": current_page,
-            "total_pages": total_pages,
-            "is_last_page": is_last_page,
-            "total_count": total_count,
+    next_cursor = result_dict["next_cursor"]
+    not_modified, headers = conditional(
+        request, follow_list_version(total_count, followings, next_cursor)
+    )
+    if not_modified:
+        return not_modified
+
+    return FastJSONResponse(
+        {
+            "followings": followings,
+            "pagination": build_pagination(skip, limit, total_count, next_cursor, cursor),
         },
-    }
+        headers=headers,
+    )
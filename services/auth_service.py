@@ -1,24 +1,47 @@
-from fastapi import HTTPException, Request
+from fastapi import Depends, HTTPException, Request
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from models.user import User
+from config import settings
+from config.db import get_db
+from services.token_cache import Principal, TokenCache
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import pytz
 
 SECRET_KEY = "ThisIsTheSecretKeyOfFastAPIApplicationWithSQLAlchemyAndPydantic"
 ALGORITHM = "HS256"
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt cost factor 와 동시에 실행할 해시 작업 수 (settings 에 없으면 기본값)
+BCRYPT_ROUNDS = getattr(settings, "BCRYPT_ROUNDS", 12)
+PASSWORD_HASH_CONCURRENCY = getattr(settings, "PASSWORD_HASH_CONCURRENCY", 4)
+# 검증된 토큰 캐시 크기와 최대 보관 시간(초)
+TOKEN_CACHE_SIZE = getattr(settings, "TOKEN_CACHE_SIZE", 10000)
+TOKEN_CACHE_TTL_SECONDS = getattr(settings, "TOKEN_CACHE_TTL_SECONDS", 300)
 
+token_cache = TokenCache(TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL_SECONDS)
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
+# bcrypt 는 GIL 을 놓고 실행되므로 스레드 풀에서 돌리면 이벤트 루프를 막지 않는다
+password_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_CONCURRENCY, thread_name_prefix="password-hash"
+)
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+
+async def get_password_hash(password):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, pwd_context.hash, password)
+
+
+async def verify_password(plain_password, hashed_password):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor, pwd_context.verify, plain_password, hashed_password
+    )
 
 
 def create_access_token(data: dict):
@@ -45,7 +68,7 @@ async def create_user(db: AsyncSession, user: User):
     if existing_user:
         raise ValueError("Email Already Registered")
 
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash(user.password)
 
     korea = pytz.timezone("Asia/Seoul")
     current_time_in_korea = datetime.now(korea)
@@ -67,22 +90,58 @@ async def authenticate_user(db: AsyncSession, email: str, password: str):
     user = await get_user_by_email(db, email)
     if not user:
         raise ValueError("Invalid Credentials")
-    if not verify_password(password, user.password):
+    if not await verify_password(password, user.password):
         raise ValueError("Invalid Credentials")
     return user
 
 
-async def get_current_user_authorization(request: Request):
+async def get_current_principal(request: Request, db: AsyncSession = Depends(get_db)):
     authorization = request.headers.get("Authorization")
     if not authorization:
         raise HTTPException(status_code=401, detail="Not Authenticated")
 
     token = authorization.replace("Bearer ", "")
+
+    # 캐시 적중 시 서명 검증과 사용자 조회를 모두 건너뛴다
+    principal = token_cache.get(token)
+    if principal is not None:
+        return principal
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email = payload.get("sub")
-        if email is None:
-            raise HTTPException(status_code=401, detail="Invalid Token")
-        return email
     except JWTError as e:
         raise HTTPException(status_code=401, detail="Invalid Token")
+
+    email = payload.get("sub")
+    if email is None:
+        raise HTTPException(status_code=401, detail="Invalid Token")
+
+    user = await get_user_by_email(db, email)
+    if user is None:
+        raise HTTPException(status_code=401, detail="Invalid Token")
+
+    principal = Principal(email=user.email, user_id=user.id, nickname=user.nickname)
+    token_cache.put(token, principal, payload.get("exp"))
+    # 같은 요청에서 get_current_user 가 다시 조회하지 않도록 보관
+    request.state.current_user = user
+
+    return principal
+
+
+async def get_current_user_authorization(principal: Principal = Depends(get_current_principal)):
+    return principal.email
+
+
+async def get_current_user(
+    request: Request,
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    # 요청 단위로 User 를 한 번만 읽는다 - 토큰 캐시 미스로 이미 읽었다면 그대로 사용
+    user = getattr(request.state, "current_user", None)
+    if user is None:
+        user = await db.get(User, principal.user_id)
+        if user is None:
+            raise HTTPException(status_code=401, detail="Invalid Token")
+        request.state.current_user = user
+    return user
@@ -0,0 +1,33 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.user import User
+from models.feed import Feed
+from models.comment import Comment
+from config import settings
+from typing import Dict, Iterable
+
+# author_id / user_id backfill(jobs.backfill_author_ids) 이 끝난 뒤 True 로 바꾸면
+# 작성자 조인을 email 문자열 대신 users.id 정수 FK 로 수행
+AUTHOR_ID_READS = getattr(settings, "AUTHOR_ID_READS", False)
+
+
+def feed_author_join():
+    if AUTHOR_ID_READS:
+        return User.id == Feed.author_id
+    return User.email == Feed.author_email
+
+
+def comment_author_join():
+    if AUTHOR_ID_READS:
+        return User.id == Comment.author_id
+    return User.email == Comment.author_email
+
+
+async def get_author_nicknames(db: AsyncSession, author_emails: Iterable[str]) -> Dict[str, str]:
+    # 페이지 전체의 작성자를 IN (...) 쿼리 한 번으로 조회
+    emails = {email for email in author_emails if email is not None}
+    if not emails:
+        return {}
+
+    result = await db.execute(select(User.email, User.nickname).where(User.email.in_(emails)))
+    return {email: nickname for email, nickname in result.all()}
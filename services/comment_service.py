@@ -1,32 +1,49 @@
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import desc, asc
-from models.comment import Comment, CommentCreate, CommentUpdate
+from sqlalchemy import delete
+from models.comment import (
+    Comment,
+    CommentCreate,
+    CommentUpdate,
+    COMMENT_RESPONSE_COLUMNS,
+    COMMENT_VERSION_COLUMNS,
+    comment_to_response,
+    comment_list_version,
+)
 from models.user import User
 from models.feed import Feed
+from models.like import Like
+from services.author_service import get_author_nicknames
+from services.pagination import paginate, split_page, with_key_columns
+from services import counter_service
+from typing import Optional
 from datetime import datetime
 import pytz
 import logging
 
-logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
 
+# sort_by 옵션별 keyset 정렬 키 (마지막 컬럼은 항상 고유한 id)
+COMMENT_SORT_KEYS = {
+    "create_dt_desc": ((Comment.create_dt, Comment.id), True),
+    "create_dt_asc": ((Comment.create_dt, Comment.id), False),
+    "update_dt_desc": ((Comment.update_dt, Comment.id), True),
+    "update_dt_asc": ((Comment.update_dt, Comment.id), False),
+}
 
-async def create_comment(db: AsyncSession, comment: CommentCreate, author_email: str):
+
+async def create_comment(db: AsyncSession, comment: CommentCreate, author: User):
+    author_email = author.email
     comment_dict = comment.model_dump()
     comment_dict["author_email"] = author_email
+    comment_dict["author_id"] = author.id
 
     korea = pytz.timezone("Asia/Seoul")
     current_time_in_korea = datetime.now(korea)
     comment_dict["create_dt"] = current_time_in_korea
     comment_dict["update_dt"] = current_time_in_korea
 
-    result = await db.execute(select(User).where(User.email == author_email))
-    author = result.scalar_one_or_none()
-
-    if author is None:
-        raise HTTPException(status_code=404, detail="Author Not Found")
-
     author_nickname = author.nickname
 
     feed_result = await db.execute(select(Feed).where(Feed.id == comment.feed_id))
@@ -37,60 +54,64 @@ async def create_comment(db: AsyncSession, comment: CommentCreate, author_email:
 
     db_comment = Comment(**comment_dict)
     db.add(db_comment)
+    await counter_service.increment(db, counter_service.USER_COMMENTS, author_email)
     await db.commit()
     await db.refresh(db_comment)
 
-    return {
-        "id": db_comment.id,
-        "content": db_comment.content,
-        "author_email": db_comment.author_email,
-        "author_nickname": author_nickname,
-        "feed_id": db_comment.feed_id,
-        "create_dt": db_comment.create_dt,
-        "update_dt": db_comment.update_dt,
-    }
+    return comment_to_response(db_comment, author_nickname)
 
 
 async def get_comment_by_feed_id(
-    db: AsyncSession, feed_id: int, skip: int = 0, limit: int = 10, sort_by: str = "create_dt_desc"
+    db: AsyncSession,
+    feed_id: int,
+    skip: int = 0,
+    limit: int = 10,
+    sort_by: str = "create_dt_desc",
+    cursor: Optional[str] = None,
 ):
-    query = select(Comment).where(Comment.feed_id == feed_id)
+    query = select(*COMMENT_RESPONSE_COLUMNS).where(Comment.feed_id == feed_id)
 
-    if sort_by == "create_dt_desc":
-        query = query.order_by(desc(Comment.create_dt))
-    elif sort_by == "create_dt_asc":
-        query = query.order_by(asc(Comment.create_dt))
-
-    query = query.offset(skip).limit(limit)
+    key_columns, descending = COMMENT_SORT_KEYS.get(sort_by, COMMENT_SORT_KEYS["create_dt_desc"])
+    query = paginate(query, key_columns, descending, skip, limit, cursor)
 
     comments_result = await db.execute(query)
-    comments = comments_result.scalars().all()
+    comments, next_cursor = split_page(comments_result.all(), key_columns, limit)
+
+    author_nicknames = await get_author_nicknames(
+        db, [comment.author_email for comment in comments]
+    )
 
-    comment_responses = []
+    comment_responses = [
+        comment_to_response(comment, author_nicknames.get(comment.author_email))
+        for comment in comments
+    ]
 
-    for comment in comments:
-        result = await db.execute(select(User).where(User.email == comment.author_email))
-        author = result.scalar_one_or_none()
+    return comment_responses, next_cursor
 
-        author_nickname = author.nickname
 
-        comment_responses.append(
-            {
-                "id": comment.id,
-                "content": comment.content,
-                "author_email": comment.author_email,
-                "author_nickname": author_nickname,
-                "feed_id": comment.feed_id,
-                "create_dt": comment.create_dt,
-                "update_dt": comment.update_dt,
-            }
-        )
+async def get_comment_version_by_feed_id(
+    db: AsyncSession,
+    feed_id: int,
+    skip: int = 0,
+    limit: int = 10,
+    sort_by: str = "create_dt_desc",
+    cursor: Optional[str] = None,
+):
+    # get_comment_by_feed_id 와 같은 페이지의 버전 값과 다음 커서만 읽는다 (ETag 검증용)
+    key_columns, descending = COMMENT_SORT_KEYS.get(sort_by, COMMENT_SORT_KEYS["create_dt_desc"])
+    query = select(*with_key_columns(COMMENT_VERSION_COLUMNS, key_columns))
+    query = query.where(Comment.feed_id == feed_id)
+    result = await db.execute(paginate(query, key_columns, descending, skip, limit, cursor))
+    comments, next_cursor = split_page(result.all(), key_columns, limit)
 
-    return comment_responses
+    return (
+        comment_list_version([comment._mapping for comment in comments], next_cursor),
+        next_cursor,
+    )
 
 
 async def update_comment(
-    db: AsyncSession, comment_id: int, comment_update: CommentUpdate, email: str
+    db: AsyncSession, comment_id: int, comment_update: CommentUpdate, user: User
 ):
     result = await db.execute(select(Comment).where(Comment.id == comment_id))
     db_comment = result.scalar_one_or_none()
@@ -98,7 +119,7 @@ async def update_comment(
     if db_comment is None:
         raise HTTPException(status_code=404, detail="Comment Not Found")
 
-    if db_comment.author_email != email:
+    if db_comment.author_email != user.email:
         raise HTTPException(status_code=403, detail="Permission Denied")
 
     db_comment.content = comment_update.content or db_comment.content
@@ -109,38 +130,24 @@ async def update_comment(
     await db.commit()
     await db.refresh(db_comment)
 
-    result = await db.execute(select(User).where(User.email == email))
-    author = result.scalar_one_or_none()
-
-    if author is None:
-        raise HTTPException(status_code=404, detail="Author Not Found")
+    author_nickname = user.nickname
 
-    author_nickname = author.nickname
-
-    return {
-        "id": db_comment.id,
-        "content": db_comment.content,
-        "author_email": db_comment.author_email,
-        "author_nickname": author_nickname,
-        "feed_id": db_comment.feed_id,
-        "create_dt": db_comment.create_dt,
-        "update_dt": db_comment.update_dt,
-    }
+    return comment_to_response(db_comment, author_nickname)
 
 
 async def delete_comment(db: AsyncSession, comment_id: int, email: str):
     result = await db.execute(select(Comment).where(Comment.id == comment_id))
     db_comment = result.scalar_one_or_none()
 
-    logging.debug(f"Selected Comment: {db_comment}")
-
     if db_comment is None:
         raise HTTPException(status_code=404, detail="Comment Not Found")
 
     if db_comment.author_email != email:
         raise HTTPException(status_code=403, detail="Permission Denied")
 
+    # 좋아요는 대상 없이 남을 수 없으므로 (ck_like_single_target) 먼저 삭제
+    await db.execute(delete(Like).where(Like.comment_id == comment_id))
     await db.delete(db_comment)
-    logging.debug("Comment deleted, committing...")
+    await counter_service.increment(db, counter_service.USER_COMMENTS, email, -1)
     await db.commit()
-    logging.debug("Changes committed.")
+    logger.debug("Deleted comment %s", comment_id)
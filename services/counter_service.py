@@ -0,0 +1,93 @@
+from fastapi import HTTPException
+from sqlalchemy import select, delete, func, literal, cast, String
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.counter import Counter
+from models.feed import Feed
+from models.comment import Comment
+from models.follow import Follow
+from typing import Optional
+
+FEEDS = "feeds"
+USER_FEEDS = "user_feeds"
+USER_COMMENTS = "user_comments"
+FOLLOWERS = "followers"
+FOLLOWINGS = "followings"
+
+COUNT_MODES = ("exact", "cached", "none")
+
+
+def increment_statement(scope: str, key="", delta=1):
+    # 행이 없으면 delta 로 생성, 있으면 value + delta (트랜잭션 안에서 원자적으로 갱신)
+    stmt = insert(Counter).values(scope=scope, key=str(key), value=delta)
+    return stmt.on_conflict_do_update(
+        index_elements=[Counter.scope, Counter.key],
+        set_={"value": Counter.value + stmt.excluded.value},
+    )
+
+
+async def increment(db: AsyncSession, scope: str, key="", delta: int = 1):
+    # commit 은 호출한 서비스의 트랜잭션에 맡긴다
+    await db.execute(increment_statement(scope, key, delta))
+
+
+def cached_count_query(scope: str, key=""):
+    return select(func.coalesce(func.sum(Counter.value), 0)).where(
+        Counter.scope == scope, Counter.key == str(key)
+    )
+
+
+def validator_count_mode(count_mode: str) -> str:
+    # 조건부 요청 검증에서는 정확한 count 대신 같은 트랜잭션으로 갱신되는 카운터를 본다
+    return "cached" if count_mode == "exact" else count_mode
+
+
+def check_count_mode(count_mode: str):
+    if count_mode not in COUNT_MODES:
+        raise HTTPException(
+            status_code=400, detail=f"count_mode must be one of {', '.join(COUNT_MODES)}"
+        )
+
+
+async def resolve_count(
+    db: AsyncSession, count_mode: str, exact_query, cached_query
+) -> Optional[int]:
+    check_count_mode(count_mode)
+
+    if count_mode == "none":
+        return None
+
+    query = cached_query if count_mode == "cached" else exact_query
+    result = await db.execute(query)
+    total_count = result.scalar_one_or_none()
+    if total_count is None:
+        total_count = 0
+
+    return int(total_count)
+
+
+async def rebuild_counters(db: AsyncSession):
+    # 원본 테이블에서 모든 카운터를 다시 계산 (초기 적재 및 드리프트 보정용)
+    await db.execute(delete(Counter))
+
+    sources = [
+        select(literal(FEEDS), literal(""), func.count()).select_from(Feed),
+        select(literal(USER_FEEDS), Feed.author_email, func.count())
+        .where(Feed.author_email.is_not(None))
+        .group_by(Feed.author_email),
+        select(literal(USER_COMMENTS), Comment.author_email, func.count())
+        .where(Comment.author_email.is_not(None))
+        .group_by(Comment.author_email),
+        select(literal(FOLLOWERS), cast(Follow.following_id, String), func.count()).group_by(
+            Follow.following_id
+        ),
+        select(literal(FOLLOWINGS), cast(Follow.follower_id, String), func.count()).group_by(
+            Follow.follower_id
+        ),
+    ]
+    for source in sources:
+        await db.execute(
+            insert(Counter).from_select([Counter.scope, Counter.key, Counter.value], source)
+        )
+
+    await db.commit()
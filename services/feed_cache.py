@@ -0,0 +1,283 @@
+from collections import OrderedDict
+from config import settings
+from typing import Awaitable, Callable, Dict, Optional
+import asyncio
+import logging
+import orjson
+import time
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import WatchError
+except ImportError:  # redis 가 없으면 프로세스 내부 캐시만 사용
+    aioredis = None
+    WatchError = None
+
+logger = logging.getLogger(__name__)
+
+# 피드 상세 캐시 크기와 최대 보관 시간(초)
+# 프로세스 내부 캐시는 다른 워커의 무효화를 받지 못하므로 TTL 이 곧 최대 지연
+FEED_CACHE_SIZE = getattr(settings, "FEED_CACHE_SIZE", 10000)
+FEED_CACHE_TTL_SECONDS = getattr(settings, "FEED_CACHE_TTL_SECONDS", 30)
+# 설정하면 워커들이 Redis 에 캐시를 공유 (무효화도 모든 워커에 반영)
+FEED_CACHE_REDIS_URL = getattr(settings, "FEED_CACHE_REDIS_URL", None)
+# Redis 의 키별 세대 값 보관 시간(초) - 한 번의 DB 조회보다 충분히 길어야 한다
+FEED_CACHE_GENERATION_TTL_SECONDS = getattr(settings, "FEED_CACHE_GENERATION_TTL_SECONDS", 3600)
+
+
+class InMemoryFeedCacheBackend:
+    # 프로세스 내부 LRU + TTL - 같은 인터페이스로 Redis 등 공유 저장소로 교체 가능
+    def __init__(self, max_size: int = FEED_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._tags: Dict[str, set] = {}
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        tag_keys = self._tags.get(entry[2])
+        if tag_keys is not None:
+            tag_keys.discard(key)
+            if not tag_keys:
+                del self._tags[entry[2]]
+
+    async def get(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value, _ = entry
+        if time.monotonic() >= expires_at:
+            self._drop(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def generation(self, key: str):
+        # 한 프로세스 안에서는 FeedCache 의 inflight 확인으로 충분하다 (set 도중 await 없음)
+        return None
+
+    async def set(self, key: str, value: dict, ttl: float, tag: str, generation=None) -> bool:
+        self._drop(key)
+        self._entries[key] = (time.monotonic() + ttl, value, tag)
+        self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_size:
+            self._drop(next(iter(self._entries)))
+        return True
+
+    async def update(self, key: str, fields: dict):
+        # 남은 만료 시간은 그대로 두고 값의 일부만 바꾼다 (없거나 만료된 항목은 무시)
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() >= entry[0]:
+            return
+        expires_at, value, tag = entry
+        self._entries[key] = (expires_at, {**value, **fields}, tag)
+
+    async def delete(self, key: str):
+        self._drop(key)
+
+    async def delete_tag(self, tag: str):
+        for key in list(self._tags.get(tag, ())):
+            self._drop(key)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisFeedCacheBackend:
+    # redis.asyncio.Redis 호환 클라이언트 (fakeredis.aioredis.FakeRedis 포함)
+    # 무효화/like 갱신마다 키의 세대 값을 올리고, 조회 결과는 조회 시작 때와 세대가 같을 때만 저장
+    # 다른 워커의 무효화가 조회 중이나 저장 중에 끼어들어도 이전 값으로 덮어쓰지 않는다
+    def __init__(self, client, prefix: str = "feed-cache:"):
+        self.client = client
+        self.prefix = prefix
+        self.generation_ttl_ms = int(FEED_CACHE_GENERATION_TTL_SECONDS * 1000)
+
+    def _generation_key(self, key: str) -> str:
+        return self.prefix + "gen:" + key
+
+    def _bump(self, pipe, key: str):
+        pipe.incr(self._generation_key(key))
+        pipe.pexpire(self._generation_key(key), self.generation_ttl_ms)
+
+    async def generation(self, key: str) -> bytes:
+        return await self.client.get(self._generation_key(key)) or b"0"
+
+    async def get(self, key: str) -> Optional[dict]:
+        value = await self.client.get(self.prefix + key)
+        return None if value is None else orjson.loads(value)
+
+    async def set(self, key: str, value: dict, ttl: float, tag: str, generation=None) -> bool:
+        tag_key = self.prefix + "tag:" + tag
+        ttl_ms = int(ttl * 1000)
+        async with self.client.pipeline(transaction=True) as pipe:
+            if generation is not None:
+                # WATCH 이후 세대가 바뀌면 EXEC 가 실패한다
+                await pipe.watch(self._generation_key(key))
+                if (await pipe.get(self._generation_key(key)) or b"0") != generation:
+                    return False
+                pipe.multi()
+            pipe.set(self.prefix + key, orjson.dumps(value, option=orjson.OPT_UTC_Z), px=ttl_ms)
+            # 태그 집합은 가장 늦게 만료되는 항목만큼만 유지
+            pipe.sadd(tag_key, key)
+            pipe.pexpire(tag_key, ttl_ms)
+            try:
+                await pipe.execute()
+            except WatchError:
+                return False
+        return True
+
+    async def update(self, key: str, fields: dict):
+        # 읽고 다시 쓰는 사이에 다른 워커의 갱신이 끼어들면 이전 값이 남을 수 있다
+        # (다음 갱신이나 TTL 만료 때까지) - xx/keepttl 로 없는 항목을 만들거나 만료를 늘리지 않는다
+        # 세대를 먼저 올려 진행 중인 조회가 이전 like_count 를 저장하지 못하게 한다
+        async with self.client.pipeline(transaction=True) as pipe:
+            self._bump(pipe, key)
+            await pipe.execute()
+        value = await self.client.get(self.prefix + key)
+        if value is None:
+            return
+        value = {**orjson.loads(value), **fields}
+        await self.client.set(
+            self.prefix + key,
+            orjson.dumps(value, option=orjson.OPT_UTC_Z),
+            xx=True,
+            keepttl=True,
+        )
+
+    async def delete(self, key: str):
+        async with self.client.pipeline(transaction=True) as pipe:
+            self._bump(pipe, key)
+            pipe.delete(self.prefix + key)
+            await pipe.execute()
+
+    async def delete_tag(self, tag: str):
+        tag_key = self.prefix + "tag:" + tag
+        keys = [key.decode() for key in await self.client.smembers(tag_key)]
+        async with self.client.pipeline(transaction=True) as pipe:
+            for key in keys:
+                self._bump(pipe, key)
+            pipe.delete(tag_key, *[self.prefix + key for key in keys])
+            await pipe.execute()
+
+
+class FeedCache:
+    def __init__(self, backend, ttl: float = FEED_CACHE_TTL_SECONDS):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+        self.like_updates = 0
+        # 같은 키를 읽는 동시 요청은 하나의 DB 조회를 기다린다 (single-flight)
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def get_or_load(self, feed_id: int, loader: Callable[[], Awaitable[dict]]) -> dict:
+        key = str(feed_id)
+        while True:
+            try:
+                value = await self.backend.get(key)
+            except Exception:
+                # 캐시 저장소 장애는 캐시 미스로 취급하고 DB 에서 읽는다
+                logger.warning("Feed cache get failed for %s", key, exc_info=True)
+                value = None
+            if value is not None:
+                self.hits += 1
+                return value
+
+            future = self._inflight.get(key)
+            if future is None:
+                break
+
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # 조회하던 요청이 취소된 경우에만 다시 시도
+                if not future.cancelled():
+                    raise
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        cacheable = True
+        try:
+            # 조회 전의 세대 - 저장할 때 다시 비교해 다른 워커의 무효화를 놓치지 않는다
+            try:
+                generation = await self.backend.generation(key)
+            except Exception:
+                logger.warning("Feed cache generation failed for %s", key, exc_info=True)
+                generation, cacheable = None, False
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 기다리는 요청이 없어도 경고가 남지 않도록
+            raise
+        finally:
+            current = self._inflight.get(key) is future
+            if current:
+                del self._inflight[key]
+
+        future.set_result(value)
+        # 조회 중에 이 프로세스에서 무효화되었으면 (inflight 에서 빠졌으면) 캐시에 넣지 않는다
+        # 저장 중이나 다른 워커의 무효화는 backend.set 이 세대를 비교해 거절한다
+        if current and cacheable:
+            # 작성자 이메일을 태그로 두어 작성자 단위로 무효화
+            try:
+                await self.backend.set(key, value, self.ttl, value["author_email"], generation)
+            except Exception:
+                logger.warning("Feed cache set failed for %s", key, exc_info=True)
+        return value
+
+    async def invalidate(self, feed_id: int):
+        # 변경을 commit 한 뒤에 호출해야 이전 값이 다시 채워지지 않는다
+        key = str(feed_id)
+        self.invalidations += 1
+        self._inflight.pop(key, None)
+        await self.backend.delete(key)
+
+    async def set_like_count(self, feed_id: int, like_count: int):
+        # like 는 인기 피드일수록 자주 바뀌므로 항목을 비우지 않고 like_count 만 바꾼다
+        # 진행 중인 조회는 이전 like_count 를 읽었을 수 있으므로 결과를 저장하지 않게 한다
+        key = str(feed_id)
+        self.like_updates += 1
+        self._inflight.pop(key, None)
+        await self.backend.update(key, {"like_count": like_count})
+
+    async def invalidate_author(self, author_email: str):
+        # 닉네임 등 작성자 정보가 바뀌면 그 작성자의 피드를 모두 비운다
+        self.invalidations += 1
+        self._inflight.clear()
+        await self.backend.delete_tag(author_email)
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "like_updates": self.like_updates,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "size": len(self.backend) if hasattr(self.backend, "__len__") else None,
+        }
+
+
+def _default_backend():
+    if FEED_CACHE_REDIS_URL and aioredis is not None:
+        return RedisFeedCacheBackend(aioredis.from_url(FEED_CACHE_REDIS_URL))
+    return InMemoryFeedCacheBackend()
+
+
+feed_cache = FeedCache(_default_backend())
+
+
+def set_feed_cache_backend(backend):
+    feed_cache.backend = backend
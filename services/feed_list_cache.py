@@ -0,0 +1,124 @@
+from config import settings
+from config.compression_config import CompressedBody
+from typing import Awaitable, Callable, Dict, Hashable, Tuple
+from fastapi import HTTPException
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# 이 시간(초) 동안은 그대로 응답하고, 이후 STALE 구간에는 이전 응답을 주면서 백그라운드 갱신
+FEED_LIST_CACHE_TTL_SECONDS = getattr(settings, "FEED_LIST_CACHE_TTL_SECONDS", 2)
+FEED_LIST_CACHE_STALE_SECONDS = getattr(settings, "FEED_LIST_CACHE_STALE_SECONDS", 30)
+# 앞쪽 몇 페이지만 캐시 (skip 이 limit 의 배수인 offset 페이지, cursor 요청은 제외)
+FEED_LIST_CACHE_PAGES = getattr(settings, "FEED_LIST_CACHE_PAGES", 3)
+FEED_LIST_CACHE_MAX_LIMIT = getattr(settings, "FEED_LIST_CACHE_MAX_LIMIT", 50)
+# 보관할 최대 페이지 수 - 넘으면 가장 오래 전에 저장한 페이지부터 버린다
+FEED_LIST_CACHE_SIZE = getattr(settings, "FEED_LIST_CACHE_SIZE", 256)
+
+HIT = "HIT"
+STALE = "STALE"
+MISS = "MISS"
+BYPASS = "BYPASS"
+
+
+class FeedListCache:
+    # 직렬화된 목록 응답 (bytes, 압축 결과 포함) 캐시 - stale-while-revalidate + single-flight 갱신
+    def __init__(
+        self,
+        ttl: float = FEED_LIST_CACHE_TTL_SECONDS,
+        stale_ttl: float = FEED_LIST_CACHE_STALE_SECONDS,
+        max_size: int = FEED_LIST_CACHE_SIZE,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self._entries: Dict[Hashable, Tuple[float, CompressedBody]] = {}
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        # 무효화 이전에 시작한 조회 결과는 저장하지 않도록 세대 번호로 구분
+        self._generation = 0
+
+    def cacheable(self, skip: int, limit: int, cursor) -> bool:
+        return (
+            cursor is None
+            and 0 < limit <= FEED_LIST_CACHE_MAX_LIMIT
+            and skip % limit == 0
+            and skip < limit * FEED_LIST_CACHE_PAGES
+        )
+
+    async def get(
+        self, key: Hashable, loader: Callable[[], Awaitable[bytes]]
+    ) -> Tuple[CompressedBody, str]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl:
+                self.hits += 1
+                return entry[1], HIT
+            if age < self.ttl + self.stale_ttl:
+                # 이미 갱신 중이면 새로 시작하지 않는다
+                if key not in self._inflight:
+                    self.refreshes += 1
+                    self._load(key, loader)
+                self.stale_hits += 1
+                return entry[1], STALE
+
+        self.misses += 1
+        task = self._inflight.get(key) or self._load(key, loader)
+        # 요청이 취소되어도 다른 요청이 기다리는 조회는 계속 진행
+        return await asyncio.shield(task), MISS
+
+    def _load(self, key: Hashable, loader: Callable[[], Awaitable[bytes]]) -> asyncio.Task:
+        task = asyncio.create_task(self._run(key, loader, self._generation))
+        task.add_done_callback(_log_failure)
+        self._inflight[key] = task
+        return task
+
+    async def _run(self, key: Hashable, loader: Callable[[], Awaitable[bytes]], generation: int):
+        try:
+            body = CompressedBody(await loader())
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+        if generation == self._generation:
+            # 다시 넣어 저장 순서의 맨 뒤로 보낸다
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic(), body)
+            while len(self._entries) > self.max_size:
+                del self._entries[next(iter(self._entries))]
+        return body
+
+    def clear(self):
+        # 피드가 추가/삭제되면 모든 목록 페이지가 바뀌므로 전체를 비운다
+        self._generation += 1
+        self._entries.clear()
+        self._inflight.clear()
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "hit_ratio": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            "size": len(self._entries),
+        }
+
+
+def _log_failure(task: asyncio.Task):
+    # 기다리는 요청이 없는 백그라운드 갱신의 실패도 기록
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None and not isinstance(error, HTTPException):
+        logger.warning("Feed list refresh failed", exc_info=error)
+
+
+feed_list_cache = FeedListCache()
@@ -2,64 +2,90 @@ from fastapi import HTTPException, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 from sqlalchemy.future import select
-from sqlalchemy import desc, asc, func
-from models.feed import Feed, FeedCreate, FeedUpdate, FeedResponse, FeedListResponse
+from sqlalchemy import func, update, delete
+from models.feed import (
+    Feed,
+    FeedCreate,
+    FeedUpdate,
+    FeedUploadFile,
+    FEED_RESPONSE_COLUMNS,
+    FEED_VERSION_COLUMNS,
+    feed_to_response,
+    feed_list_version,
+)
 from models.user import User
-from config import settings
+from models.like import Like
+from models.counter import Counter
 from typing import List, Optional
-import uuid
-from config.s3_config import get_s3_client
+from services.pagination import paginate, split_page, with_key_columns
+from services.author_service import feed_author_join
+from services import counter_service, timeline_service, media_service
+from services.feed_cache import feed_cache
+from services.feed_list_cache import feed_list_cache
 import pytz
 import logging
 
-logging.basicConfig(level=logging.NOTSET)
+logger = logging.getLogger(__name__)
+
+# sort_by 옵션별 keyset 정렬 키 (마지막 컬럼은 항상 고유한 id)
+FEED_SORT_KEYS = {
+    "id_desc": ((Feed.id,), True),
+    "id_asc": ((Feed.id,), False),
+    "create_dt_desc": ((Feed.create_dt, Feed.id), True),
+    "create_dt_asc": ((Feed.create_dt, Feed.id), False),
+    "update_dt_desc": ((Feed.update_dt, Feed.id), True),
+    "update_dt_asc": ((Feed.update_dt, Feed.id), False),
+}
+
+
+def resolve_sort_by(sort_by: str) -> str:
+    # 알 수 없는 정렬 옵션은 기본 정렬로 조회된다
+    return sort_by if sort_by in FEED_SORT_KEYS else "create_dt_desc"
 
 
 async def create_feed(
-    db: AsyncSession, feed: FeedCreate, author_email: str, images: List[UploadFile] = None
+    db: AsyncSession, feed: FeedCreate, author: User, images: List[UploadFile] = None
 ):
+    author_email = author.email
     feed_dict = feed.model_dump()
     feed_dict["author_email"] = author_email
+    feed_dict["author_id"] = author.id
 
     korea = pytz.timezone("Asia/Seoul")
     current_time_in_korea = datetime.now(korea)
     feed_dict["create_dt"] = current_time_in_korea
     feed_dict["update_dt"] = current_time_in_korea
 
-    if images:
-        image_urls = await upload_image_to_s3(images)
-        feed_dict["image_urls"] = image_urls
-
-    author = await db.execute(select(User).where(User.email == author_email))
-    author = author.scalar_one_or_none()
-
-    if author is None:
-        raise HTTPException(status_code=404, detail="Author Not Found")
+    # 이미지는 로컬에 임시 저장만 하고 S3 업로드/변환은 백그라운드 워커가 처리
+    staged = await media_service.stage_images(images) if images else []
+    feed_dict["image_urls"] = []
+    feed_dict["pending_media_ids"] = [media.media_id for media in staged]
+    feed_dict["pending_media_since"] = current_time_in_korea if staged else None
 
     author_nickname = author.nickname
 
     db_feed = Feed(**feed_dict)
     db.add(db_feed)
+    await counter_service.increment(db, counter_service.FEEDS)
+    await counter_service.increment(db, counter_service.USER_FEEDS, author_email)
     await db.commit()
     await db.refresh(db_feed)
+    feed_list_cache.clear()
+
+    await media_service.enqueue_media(db_feed.id, staged)
+    await timeline_service.fan_out_feed(db, author, db_feed.id)
 
-    return {
-        "id": db_feed.id,
-        "title": db_feed.title,
-        "content": db_feed.content,
-        "author_email": db_feed.author_email,
-        "author_nickname": author_nickname,
-        "image_urls": db_feed.image_urls,
-        "create_dt": db_feed.create_dt,
-        "update_dt": db_feed.update_dt,
-    }
+    return feed_to_response(db_feed, author_nickname)
 
 
 async def get_feed_by_id(db: AsyncSession, feed_id: int):
+    # 자주 읽히고 드물게 바뀌는 상세 조회는 캐시를 거친다 (변경 시 무효화)
+    return await feed_cache.get_or_load(feed_id, lambda: _load_feed_by_id(db, feed_id))
+
+
+async def _load_feed_by_id(db: AsyncSession, feed_id: int):
     feed_data = await db.execute(
-        select(Feed, User.nickname)
-        .join(User, User.email == Feed.author_email)
-        .where(Feed.id == feed_id)
+        select(Feed, User.nickname).join(User, feed_author_join()).where(Feed.id == feed_id)
     )
     feed_data = feed_data.first()
 
@@ -68,16 +94,31 @@ async def get_feed_by_id(db: AsyncSession, feed_id: int):
 
     feed, nickname = feed_data
 
-    return {
-        "id": feed.id,
-        "title": feed.title,
-        "content": feed.content,
-        "author_email": feed.author_email,
-        "author_nickname": nickname,
-        "image_urls": feed.image_urls,
-        "create_dt": feed.create_dt,
-        "update_dt": feed.update_dt,
-    }
+    return feed_to_response(feed, nickname)
+
+
+def _user_condition(user_id: int = None, nickname: str = None, email: str = None):
+    if user_id:
+        return User.id == user_id
+    if nickname:
+        return User.nickname == nickname
+    if email:
+        return User.email == email
+    raise HTTPException(
+        status_code=400, detail="Either user_id, nickname, or email must be provided"
+    )
+
+
+async def _count_user_feeds(db: AsyncSession, count_mode: str, condition):
+    # nickname 은 고유하지 않으므로 cached 모드도 조건에 맞는 사용자들의 카운터를 합산
+    return await counter_service.resolve_count(
+        db,
+        count_mode,
+        select(func.count()).select_from(Feed).join(User, feed_author_join()).where(condition),
+        select(func.coalesce(func.sum(Counter.value), 0))
+        .join(User, User.email == Counter.key)
+        .where(Counter.scope == counter_service.USER_FEEDS, condition),
+    )
 
 
 async def get_feeds_by_user(
@@ -88,65 +129,52 @@ async def get_feeds_by_user(
     skip: int = 0,
     limit: int = 10,
     sort_by: str = "create_dt_desc",
+    cursor: Optional[str] = None,
+    count_mode: str = "exact",
 ):
-    if not user_id and not nickname and not email:
-        raise HTTPException(
-            status_code=400, detail="Either user_id, nickname, or email must be provided"
-        )
+    condition = _user_condition(user_id, nickname, email)
 
-    query = select(Feed, User.nickname).join(User, User.email == Feed.author_email)
+    query = select(*FEED_RESPONSE_COLUMNS, User.nickname).join(User, feed_author_join())
+    query = query.where(condition)
 
-    condition = None
-    if user_id:
-        condition = User.id == user_id
-    elif nickname:
-        condition = User.nickname == nickname
-    elif email:
-        condition = User.email == email
+    key_columns, descending = FEED_SORT_KEYS.get(sort_by, FEED_SORT_KEYS["create_dt_desc"])
 
-    query = query.where(condition)
+    total_count = await _count_user_feeds(db, count_mode, condition)
 
-    if sort_by == "id_desc":
-        query = query.order_by(desc(Feed.id))
-    elif sort_by == "id_asc":
-        query = query.order_by(asc(Feed.id))
-    elif sort_by == "create_dt_desc":
-        query = query.order_by(desc(Feed.create_dt))
-    elif sort_by == "create_dt_asc":
-        query = query.order_by(asc(Feed.create_dt))
+    query = paginate(query, key_columns, descending, skip, limit, cursor)
 
-    total_count_result = await db.execute(select(func.count()).select_from(Feed).where(condition))
-    total_count = total_count_result.scalar_one_or_none()
-    if total_count is None:
-        total_count = 0
+    feeds_result = await db.execute(query)
+    feeds, next_cursor = split_page(feeds_result.all(), key_columns, limit)
 
-    print(f"total_count type: {type(total_count)} value: {total_count}")
+    feed_responses = [feed_to_response(feed, feed.nickname) for feed in feeds]
 
-    total_count = int(total_count)
+    return total_count, feed_responses, next_cursor
 
-    query = query.offset(skip).limit(limit)
 
-    feeds_result = await db.execute(query)
-    feeds = feeds_result.all()
-    if feeds is None:
-        feeds = []
-
-    feed_responses = []
-
-    for feed, nickname in feeds:
-        feed_dict = FeedResponse(
-            id=feed.id,
-            title=feed.title,
-            content=feed.content,
-            author_email=feed.author_email,
-            author_nickname=nickname,
-            image_urls=feed.image_urls,
-            create_dt=feed.create_dt,
-            update_dt=feed.update_dt,
-        )
-        feed_responses.append(feed_dict.model_dump())
+async def get_feeds_by_user_version(
+    db: AsyncSession,
+    user_id: int = None,
+    nickname: str = None,
+    email: str = None,
+    skip: int = 0,
+    limit: int = 10,
+    sort_by: str = "create_dt_desc",
+    cursor: Optional[str] = None,
+    count_mode: str = "exact",
+):
+    # get_feeds_by_user 와 같은 페이지의 버전 값과 다음 커서만 읽는다 (ETag 검증용)
+    condition = _user_condition(user_id, nickname, email)
+    key_columns, descending = FEED_SORT_KEYS.get(sort_by, FEED_SORT_KEYS["create_dt_desc"])
+
+    total_count = await _count_user_feeds(
+        db, counter_service.validator_count_mode(count_mode), condition
+    )
+    query = select(*with_key_columns(FEED_VERSION_COLUMNS, key_columns))
+    query = query.join(User, feed_author_join()).where(condition)
+    result = await db.execute(paginate(query, key_columns, descending, skip, limit, cursor))
+    feeds, next_cursor = split_page(result.all(), key_columns, limit)
 
-    return total_count, feed_responses
+    return feed_list_version(total_count, [feed._mapping for feed in feeds], next_cursor)
 
 
 async def get_feeds(
@@ -154,167 +182,214 @@ async def get_feeds(
     skip: int = 0,
     limit: int = 10,
     sort_by: str = "create_dt_desc",
+    cursor: Optional[str] = None,
+    count_mode: str = "exact",
 ):
-    query = select(Feed, User.nickname).join(User, User.email == Feed.author_email)
+    query = select(*FEED_RESPONSE_COLUMNS, User.nickname).join(User, feed_author_join())
 
-    if sort_by == "create_dt_desc":
-        query = query.order_by(desc(Feed.create_dt))
-    elif sort_by == "create_dt_asc":
-        query = query.order_by(asc(Feed.create_dt))
-    elif sort_by == "update_dt_desc":
-        query = query.order_by(desc(Feed.update_dt))
-    elif sort_by == "update_dt_asc":
-        query = query.order_by(asc(Feed.update_dt))
+    key_columns, descending = FEED_SORT_KEYS.get(sort_by, FEED_SORT_KEYS["create_dt_desc"])
 
-    total_count_result = await db.execute(select(func.count()).select_from(Feed))
-    total_count = total_count_result.scalar_one_or_none()
-    if total_count is None:
-        total_count = 0
-
-    total_count = int(total_count)
+    total_count = await counter_service.resolve_count(
+        db,
+        count_mode,
+        select(func.count()).select_from(Feed),
+        counter_service.cached_count_query(counter_service.FEEDS),
+    )
 
-    query = query.offset(skip).limit(limit)
+    query = paginate(query, key_columns, descending, skip, limit, cursor)
 
     feeds_result = await db.execute(query)
-    feeds = feeds_result.all()
-    if feeds is None:
-        feeds = []
-
-    feed_responses = []
-
-    for feed, nickname in feeds:
-        feed_dict = FeedResponse(
-            id=feed.id,
-            title=feed.title,
-            content=feed.content,
-            author_email=feed.author_email,
-            author_nickname=nickname,
-            image_urls=feed.image_urls,
-            create_dt=feed.create_dt,
-            update_dt=feed.update_dt,
-        )
-        feed_responses.append(feed_dict.model_dump())
+    feeds, next_cursor = split_page(feeds_result.all(), key_columns, limit)
 
-    return total_count, feed_responses
+    feed_responses = [feed_to_response(feed, feed.nickname) for feed in feeds]
+
+    return total_count, feed_responses, next_cursor
+
+
+async def get_feeds_version(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    sort_by: str = "create_dt_desc",
+    cursor: Optional[str] = None,
+    count_mode: str = "exact",
+):
+    # get_feeds 와 같은 페이지의 버전 값과 다음 커서만 읽는다 (ETag 검증용)
+    key_columns, descending = FEED_SORT_KEYS.get(sort_by, FEED_SORT_KEYS["create_dt_desc"])
+
+    total_count = await counter_service.resolve_count(
+        db,
+        counter_service.validator_count_mode(count_mode),
+        select(func.count()).select_from(Feed),
+        counter_service.cached_count_query(counter_service.FEEDS),
+    )
+    query = select(*with_key_columns(FEED_VERSION_COLUMNS, key_columns))
+    result = await db.execute(paginate(query, key_columns, descending, skip, limit, cursor))
+    feeds, next_cursor = split_page(result.all(), key_columns, limit)
+
+    return feed_list_version(total_count, [feed._mapping for feed in feeds], next_cursor)
 
 
 async def update_feed(
     db: AsyncSession,
     feed_id: int,
     feed_update: FeedUpdate,
-    email: str,
+    user: User,
     new_images: Optional[List[UploadFile]] = None,
     target_image_urls: Optional[List[str]] = None,
 ):
-    db_feed = await db.execute(select(Feed).where(Feed.id == feed_id))
+    # 미디어 워커가 image_urls 를 동시에 갱신하지 않도록 행 잠금
+    db_feed = await db.execute(select(Feed).where(Feed.id == feed_id).with_for_update())
     db_feed = db_feed.scalar_one_or_none()
 
-    korea = pytz.timezone("Asia/Seoul")
-    current_time_in_korea = datetime.now(korea)
-    db_feed.update_dt = current_time_in_korea
-
     if db_feed is None:
         raise HTTPException(status_code=404, detail="Feed Not Found")
 
-    if db_feed.author_email != email:
+    if db_feed.author_email != user.email:
         raise HTTPException(status_code=403, detail="Permission Denied")
 
-    result = await db.execute(select(User).where(User.email == email))
-    author = result.scalar_one_or_none()
+    korea = pytz.timezone("Asia/Seoul")
+    current_time_in_korea = datetime.now(korea)
+    db_feed.update_dt = current_time_in_korea
 
-    author_nickname = author.nickname
+    author_nickname = user.nickname
 
     db_feed.title = feed_update.title
     db_feed.content = feed_update.content
 
     existing_image_urls = db_feed.image_urls or []
 
-    # Case 1: Both new_images and target_image_urls exist
-    if new_images and target_image_urls:
-        for url in target_image_urls:
-            print(url)
-            await delete_image_from_s3(url)
-        new_image_urls = await upload_image_to_s3(new_images)
-        existing_image_urls = [url for url in existing_image_urls if url not in target_image_urls]
-        existing_image_urls = existing_image_urls + new_image_urls
-
-    # Case 2: Only new_images exist
-    elif new_images:
-        new_image_urls = await upload_image_to_s3(new_images)
-        existing_image_urls = existing_image_urls + new_image_urls
-
-    # Case 3: Only target_image_urls exist
-    elif target_image_urls:
-        for url in target_image_urls:
-            await delete_image_from_s3(url)
+    # 이 피드에 속한 이미지만 삭제 대상으로 인정
+    if target_image_urls:
+        # 같은 이미지가 여러 번 들어 있으면 그만큼 참조를 반납
+        target_image_urls = [url for url in existing_image_urls if url in target_image_urls]
+        await delete_images_from_s3(db, target_image_urls)
         existing_image_urls = [url for url in existing_image_urls if url not in target_image_urls]
+        if db_feed.image_variants:
+            db_feed.image_variants = {
+                url: variants
+                for url, variants in db_feed.image_variants.items()
+                if url not in target_image_urls
+            }
+
+    staged = []
+    if new_images:
+        staged = await media_service.stage_images(new_images)
+        db_feed.pending_media_ids = (db_feed.pending_media_ids or []) + [
+            media.media_id for media in staged
+        ]
+        db_feed.pending_media_since = current_time_in_korea
 
     db_feed.image_urls = existing_image_urls
-    print(db_feed.image_urls)
 
     await db.commit()
     await db.refresh(db_feed)
+    await feed_cache.invalidate(feed_id)
+    feed_list_cache.clear()
 
-    result = {
-        "id": db_feed.id,
-        "title": db_feed.title,
-        "content": db_feed.content,
-        "author_email": db_feed.author_email,
-        "author_nickname": author_nickname,
-        "image_urls": db_feed.image_urls,
-        "create_dt": db_feed.create_dt,
-        "update_dt": db_feed.update_dt,
-    }
+    await media_service.enqueue_media(db_feed.id, staged)
 
-    logging.debug(f"Updated feed: {result}")
+    result = feed_to_response(db_feed, author_nickname)
+
+    logger.debug("Updated feed %s", feed_id)
 
     return result
 
 
-async def delete_feed(db: AsyncSession, feed_id: int, email: str):
-    result = await db.execute(select(Feed).where(Feed.id == feed_id))
-    db_feed = result.scalars().first()
+async def create_upload_urls(
+    db: AsyncSession, feed_id: int, files: List[FeedUploadFile], user: User
+):
+    db_feed = await db.execute(select(Feed).where(Feed.id == feed_id))
+    db_feed = db_feed.scalar_one_or_none()
 
     if db_feed is None:
         raise HTTPException(status_code=404, detail="Feed Not Found")
 
-    if db_feed.author_email != email:
+    if db_feed.author_email != user.email:
         raise HTTPException(status_code=403, detail="Permission Denied")
 
-    image_urls = db_feed.image_urls
+    for file in files:
+        if file.content_type not in media_service.UPLOAD_CONTENT_TYPES:
+            raise HTTPException(status_code=400, detail="Unsupported Content Type")
+        if not 0 < file.size <= media_service.DIRECT_UPLOAD_MAX_BYTES:
+            raise HTTPException(status_code=400, detail="File Too Large")
 
-    for image_url in image_urls:
-        await delete_image_from_s3(image_url)
+    uploads = [await media_service.presign_upload(feed_id, file.content_type) for file in files]
 
-    await db.delete(db_feed)
+    return {"uploads": uploads, "expires_in": media_service.DIRECT_UPLOAD_EXPIRES}
+
+
+async def finalize_uploads(db: AsyncSession, feed_id: int, media_ids: List[str], user: User):
+    # 미디어 워커가 pending_media_ids 를 동시에 갱신하지 않도록 행 잠금
+    db_feed = await db.execute(select(Feed).where(Feed.id == feed_id).with_for_update())
+    db_feed = db_feed.scalar_one_or_none()
+
+    if db_feed is None:
+        raise HTTPException(status_code=404, detail="Feed Not Found")
+
+    if db_feed.author_email != user.email:
+        raise HTTPException(status_code=403, detail="Permission Denied")
+
+    pending_media_ids = db_feed.pending_media_ids or []
+    staged = []
+    for media_id in dict.fromkeys(media_ids):
+        if not media_service.MEDIA_ID_PATTERN.match(media_id):
+            raise HTTPException(status_code=400, detail="Invalid Media Id")
+        # 이미 처리 중인 업로드를 다시 확정하면 무시
+        if media_id in pending_media_ids:
+            continue
+        # 이 피드의 업로드 경로에 실제로 올라온 객체만 인정
+        size = await media_service.head_upload(feed_id, media_id)
+        if size is None:
+            raise HTTPException(status_code=404, detail="Upload Not Found")
+        # presigned 정책을 지원하지 않는 S3 호환 저장소를 위해 한 번 더 확인
+        if size > media_service.DIRECT_UPLOAD_MAX_BYTES:
+            await media_service.delete_s3_objects([media_service.upload_key(feed_id, media_id)])
+            raise HTTPException(status_code=400, detail="File Too Large")
+        staged.append(media_service.direct_upload(feed_id, media_id))
+
+    # 처리 대기 표시는 본문 수정이 아니므로 update_dt 는 유지
+    await db.execute(
+        update(Feed)
+        .where(Feed.id == feed_id)
+        .values(
+            pending_media_ids=pending_media_ids + [media.media_id for media in staged],
+            pending_media_since=func.now() if staged else Feed.pending_media_since,
+            update_dt=Feed.update_dt,
+        )
+    )
     await db.commit()
+    await feed_cache.invalidate(feed_id)
 
+    await media_service.enqueue_media(feed_id, staged)
 
-async def upload_image_to_s3(images: List[UploadFile]):
-    image_urls = []
+    return await get_feed_by_id(db, feed_id)
 
-    async with await get_s3_client() as s3_client:
-        for image in images:
-            logging.debug(f"Uploading {image.filename}")
-            image_name = f"{uuid.uuid4()}.png"
 
-            await s3_client.upload_fileobj(
-                image.file,
-                settings.S3_BUCKET,
-                image_name,
-                ExtraArgs={"ContentType": image.content_type},
-            )
+async def delete_feed(db: AsyncSession, feed_id: int, email: str):
+    result = await db.execute(select(Feed).where(Feed.id == feed_id))
+    db_feed = result.scalars().first()
 
-            image_url = f"https://{settings.S3_BUCKET}.s3.ap-northeast-2.amazonaws.com/{image_name}"
-            image_urls.append(image_url)
+    if db_feed is None:
+        raise HTTPException(status_code=404, detail="Feed Not Found")
 
-    return image_urls
+    if db_feed.author_email != email:
+        raise HTTPException(status_code=403, detail="Permission Denied")
 
+    image_urls = db_feed.image_urls
+
+    await delete_images_from_s3(db, image_urls or [])
+
+    # 좋아요는 대상 없이 남을 수 없으므로 (ck_like_single_target) 먼저 삭제
+    await db.execute(delete(Like).where(Like.feed_id == feed_id))
+    await db.delete(db_feed)
+    await counter_service.increment(db, counter_service.FEEDS, delta=-1)
+    await counter_service.increment(db, counter_service.USER_FEEDS, db_feed.author_email, -1)
+    await db.commit()
+    await feed_cache.invalidate(feed_id)
+    feed_list_cache.clear()
 
-async def delete_image_from_s3(image_url: str):
-    image_name = image_url.split("/")[-1]
-    bucket_name = settings.S3_BUCKET
-    logging.debug(f"Deleting from Bucket: {bucket_name}, Key: {image_name}")
 
-    async with await get_s3_client() as s3_client:
-        await s3_client.delete_object(Bucket=settings.S3_BUCKET, Key=image_name)
+async def delete_images_from_s3(db: AsyncSession, image_urls: List[str]):
+    # 다른 피드가 같은 이미지를 참조하고 있으면 S3 객체는 남는다
+    await media_service.delete_s3_objects(await media_service.release_images(db, image_urls))
@@ -1,7 +1,10 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from models.follow import Follow
-from services import auth_service
+from models.counter import Counter
+from services import counter_service, timeline_service
+from services.toggle import toggle_ctes, toggled_state
 from fastapi import HTTPException
 
 
@@ -9,23 +12,29 @@ async def toggle_follow(db: AsyncSession, follower_id: int, following_id: int):
     if follower_id == following_id:
         raise HTTPException(status_code=400, detail="You cannot follow yourself")
 
-    following = await auth_service.get_user_by_id(db, following_id)
+    # 팔로우 추가/삭제와 팔로워/팔로잉 카운터 갱신을 한 문장(한 번의 왕복)으로 처리
+    values = {"follower_id": follower_id, "following_id": following_id}
+    ctes, inserted_count, deleted_count, delta = toggle_ctes(Follow, values)
+    counters = [
+        counter_service.increment_statement(counter_service.FOLLOWERS, following_id, delta)
+        .returning(Counter.value)
+        .cte("followers_count"),
+        counter_service.increment_statement(counter_service.FOLLOWINGS, follower_id, delta)
+        .returning(Counter.value)
+        .cte("followings_count"),
+    ]
+    statement = select(inserted_count.label("inserted"), deleted_count.label("deleted"))
+    statement = statement.add_cte(*ctes, *counters)
 
-    if not following:
+    try:
+        result = await db.execute(statement)
+        followed = await toggled_state(db, Follow, values, *result.one())
+        await db.commit()
+    except IntegrityError:
+        # 존재하지 않는 사용자는 FK 제약에 걸린다
+        await db.rollback()
         raise HTTPException(status_code=404, detail="User not found")
 
-    result = await db.execute(
-        select(Follow).where(Follow.follower_id == follower_id, Follow.following_id == following_id)
-    )
-    existing_follow = result.scalar_one_or_none()
+    await timeline_service.invalidate_timeline(follower_id)
 
-    if existing_follow:
-        await db.delete(existing_follow)
-        action = "unfollowed"
-    else:
-        new_follow = Follow(follower_id=follower_id, following_id=following_id)
-        db.add(new_follow)
-        action = "followed"
-
-    await db.commit()
-    return {"action": action}
+    return {"action": "followed" if followed else "unfollowed"}
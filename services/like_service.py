@@ -1,14 +1,24 @@
-from sqlalchemy import select
+from sqlalchemy import select, update, func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 from models.like import Like
+from models.feed import Feed
+from models.comment import Comment
+from services.toggle import toggle_ctes, toggled_state
+from services.author_service import AUTHOR_ID_READS
+from services.feed_cache import feed_cache
 import logging
 
-logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
 
 
 async def toggle_like(
-    db: AsyncSession, user_email: str, feed_id: int = None, comment_id: int = None
+    db: AsyncSession,
+    user_email: str,
+    user_id: int,
+    feed_id: int = None,
+    comment_id: int = None,
 ):
     # feed_id와 comment_id 둘 다 없거나 둘 다 있을 경우 에러
     if (feed_id is None and comment_id is None) or (feed_id is not None and comment_id is not None):
@@ -16,20 +26,64 @@ async def toggle_like(
             status_code=400, detail="Either feed_id or comment_id must be provided."
         )
 
-    # 이미 좋아요가 있는지 찾기
-    query = select(Like).where(
-        (Like.user_email == user_email)
-        & (Like.feed_id == feed_id)
-        & (Like.comment_id == comment_id)
-    )
-    result = await db.execute(query)
-    existing_like = result.scalar_one_or_none()
+    target = Feed if feed_id is not None else Comment
+    target_id = feed_id if feed_id is not None else comment_id
+    target_column = "feed_id" if feed_id is not None else "comment_id"
 
-    # 좋아요가 이미 있다면 삭제, 없다면 추가
-    if existing_like:
-        await db.delete(existing_like)
+    # 좋아요 추가/삭제와 like_count 증감을 한 문장(한 번의 왕복)으로 처리
+    # 전환 기간에는 user_email / user_id 를 모두 기록하고 읽기 설정에 맞는 컬럼으로 찾는다
+    if AUTHOR_ID_READS:
+        values, extra_values = {"user_id": user_id}, {"user_email": user_email}
     else:
-        new_like = Like(user_email=user_email, feed_id=feed_id, comment_id=comment_id)
-        db.add(new_like)
+        values, extra_values = {"user_email": user_email}, {"user_id": user_id}
+    values[target_column] = target_id
+
+    ctes, inserted_count, deleted_count, delta = toggle_ctes(Like, values, extra_values)
+    counted = (
+        update(target)
+        .where(target.id == target_id)
+        # like 변경으로 update_dt(onupdate)가 바뀌지 않도록 현재 값을 그대로 지정
+        .values(like_count=target.like_count + delta, update_dt=target.update_dt)
+        .returning(target.like_count)
+        .cte("counted")
+    )
+    statement = select(
+        inserted_count.label("inserted"),
+        deleted_count.label("deleted"),
+        select(counted.c.like_count).scalar_subquery().label("like_count"),
+    ).add_cte(*ctes, counted)
+
+    try:
+        result = await db.execute(statement)
+        inserted, deleted, like_count = result.one()
+        liked = await toggled_state(db, Like, values, inserted, deleted)
+        await db.commit()
+    except IntegrityError:
+        # 존재하지 않는 피드/댓글에 대한 좋아요는 FK 제약에 걸린다
+        await db.rollback()
+        raise HTTPException(status_code=404, detail=f"{target.__name__} Not Found")
+
+    # 피드 상세 캐시는 비우지 않고 같은 문장에서 갱신된 like_count 로 바꾼다
+    if feed_id is not None:
+        await feed_cache.set_like_count(feed_id, like_count)
+
+    return liked
+
+
+async def reconcile_like_counts(db: AsyncSession):
+    # likes 테이블 기준으로 어긋난 like_count 만 일괄 재계산
+    fixed = 0
+    for target, column in ((Feed, Like.feed_id), (Comment, Like.comment_id)):
+        actual = select(func.count()).where(column == target.id).correlate(target).scalar_subquery()
+        result = await db.execute(
+            update(target)
+            .where(target.like_count != actual)
+            .values(like_count=actual, update_dt=target.update_dt)
+            .execution_options(synchronize_session=False)
+        )
+        fixed += result.rowcount
 
     await db.commit()
+    logger.info("Reconciled like_count on %d rows", fixed)
+
+    return fixed
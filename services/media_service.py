@@ -0,0 +1,654 @@
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import select, update, delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.feed import Feed
+from models.image_ref import ImageRef
+from config import settings
+from config.db import AsyncSessionLocal
+from config.s3_config import get_s3_client, get_s3_url, get_s3_key, upload_semaphore
+from services.feed_cache import feed_cache
+from botocore.exceptions import ClientError
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from PIL import Image, ImageOps
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# 요청에서 받은 파일을 워커가 처리할 때까지 보관하는 로컬 디렉터리
+# 프로세스마다 하위 디렉터리를 따로 써서 다른 프로세스가 처리 중인 파일을 지우지 않는다
+MEDIA_STAGING_DIR = getattr(
+    settings, "MEDIA_STAGING_DIR", os.path.join(tempfile.gettempdir(), "feed-media")
+)
+MEDIA_WORKER_COUNT = getattr(settings, "MEDIA_WORKER_COUNT", 2)
+MEDIA_QUEUE_SIZE = getattr(settings, "MEDIA_QUEUE_SIZE", 1000)
+COPY_CHUNK_SIZE = 1024 * 1024
+# 리사이즈/인코딩은 CPU 작업이므로 별도 프로세스에서 실행 (기본값: CPU 코어 수)
+MEDIA_PROCESS_WORKERS = getattr(settings, "MEDIA_PROCESS_WORKERS", None)
+# 이 시간(초)이 지나도 붙지 않은 pending 이미지는 실패로 보고 목록에서 뺀다 (워커 중단/재시작 대비)
+MEDIA_PENDING_TIMEOUT = getattr(settings, "MEDIA_PENDING_TIMEOUT", 3600)
+# 만료 정리 주기 - 스테이징 디렉터리의 heartbeat 도 겸하므로 MEDIA_PENDING_TIMEOUT 보다 짧아야 한다
+MEDIA_PENDING_SWEEP_SECONDS = getattr(settings, "MEDIA_PENDING_SWEEP_SECONDS", 300)
+
+# 변형 이름 -> 긴 변의 최대 크기 (None 은 원본 크기)
+IMAGE_VARIANTS = {"thumbnail": 320, "medium": 1080, "original": None}
+
+# 포맷 -> (확장자, Content-Type)
+IMAGE_FORMATS = {
+    "jpeg": ("jpg", "image/jpeg"),
+    "png": ("png", "image/png"),
+    "gif": ("gif", "image/gif"),
+    "webp": ("webp", "image/webp"),
+    "avif": ("avif", "image/avif"),
+}
+
+# 모든 크기 변형을 이 포맷들로 변환 (원본 포맷은 original 에만 남긴다)
+TRANSCODE_FORMATS = ["avif", "webp"]
+TRANSCODE_OPTIONS = {
+    "jpeg": {"quality": 85},
+    "webp": {"quality": 80, "method": 4},
+    "avif": {"quality": 60, "speed": 6},
+}
+
+Image.init()
+# 설치된 Pillow 가 인코딩할 수 있는 포맷만 사용
+TRANSCODE_FORMATS = [fmt for fmt in TRANSCODE_FORMATS if fmt.upper() in Image.SAVE]
+
+# presigned POST 로 직접 올리는 임시 업로드 (버킷 lifecycle 로 오래된 객체 정리 권장)
+DIRECT_UPLOAD_PREFIX = "uploads"
+DIRECT_UPLOAD_MAX_BYTES = getattr(settings, "DIRECT_UPLOAD_MAX_BYTES", 20 * 1024 * 1024)
+DIRECT_UPLOAD_EXPIRES = getattr(settings, "DIRECT_UPLOAD_EXPIRES", 900)
+UPLOAD_CONTENT_TYPES = {content_type for _, content_type in IMAGE_FORMATS.values()}
+
+MEDIA_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+ORIGINAL_KEY_PATTERN = re.compile(r"^(?P<media_id>[0-9a-f]{32,64})/original\.(?P<ext>\w+)$")
+
+
+class StagedMedia(NamedTuple):
+    # media_id 는 pending 표시용, digest(sha256) 는 S3 키로 사용
+    media_id: str
+    path: str
+    digest: Optional[str] = None
+    # 클라이언트가 S3 에 직접 올린 경우 워커가 내려받을 임시 업로드 키
+    source_key: Optional[str] = None
+
+
+class MediaJob(NamedTuple):
+    feed_id: int
+    media: List[StagedMedia]
+
+
+class MediaMetrics:
+    def __init__(self):
+        self.processed = 0
+        self.failed = 0
+        self.expired = 0
+        self.deduplicated = 0
+        self.delete_failed = 0
+        self.stages: Dict[str, dict] = {}
+
+    def observe(self, stage: str, started_at: float):
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        stats = self.stages.setdefault(stage, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        stats["count"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+    def snapshot(self) -> dict:
+        return {
+            "processed": self.processed,
+            "failed": self.failed,
+            "expired": self.expired,
+            "deduplicated": self.deduplicated,
+            "delete_failed": self.delete_failed,
+            "stages": {
+                stage: {
+                    "count": stats["count"],
+                    "avg_ms": stats["total_ms"] / stats["count"],
+                    "max_ms": stats["max_ms"],
+                }
+                for stage, stats in self.stages.items()
+            },
+        }
+
+
+media_metrics = MediaMetrics()
+media_queue: Optional[asyncio.Queue] = None
+_workers: List[asyncio.Task] = []
+# 이 프로세스에서 큐에 있거나 처리 중인 media_id - 만료 정리에서 제외
+_live_media: Set[str] = set()
+_staging_dir: Optional[str] = None
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def sniff_image_format(header: bytes) -> Optional[str]:
+    # 파일 이름/Content-Type 대신 실제 바이트로 포맷을 판단
+    if header.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    if header[4:12] in (b"ftypavif", b"ftypavis"):
+        return "avif"
+    return None
+
+
+def _copy_to_staging(source, path: str) -> str:
+    # 디스크에 쓰면서 sha256 을 함께 계산해 파일을 다시 읽지 않는다
+    digest = hashlib.sha256()
+    source.seek(0)
+    with open(path, "wb") as target:
+        while True:
+            chunk = source.read(COPY_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            target.write(chunk)
+    return digest.hexdigest()
+
+
+def require_media_workers():
+    # lifespan 없이 실행되어 워커가 없으면 큐에 넣을 수 없다
+    # pending 표시를 commit 하기 전에 (스테이징 단계에서) 거절해 처리되지 않을 이미지를 남기지 않는다
+    if media_queue is None:
+        raise HTTPException(status_code=503, detail="Media Workers Not Running")
+
+
+async def stage_images(images: List[UploadFile]) -> List[StagedMedia]:
+    # 요청이 끝나면 UploadFile 이 닫히므로 워커가 읽을 수 있도록 로컬에 복사해 둔다
+    require_media_workers()
+    started_at = time.perf_counter()
+    os.makedirs(_staging_dir, exist_ok=True)
+
+    staged = []
+    for image in images:
+        media_id = uuid.uuid4().hex
+        path = os.path.join(_staging_dir, media_id)
+        digest = await asyncio.to_thread(_copy_to_staging, image.file, path)
+        staged.append(StagedMedia(media_id=media_id, path=path, digest=digest))
+
+    media_metrics.observe("stage", started_at)
+    return staged
+
+
+def upload_key(feed_id: int, media_id: str) -> str:
+    return f"{DIRECT_UPLOAD_PREFIX}/{feed_id}/{media_id}"
+
+
+async def presign_upload(feed_id: int, content_type: str) -> dict:
+    # 크기와 Content-Type 은 S3 가 정책으로 검사하므로 바이트가 앱 서버를 거치지 않는다
+    media_id = uuid.uuid4().hex
+    s3_client = await get_s3_client()
+    presigned = await s3_client.generate_presigned_post(
+        Bucket=settings.S3_BUCKET,
+        Key=upload_key(feed_id, media_id),
+        Fields={"Content-Type": content_type},
+        Conditions=[
+            {"Content-Type": content_type},
+            ["content-length-range", 1, DIRECT_UPLOAD_MAX_BYTES],
+        ],
+        ExpiresIn=DIRECT_UPLOAD_EXPIRES,
+    )
+    return {"media_id": media_id, "url": presigned["url"], "fields": presigned["fields"]}
+
+
+async def head_upload(feed_id: int, media_id: str) -> Optional[int]:
+    s3_client = await get_s3_client()
+    try:
+        response = await s3_client.head_object(
+            Bucket=settings.S3_BUCKET, Key=upload_key(feed_id, media_id)
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+            return None
+        raise
+    return response["ContentLength"]
+
+
+def direct_upload(feed_id: int, media_id: str) -> StagedMedia:
+    require_media_workers()
+    return StagedMedia(
+        media_id=media_id,
+        path=os.path.join(_staging_dir, media_id),
+        source_key=upload_key(feed_id, media_id),
+    )
+
+
+async def _download_to_staging(s3_client, media: StagedMedia) -> StagedMedia:
+    # 직접 업로드된 객체를 내려받으면서 sha256 계산
+    started_at = time.perf_counter()
+    os.makedirs(os.path.dirname(media.path), exist_ok=True)
+
+    digest = hashlib.sha256()
+    response = await s3_client.get_object(Bucket=settings.S3_BUCKET, Key=media.source_key)
+    with open(media.path, "wb") as target:
+        async for chunk in response["Body"].iter_chunks(COPY_CHUNK_SIZE):
+            digest.update(chunk)
+            target.write(chunk)
+
+    media_metrics.observe("download", started_at)
+    return media._replace(digest=digest.hexdigest())
+
+
+async def enqueue_media(feed_id: int, staged: List[StagedMedia]):
+    if not staged:
+        return
+    # 스테이징 이후 종료가 시작된 경우 - pending 표시는 만료 정리에서 비워진다
+    require_media_workers()
+    # 큐에서 기다리는 동안에도 만료 정리 대상이 되지 않도록 먼저 등록
+    _live_media.update(media.media_id for media in staged)
+    # 큐가 가득 차면 요청이 기다리게 되어 자연스럽게 유입량이 제한된다
+    await media_queue.put(MediaJob(feed_id=feed_id, media=staged))
+
+
+def process_image(path: str, image_format: str) -> Dict[Tuple[str, str], bytes]:
+    # 프로세스 풀에서 실행 - EXIF 를 제거하고 크기별 변형을 최신 포맷으로 인코딩
+    # Pillow 는 필수 의존성 - 원본을 그대로 올리면 GPS 등 EXIF 메타데이터가 노출된다
+    # 반환값: (변형 이름, 포맷) -> 인코딩된 바이트
+    if image_format == "gif":
+        # 애니메이션 GIF 는 변환하지 않고 원본만 저장
+        with open(path, "rb") as f:
+            return {("original", image_format): f.read()}
+
+    variants = {}
+    with Image.open(path) as image:
+        # 회전 정보는 픽셀에 반영한 뒤 저장 시 EXIF 를 넘기지 않아 메타데이터를 제거
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA", "L"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+        for name, max_size in IMAGE_VARIANTS.items():
+            variant = image.copy()
+            if max_size is not None:
+                variant.thumbnail((max_size, max_size))
+
+            formats = list(TRANSCODE_FORMATS)
+            # 원본 크기는 기존 클라이언트를 위해 업로드된 포맷으로도 저장
+            if name == "original" and image_format not in formats:
+                formats.append(image_format)
+
+            for fmt in formats:
+                if fmt == "jpeg" and variant.mode == "RGBA":
+                    variant = variant.convert("RGB")
+                buffer = io.BytesIO()
+                variant.save(buffer, format=fmt.upper(), **TRANSCODE_OPTIONS.get(fmt, {}))
+                variants[(name, fmt)] = buffer.getvalue()
+
+    return variants
+
+
+def media_keys(image_url: str) -> List[str]:
+    # 파이프라인으로 올린 이미지는 같은 media_id 아래의 모든 변형을 함께 지운다
+    key = get_s3_key(image_url)
+    match = ORIGINAL_KEY_PATTERN.match(key)
+    if match is None:
+        return [key]
+    # 존재하지 않는 키는 DeleteObjects 에서 무시되므로 가능한 조합을 모두 지운다
+    exts = {match["ext"]} | {IMAGE_FORMATS[fmt][0] for fmt in TRANSCODE_FORMATS}
+    return [f"{match['media_id']}/{name}.{ext}" for name in IMAGE_VARIANTS for ext in exts]
+
+
+async def delete_s3_objects(keys: List[str]) -> List[str]:
+    # 지우지 못한 키를 돌려준다 - 호출한 쪽의 DB 변경은 그대로 진행 (남은 객체는 저장 공간만 차지)
+    if not keys:
+        return []
+
+    s3_client = await get_s3_client()
+    logger.debug("Deleting %d objects from %s", len(keys), settings.S3_BUCKET)
+
+    failed = []
+    # DeleteObjects 는 요청당 최대 1000개
+    for i in range(0, len(keys), 1000):
+        response = await s3_client.delete_objects(
+            Bucket=settings.S3_BUCKET,
+            Delete={"Objects": [{"Key": key} for key in keys[i : i + 1000]], "Quiet": True},
+        )
+        # Quiet 모드에서도 실패한 키는 Errors 로 돌아온다 (요청 자체는 200)
+        for error in response.get("Errors", []):
+            logger.error(
+                "Failed to delete %s from %s: %s %s",
+                error.get("Key"),
+                settings.S3_BUCKET,
+                error.get("Code"),
+                error.get("Message"),
+            )
+            failed.append(error.get("Key"))
+
+    media_metrics.delete_failed += len(failed)
+    return failed
+
+
+async def release_images(db: AsyncSession, image_urls: List[str]) -> List[str]:
+    # 참조 수를 줄이고 더 이상 참조하는 피드가 없는 이미지의 S3 키를 돌려준다
+    # 호출한 쪽은 commit 전에 S3 에서 지워야 같은 이미지의 새 업로드와 겹치지 않는다
+    releases: Dict[str, int] = {}
+    urls: Dict[str, str] = {}
+    keys = []
+    for image_url in image_urls:
+        match = ORIGINAL_KEY_PATTERN.match(get_s3_key(image_url))
+        if match is None:
+            keys.append(get_s3_key(image_url))
+            continue
+        releases[match["media_id"]] = releases.get(match["media_id"], 0) + 1
+        urls[match["media_id"]] = image_url
+
+    for media_id, count in releases.items():
+        result = await db.execute(
+            update(ImageRef)
+            .where(ImageRef.media_id == media_id)
+            .values(ref_count=ImageRef.ref_count - count)
+            .returning(ImageRef.ref_count)
+        )
+        ref_count = result.scalar_one_or_none()
+        if ref_count is not None and ref_count > 0:
+            continue
+        # 참조 테이블에 없는 이미지(해시 키 도입 전 업로드)는 바로 삭제
+        if ref_count is not None:
+            await db.execute(delete(ImageRef).where(ImageRef.media_id == media_id))
+        keys.extend(media_keys(urls[media_id]))
+
+    return keys
+
+
+async def _reserve_image(digest: str):
+    # 처리 전에 참조를 먼저 잡아 두어 동시에 진행되는 삭제가 객체를 지우지 못하게 한다
+    stmt = insert(ImageRef).values(media_id=digest, ref_count=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ImageRef.media_id],
+        set_={"ref_count": ImageRef.ref_count + 1},
+    ).returning(ImageRef.image_url, ImageRef.image_variants)
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(stmt)
+        image_url, image_variants = result.one()
+        await db.commit()
+    return image_url, image_variants
+
+
+async def _release_reservation(image_url: str):
+    async with AsyncSessionLocal() as db:
+        await delete_s3_objects(await release_images(db, [image_url]))
+        await db.commit()
+
+
+async def _store_media(s3_client, media: StagedMedia) -> Optional[Tuple[str, dict]]:
+    started_at = time.perf_counter()
+    with open(media.path, "rb") as f:
+        header = f.read(16)
+    image_format = sniff_image_format(header)
+    media_metrics.observe("sniff", started_at)
+
+    if image_format is None:
+        logger.warning("Dropping media %s: not a supported image", media.media_id)
+        media_metrics.failed += 1
+        return None
+
+    image_url = get_s3_url(f"{media.digest}/original.{IMAGE_FORMATS[image_format][0]}")
+
+    # 같은 내용이 이미 올라가 있으면 변환/업로드 없이 기존 URL 을 재사용
+    existing_url, existing_variants = await _reserve_image(media.digest)
+    if existing_url is not None:
+        media_metrics.deduplicated += 1
+        return existing_url, existing_variants or {}
+
+    try:
+        variant_map = await _upload_media(s3_client, media, image_format)
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(ImageRef)
+                .where(ImageRef.media_id == media.digest)
+                .values(image_url=image_url, image_variants=variant_map)
+            )
+            await db.commit()
+    except Exception:
+        await _release_reservation(image_url)
+        raise
+
+    return image_url, variant_map
+
+
+async def _upload_media(s3_client, media: StagedMedia, image_format: str) -> dict:
+    started_at = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    encoded = await loop.run_in_executor(_process_pool, process_image, media.path, image_format)
+    media_metrics.observe("process", started_at)
+
+    variant_map: Dict[str, Dict[str, str]] = {}
+
+    async def upload(name: str, fmt: str, body: bytes):
+        ext, content_type = IMAGE_FORMATS[fmt]
+        key = f"{media.digest}/{name}.{ext}"
+        async with upload_semaphore:
+            await s3_client.put_object(
+                Bucket=settings.S3_BUCKET,
+                Key=key,
+                Body=body,
+                ContentType=content_type,
+                CacheControl="public, max-age=31536000, immutable",
+            )
+        variant_map.setdefault(name, {})[fmt] = get_s3_url(key)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*[upload(name, fmt, body) for (name, fmt), body in encoded.items()])
+    media_metrics.observe("upload", started_at)
+
+    media_metrics.processed += 1
+    return variant_map
+
+
+async def process_job(job: MediaJob):
+    s3_client = await get_s3_client()
+
+    image_urls = []
+    image_variants = {}
+    try:
+        for media in job.media:
+            # 한 장이 실패해도 나머지는 붙이고 pending 목록에서는 모두 제거
+            try:
+                if media.source_key is not None:
+                    media = await _download_to_staging(s3_client, media)
+                uploaded = await _store_media(s3_client, media)
+            except Exception:
+                logger.exception("Media %s for feed %s failed", media.media_id, job.feed_id)
+                media_metrics.failed += 1
+                continue
+            if uploaded is not None:
+                image_url, variant_map = uploaded
+                image_urls.append(image_url)
+                image_variants[image_url] = variant_map
+    finally:
+        for media in job.media:
+            if os.path.exists(media.path):
+                os.remove(media.path)
+        await delete_s3_objects([media.source_key for media in job.media if media.source_key])
+
+    started_at = time.perf_counter()
+    media_ids = {media.media_id for media in job.media}
+    async with AsyncSessionLocal() as db:
+        # update_feed 와 동시에 image_urls 를 바꾸지 않도록 행 잠금
+        result = await db.execute(select(Feed).where(Feed.id == job.feed_id).with_for_update())
+        feed = result.scalar_one_or_none()
+
+        if feed is None:
+            # 처리 중에 피드가 삭제된 경우 잡아 둔 참조를 반납
+            await delete_s3_objects(await release_images(db, image_urls))
+            await db.commit()
+            return
+
+        pending_media_ids = [
+            media_id for media_id in feed.pending_media_ids or [] if media_id not in media_ids
+        ]
+        # 백그라운드 처리로 update_dt 가 바뀌지 않도록 기존 값을 그대로 지정
+        await db.execute(
+            update(Feed)
+            .where(Feed.id == job.feed_id)
+            .values(
+                image_urls=(feed.image_urls or []) + image_urls,
+                image_variants={**(feed.image_variants or {}), **image_variants},
+                pending_media_ids=pending_media_ids,
+                pending_media_since=Feed.pending_media_since if pending_media_ids else None,
+                update_dt=Feed.update_dt,
+            )
+        )
+        await db.commit()
+    await feed_cache.invalidate(job.feed_id)
+    media_metrics.observe("attach", started_at)
+
+
+async def _worker():
+    while True:
+        job = await media_queue.get()
+        try:
+            await process_job(job)
+        except Exception:
+            logger.exception("Media job for feed %s failed", job.feed_id)
+            media_metrics.failed += len(job.media)
+        finally:
+            _live_media.difference_update(media.media_id for media in job.media)
+            media_queue.task_done()
+
+
+def _sweep_staging(cutoff_ts: float, live: Set[str]):
+    # 이 프로세스의 디렉터리에서는 큐/처리 중이 아닌 오래된 파일만 지운다
+    if _staging_dir is not None and os.path.isdir(_staging_dir):
+        # 디렉터리 mtime 을 heartbeat 로 갱신 - 다른 프로세스는 살아 있는 디렉터리로 본다
+        os.utime(_staging_dir)
+        for entry in os.scandir(_staging_dir):
+            try:
+                if entry.name not in live and entry.stat().st_mtime < cutoff_ts:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    # heartbeat 가 끊긴 다른 프로세스의 디렉터리 (또는 이전 버전이 최상위에 남긴 파일)
+    if not os.path.isdir(MEDIA_STAGING_DIR):
+        return
+    for entry in os.scandir(MEDIA_STAGING_DIR):
+        if entry.path == _staging_dir:
+            continue
+        try:
+            if entry.stat().st_mtime >= cutoff_ts:
+                continue
+            if entry.is_dir():
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+
+async def expire_pending_media(timeout: float = MEDIA_PENDING_TIMEOUT) -> List[int]:
+    # 프로세스가 죽거나 attach 가 실패해 남은 pending 목록을 비운다 (이미지는 붙지 않은 것으로 처리)
+    # 이 프로세스에서 아직 큐에 있거나 처리 중인 이미지는 오래 걸려도 남겨 둔다
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=timeout)
+    live = set(_live_media)
+    feed_ids = []
+    async with AsyncSessionLocal() as db:
+        # attach 중인 (행 잠금을 잡은) 피드는 건너뛰고 다음 주기에 다시 본다
+        result = await db.execute(
+            select(Feed.id, Feed.pending_media_ids)
+            .where(Feed.pending_media_since < cutoff)
+            .with_for_update(skip_locked=True)
+        )
+        for feed_id, pending_media_ids in result.all():
+            pending_media_ids = pending_media_ids or []
+            remaining = [media_id for media_id in pending_media_ids if media_id in live]
+            if remaining and len(remaining) == len(pending_media_ids):
+                continue
+            await db.execute(
+                update(Feed)
+                .where(Feed.id == feed_id)
+                .values(
+                    pending_media_ids=remaining,
+                    pending_media_since=Feed.pending_media_since if remaining else None,
+                    update_dt=Feed.update_dt,
+                )
+            )
+            feed_ids.append(feed_id)
+        await db.commit()
+
+    for feed_id in feed_ids:
+        await feed_cache.invalidate(feed_id)
+    if feed_ids:
+        logger.warning("Expired pending media on %d feeds", len(feed_ids))
+        media_metrics.expired += len(feed_ids)
+
+    # 같은 이유로 남은 스테이징 파일도 정리
+    await asyncio.to_thread(_sweep_staging, cutoff.timestamp(), live)
+
+    return feed_ids
+
+
+async def _sweeper():
+    # 준비 직후 한 번 (재시작 전에 남은 목록) 그리고 주기적으로 실행
+    while True:
+        try:
+            await expire_pending_media()
+        except Exception:
+            logger.exception("Expiring pending media failed")
+        await asyncio.sleep(MEDIA_PENDING_SWEEP_SECONDS)
+
+
+def start_media_workers():
+    global media_queue, _process_pool, _staging_dir
+    _staging_dir = os.path.join(MEDIA_STAGING_DIR, uuid.uuid4().hex)
+    os.makedirs(_staging_dir, exist_ok=True)
+    media_queue = asyncio.Queue(maxsize=MEDIA_QUEUE_SIZE)
+    _process_pool = ProcessPoolExecutor(max_workers=MEDIA_PROCESS_WORKERS)
+    for _ in range(MEDIA_WORKER_COUNT):
+        _workers.append(asyncio.create_task(_worker()))
+
+
+def start_media_sweeper():
+    # 마이그레이션이 끝난 뒤 (준비 완료 후) 시작 - 그 전에는 pending_media_since 컬럼이 없을 수 있다
+    _workers.append(asyncio.create_task(_sweeper()))
+
+
+async def stop_media_workers(timeout: float = 30):
+    global media_queue
+    # 종료 전에 남은 작업을 최대 timeout 초 동안 처리
+    if media_queue is not None:
+        try:
+            await asyncio.wait_for(media_queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Stopping with %d media jobs still queued", media_queue.qsize())
+
+    for worker in _workers:
+        worker.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+    # 종료 후 들어온 이미지 요청은 require_media_workers 에서 거절
+    media_queue = None
+    _live_media.clear()
+    # 처리하지 못한 파일이 남아 있으면 디렉터리는 다른 프로세스의 정리에 맡긴다
+    if _staging_dir is not None:
+        try:
+            os.rmdir(_staging_dir)
+        except OSError:
+            pass
+
+
+def get_media_metrics() -> dict:
+    return {
+        "queue_depth": media_queue.qsize() if media_queue is not None else 0,
+        "workers": MEDIA_WORKER_COUNT if _workers else 0,
+        "transcode_formats": TRANSCODE_FORMATS,
+        **media_metrics.snapshot(),
+    }
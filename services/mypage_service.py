@@ -1,13 +1,16 @@
-from sqlalchemy import select, desc, asc, func
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 from models.user import User
-from models.feed import Feed, FeedResponse
-from models.comment import Comment, CommentResponse
+from models.feed import Feed, FEED_RESPONSE_COLUMNS, feed_to_response
+from models.comment import Comment, COMMENT_RESPONSE_COLUMNS, comment_to_response
 from models.follow import Follow
-import logging
-
-logging.basicConfig(level=logging.DEBUG)
+from services.feed_service import FEED_SORT_KEYS
+from services.comment_service import COMMENT_SORT_KEYS
+from services.pagination import paginate, split_page
+from services.author_service import feed_author_join, comment_author_join
+from services import counter_service
+from typing import Optional
 
 
 async def get_user_profile(db: AsyncSession, user_email: str):
@@ -31,52 +34,32 @@ async def get_user_feeds(
     skip: int = 0,
     limit: int = 10,
     sort_by: str = "create_dt_desc",
+    cursor: Optional[str] = None,
+    count_mode: str = "exact",
 ):
     # 사용자 이메일에 해당하는 피드 조회 쿼리
-    query = select(Feed, User.nickname).join(User, User.email == Feed.author_email)
+    query = select(*FEED_RESPONSE_COLUMNS, User.nickname).join(User, feed_author_join())
 
     condition = User.email == email
     query = query.where(condition)
 
-    if sort_by == "create_dt_desc":
-        query = query.order_by(desc(Feed.create_dt))
-    elif sort_by == "create_dt_asc":
-        query = query.order_by(asc(Feed.create_dt))
-    elif sort_by == "update_dt_desc":
-        query = query.order_by(desc(Feed.update_dt))
-    elif sort_by == "update_dt_asc":
-        query = query.order_by(asc(Feed.update_dt))
-
-    total_count_result = await db.execute(select(func.count()).select_from(Feed).where(condition))
-    total_count = total_count_result.scalar_one_or_none()
-    if total_count is None:
-        total_count = 0
+    key_columns, descending = FEED_SORT_KEYS.get(sort_by, FEED_SORT_KEYS["create_dt_desc"])
 
-    total_count = int(total_count)
+    total_count = await counter_service.resolve_count(
+        db,
+        count_mode,
+        select(func.count()).select_from(Feed).where(Feed.author_email == email),
+        counter_service.cached_count_query(counter_service.USER_FEEDS, email),
+    )
 
-    query = query.offset(skip).limit(limit)
+    query = paginate(query, key_columns, descending, skip, limit, cursor)
 
     feeds_result = await db.execute(query)
-    feeds = feeds_result.all()
-    if feeds is None:
-        feeds = []
+    feeds, next_cursor = split_page(feeds_result.all(), key_columns, limit)
 
-    feed_responses = []
+    feed_responses = [feed_to_response(feed, feed.nickname) for feed in feeds]
 
-    for feed, nickname in feeds:
-        feed_dict = FeedResponse(
-            id=feed.id,
-            title=feed.title,
-            content=feed.content,
-            author_email=feed.author_email,
-            author_nickname=nickname,
-            image_urls=feed.image_urls,
-            create_dt=feed.create_dt,
-            update_dt=feed.update_dt,
-        )
-        feed_responses.append(feed_dict.model_dump())
-
-    return total_count, feed_responses
+    return total_count, feed_responses, next_cursor
 
 
 async def get_user_comments(
@@ -85,55 +68,45 @@ async def get_user_comments(
     skip: int = 0,
     limit: int = 10,
     sort_by: str = "create_dt_desc",
+    cursor: Optional[str] = None,
+    count_mode: str = "exact",
 ):
     # 사용자 이메일에 해당하는 댓글 조회 쿼리
-    query = select(Comment, User.nickname).join(User, User.email == Comment.author_email)
+    query = select(*COMMENT_RESPONSE_COLUMNS, User.nickname).join(User, comment_author_join())
     condition = User.email == user_email
     query = query.where(condition)
 
-    if sort_by == "create_dt_desc":
-        query = query.order_by(desc(Comment.create_dt))
-    elif sort_by == "create_dt_asc":
-        query = query.order_by(asc(Comment.create_dt))
-    elif sort_by == "update_dt_desc":
-        query = query.order_by(desc(Comment.update_dt))
-    elif sort_by == "update_dt_asc":
-        query = query.order_by(asc(Comment.update_dt))
-
-    total_count_result = await db.execute(
-        select(func.count()).select_from(Comment).where(condition)
-    )
-    total_count = total_count_result.scalar_one_or_none()
-    if total_count is None:
-        total_count = 0
+    key_columns, descending = COMMENT_SORT_KEYS.get(sort_by, COMMENT_SORT_KEYS["create_dt_desc"])
 
-    total_count = int(total_count)
+    total_count = await counter_service.resolve_count(
+        db,
+        count_mode,
+        select(func.count()).select_from(Comment).where(Comment.author_email == user_email),
+        counter_service.cached_count_query(counter_service.USER_COMMENTS, user_email),
+    )
 
-    query = query.offset(skip).limit(limit)
+    query = paginate(query, key_columns, descending, skip, limit, cursor)
 
     comments_result = await db.execute(query)
-    comments = comments_result.all()
-    if comments is None:
-        comments = []
+    comments, next_cursor = split_page(comments_result.all(), key_columns, limit)
 
-    comment_responses = []
+    comment_responses = [comment_to_response(comment, comment.nickname) for comment in comments]
 
-    for comment, nickname in comments:
-        comment_dict = CommentResponse(
-            id=comment.id,
-            content=comment.content,
-            author_email=comment.author_email,
-            author_nickname=nickname,
-            feed_id=comment.feed_id,
-            create_dt=comment.create_dt,
-            update_dt=comment.update_dt,
-        )
-        comment_responses.append(comment_dict.model_dump())
-
-    return {"total_count": total_count, "comments": comment_responses}
+    return {
+        "total_count": total_count,
+        "comments": comment_responses,
+        "next_cursor": next_cursor,
+    }
 
 
-async def get_user_followers(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 10):
+async def get_user_followers(
+    db: AsyncSession,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    count_mode: str = "exact",
+):
     # 전체 팔로워 수를 구하는 쿼리
     count_query = (
         select(func.count())
@@ -141,21 +114,22 @@ async def get_user_followers(db: AsyncSession, user_id: int, skip: int = 0, limi
         .join(Follow, Follow.follower_id == User.id)
         .where(Follow.following_id == user_id)
     )
-    total_count_result = await db.execute(count_query)
-    total_count = total_count_result.scalar_one_or_none()
-    if total_count is None:
-        total_count = 0
+    total_count = await counter_service.resolve_count(
+        db,
+        count_mode,
+        count_query,
+        counter_service.cached_count_query(counter_service.FOLLOWERS, user_id),
+    )
 
     # 사용자를 팔로우하는 사람들의 목록 가져오기
     query = (
-        select(User)
+        select(User.id, User.email, User.nickname)
         .join(Follow, Follow.follower_id == User.id)
         .where(Follow.following_id == user_id)
-        .offset(skip)
-        .limit(limit)
     )
+    query = paginate(query, (User.id,), False, skip, limit, cursor)
     result = await db.execute(query)
-    followers = result.scalars().all()
+    followers, next_cursor = split_page(result.all(), (User.id,), limit)
 
     def extract_profile(user):
         return {
@@ -163,10 +137,21 @@ async def get_user_followers(db: AsyncSession, user_id: int, skip: int = 0, limi
             "nickname": user.nickname,
         }
 
-    return {"total_count": total_count, "followers": [extract_profile(user) for user in followers]}
+    return {
+        "total_count": total_count,
+        "followers": [extract_profile(user) for user in followers],
+        "next_cursor": next_cursor,
+    }
 
 
-async def get_user_followings(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 10):
+async def get_user_followings(
+    db: AsyncSession,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    count_mode: str = "exact",
+):
     # 전체 팔로잉 수를 구하는 쿼리
     count_query = (
         select(func.count())
@@ -174,21 +159,22 @@ async def get_user_followings(db: AsyncSession, user_id: int, skip: int = 0, lim
         .join(Follow, Follow.following_id == User.id)
         .where(Follow.follower_id == user_id)
     )
-    total_count_result = await db.execute(count_query)
-    total_count = total_count_result.scalar_one_or_none()
-    if total_count is None:
-        total_count = 0
+    total_count = await counter_service.resolve_count(
+        db,
+        count_mode,
+        count_query,
+        counter_service.cached_count_query(counter_service.FOLLOWINGS, user_id),
+    )
 
     # 사용자가 팔로우하는 사람들의 목록 가져오기
     query = (
-        select(User)
+        select(User.id, User.email, User.nickname)
         .join(Follow, Follow.following_id == User.id)
         .where(Follow.follower_id == user_id)
-        .offset(skip)
-        .limit(limit)
     )
+    query = paginate(query, (User.id,), False, skip, limit, cursor)
     result = await db.execute(query)
-    followings = result.scalars().all()
+    followings, next_cursor = split_page(result.all(), (User.id,), limit)
 
     def extract_profile(user):
         return {
@@ -199,4 +185,78 @@ async def get_user_followings(db: AsyncSession, user_id: int, skip: int = 0, lim
     return {
         "total_count": total_count,
         "followings": [extract_profile(user) for user in followings],
+        "next_cursor": next_cursor,
     }
+
+
+def follow_list_version(total_count: Optional[int], users, next_cursor: Optional[str]) -> tuple:
+    # 목록 응답 dict 와 검증용 조회 Row 가 같은 값을 만들도록 email 로 식별
+    return total_count, next_cursor, [user["email"] for user in users]
+
+
+async def _get_follow_version(
+    db: AsyncSession,
+    member_column,
+    owner_column,
+    scope: str,
+    user_id: int,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    count_mode: str,
+):
+    # 팔로워/팔로잉 목록과 같은 페이지의 사용자 email 과 다음 커서만 읽는다 (ETag 검증용)
+    total_count = await counter_service.resolve_count(
+        db,
+        counter_service.validator_count_mode(count_mode),
+        select(func.count()).select_from(Follow).where(owner_column == user_id),
+        counter_service.cached_count_query(scope, user_id),
+    )
+    query = select(User.id, User.email)
+    query = query.join(Follow, member_column == User.id).where(owner_column == user_id)
+    result = await db.execute(paginate(query, (User.id,), False, skip, limit, cursor))
+    users, next_cursor = split_page(result.all(), (User.id,), limit)
+
+    return follow_list_version(total_count, [user._mapping for user in users], next_cursor)
+
+
+async def get_user_followers_version(
+    db: AsyncSession,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    count_mode: str = "exact",
+):
+    return await _get_follow_version(
+        db,
+        Follow.follower_id,
+        Follow.following_id,
+        counter_service.FOLLOWERS,
+        user_id,
+        skip,
+        limit,
+        cursor,
+        count_mode,
+    )
+
+
+async def get_user_followings_version(
+    db: AsyncSession,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    count_mode: str = "exact",
+):
+    return await _get_follow_version(
+        db,
+        Follow.following_id,
+        Follow.follower_id,
+        counter_service.FOLLOWINGS,
+        user_id,
+        skip,
+        limit,
+        cursor,
+        count_mode,
+    )
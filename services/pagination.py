@@ -0,0 +1,107 @@
+from fastapi import HTTPException
+from sqlalchemy import DateTime, Integer, asc, desc, tuple_
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+import base64
+import binascii
+import json
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str, key_columns: Sequence) -> List[Any]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid Cursor")
+
+    if not isinstance(payload, list) or len(payload) != len(key_columns):
+        raise HTTPException(status_code=400, detail="Invalid Cursor")
+
+    values = []
+    for column, value in zip(key_columns, payload):
+        if isinstance(column.type, DateTime) and value is not None:
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid Cursor")
+        elif isinstance(column.type, Integer):
+            # 정수 키(id)에 다른 타입이 들어오면 DB 비교에서 500 이 되므로 여기서 거절
+            # (bool 은 int 의 하위 타입이라 따로 제외)
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise HTTPException(status_code=400, detail="Invalid Cursor")
+        values.append(value)
+
+    return values
+
+
+def paginate(
+    query,
+    key_columns: Sequence,
+    descending: bool,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+):
+    # 정렬 키 마지막에는 항상 고유한 id를 두어 순서를 결정적으로 만든다
+    order = desc if descending else asc
+    query = query.order_by(*[order(column) for column in key_columns])
+
+    if cursor:
+        # (create_dt, id) < (:create_dt, :id) 형태의 keyset 조건 - skip 은 무시된다
+        values = decode_cursor(cursor, key_columns)
+        if len(key_columns) == 1:
+            key, bound = key_columns[0], values[0]
+        else:
+            key, bound = tuple_(*key_columns), tuple_(*values)
+        query = query.where(key < bound if descending else key > bound)
+    else:
+        query = query.offset(skip)
+
+    # 한 행을 더 읽어 다음 페이지가 있는지 판단 (split_page 로 잘라낸다)
+    return query.limit(limit + 1)
+
+
+def split_page(items: Sequence, key_columns: Sequence, limit: int) -> Tuple[list, Optional[str]]:
+    # paginate 결과를 limit 개로 자르고, 남는 행이 있을 때만 다음 커서를 만든다
+    page = list(items[:limit])
+    if len(items) <= limit or not page:
+        return page, None
+
+    last = page[-1]
+    return page, encode_cursor([getattr(last, column.key) for column in key_columns])
+
+
+def with_key_columns(columns: Sequence, key_columns: Sequence) -> tuple:
+    # 검증용 조회도 본문 조회와 같은 다음 커서를 만들 수 있도록 정렬 키 컬럼을 함께 읽는다
+    keys = {column.key for column in columns}
+    return (*columns, *(column for column in key_columns if column.key not in keys))
+
+
+def build_pagination(
+    skip: int,
+    limit: int,
+    total_count: Optional[int],
+    next_cursor: Optional[str] = None,
+    cursor: Optional[str] = None,
+) -> dict:
+    # cursor 요청은 offset 을 모르므로 현재 페이지 번호가 없다
+    current_page = None if cursor else (skip // limit) + 1
+
+    if total_count is None:
+        total_pages = None
+    else:
+        total_pages = -(-total_count // limit)  # Ceiling division in Python
+    # 다음 페이지 유무는 한 행 더 읽은 결과로 판단 (count_mode, cursor 와 무관하게 정확)
+    is_last_page = next_cursor is None
+
+    return {
+        "current_page": current_page,
+        "total_pages": total_pages,
+        "is_last_page": is_last_page,
+        "total_count": total_count,
+        "next_cursor": next_cursor,
+    }
@@ -0,0 +1,178 @@
+from sqlalchemy import select, cast, String
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.feed import Feed, FEED_RESPONSE_COLUMNS, feed_to_response
+from models.user import User
+from models.follow import Follow
+from models.counter import Counter
+from services import counter_service
+from services.pagination import decode_cursor, encode_cursor
+from services.author_service import feed_author_join
+from config import settings
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import time
+
+# 사용자별로 보관하는 타임라인 길이 (feed id 개수)
+TIMELINE_MAX_LENGTH = 800
+# 메모리에 유지하는 타임라인 수 (LRU)
+TIMELINE_MAX_USERS = 10000
+# 워커 간 fan-out/팔로우 변경이 공유되지 않으므로 일정 시간이 지나면 다시 구성
+# (본인 피드는 읽을 때 합치므로 이 지연은 다른 워커에서 팔로우한 사용자의 새 피드에만 해당)
+TIMELINE_TTL_SECONDS = getattr(settings, "TIMELINE_TTL_SECONDS", 60)
+# 팔로워가 이보다 많은 작성자는 fan-out-on-write 대신 읽을 때 가져온다
+FANOUT_FOLLOWER_LIMIT = 5000
+
+
+class InMemoryTimelineStore:
+    # 프로세스 내부 타임라인 저장소 - 같은 인터페이스로 Redis 등 공유 저장소로 교체 가능
+    def __init__(
+        self,
+        max_length: int = TIMELINE_MAX_LENGTH,
+        max_users: int = TIMELINE_MAX_USERS,
+        ttl: float = TIMELINE_TTL_SECONDS,
+    ):
+        self.max_length = max_length
+        self.max_users = max_users
+        self.ttl = ttl
+        self._timelines: "OrderedDict[int, tuple]" = OrderedDict()
+
+    def _get(self, user_id: int) -> Optional[List[int]]:
+        entry = self._timelines.get(user_id)
+        if entry is None:
+            return None
+
+        built_at, feed_ids = entry
+        if time.monotonic() - built_at > self.ttl:
+            del self._timelines[user_id]
+            return None
+
+        self._timelines.move_to_end(user_id)
+        return feed_ids
+
+    async def exists(self, user_id: int) -> bool:
+        return self._get(user_id) is not None
+
+    async def replace(self, user_id: int, feed_ids: List[int]):
+        self._timelines[user_id] = (
+            time.monotonic(),
+            sorted(feed_ids, reverse=True)[: self.max_length],
+        )
+        self._timelines.move_to_end(user_id)
+        while len(self._timelines) > self.max_users:
+            self._timelines.popitem(last=False)
+
+    async def push(self, user_ids: List[int], feed_id: int):
+        # 이미 구성된 타임라인에만 추가 - 없는 타임라인은 읽을 때 새로 만든다
+        for user_id in user_ids:
+            feed_ids = self._get(user_id)
+            if feed_ids is None:
+                continue
+            feed_ids.insert(0, feed_id)
+            del feed_ids[self.max_length :]
+
+    async def discard(self, user_id: int):
+        self._timelines.pop(user_id, None)
+
+    async def range(self, user_id: int, before_id: Optional[int], limit: int) -> List[int]:
+        feed_ids = self._get(user_id) or []
+        if before_id is not None:
+            feed_ids = [feed_id for feed_id in feed_ids if feed_id < before_id]
+        return feed_ids[:limit]
+
+
+timeline_store = InMemoryTimelineStore()
+
+
+def set_timeline_store(store):
+    global timeline_store
+    timeline_store = store
+
+
+def _follower_count(following_id_column):
+    return (
+        select(Counter.value)
+        .where(
+            Counter.scope == counter_service.FOLLOWERS,
+            Counter.key == cast(following_id_column, String),
+        )
+        .scalar_subquery()
+    )
+
+
+async def fan_out_feed(db: AsyncSession, author: User, feed_id: int):
+    # 일반 작성자의 새 피드를 팔로워(와 본인)의 타임라인에 미리 넣어 둔다
+    result = await db.execute(
+        counter_service.cached_count_query(counter_service.FOLLOWERS, author.id)
+    )
+    if result.scalar_one() > FANOUT_FOLLOWER_LIMIT:
+        await timeline_store.push([author.id], feed_id)
+        return
+
+    result = await db.execute(select(Follow.follower_id).where(Follow.following_id == author.id))
+    await timeline_store.push([author.id, *result.scalars().all()], feed_id)
+
+
+async def invalidate_timeline(user_id: int):
+    # 팔로우 관계가 바뀌면 다음 조회 때 다시 구성
+    await timeline_store.discard(user_id)
+
+
+async def _rebuild_timeline(db: AsyncSession, user_id: int):
+    followings = select(Follow.following_id).where(Follow.follower_id == user_id)
+    result = await db.execute(
+        select(Feed.id)
+        .join(User, feed_author_join())
+        .where((User.id == user_id) | User.id.in_(followings))
+        .order_by(Feed.id.desc())
+        .limit(TIMELINE_MAX_LENGTH)
+    )
+    await timeline_store.replace(user_id, result.scalars().all())
+
+
+async def get_home_timeline(
+    db: AsyncSession, user: User, limit: int = 10, cursor: Optional[str] = None
+):
+    before_id = decode_cursor(cursor, (Feed.id,))[0] if cursor else None
+
+    if not await timeline_store.exists(user.id):
+        await _rebuild_timeline(db, user.id)
+
+    # 한 개를 더 읽어 다음 페이지가 있는지 판단
+    feed_ids = await timeline_store.range(user.id, before_id, limit + 1)
+
+    # 팔로워가 많은 작성자의 피드는 fan-out 되지 않으므로 읽을 때 합친다
+    # 본인 피드도 함께 읽는다 - 다른 워커에서 작성한 피드는 이 워커의 타임라인에 push 되지 않는다
+    celebrities = select(Follow.following_id).where(
+        Follow.follower_id == user.id,
+        _follower_count(Follow.following_id) > FANOUT_FOLLOWER_LIMIT,
+    )
+    merged_query = (
+        select(Feed.id)
+        .join(User, feed_author_join())
+        .where((User.id == user.id) | User.id.in_(celebrities))
+        .order_by(Feed.id.desc())
+        .limit(limit + 1)
+    )
+    if before_id is not None:
+        merged_query = merged_query.where(Feed.id < before_id)
+    result = await db.execute(merged_query)
+
+    feed_ids = sorted(set(feed_ids) | set(result.scalars().all()), reverse=True)
+    has_next = len(feed_ids) > limit
+    feed_ids = feed_ids[:limit]
+
+    feeds: Dict[int, dict] = {}
+    if feed_ids:
+        result = await db.execute(
+            select(*FEED_RESPONSE_COLUMNS, User.nickname)
+            .join(User, feed_author_join())
+            .where(Feed.id.in_(feed_ids))
+        )
+        for feed in result.all():
+            feeds[feed.id] = feed_to_response(feed, feed.nickname)
+
+    # 삭제된 피드는 저장소에 남아 있어도 여기서 걸러진다
+    feed_responses = [feeds[feed_id] for feed_id in feed_ids if feed_id in feeds]
+    next_cursor = encode_cursor([feed_ids[-1]]) if has_next and feed_ids else None
+
+    return feed_responses, next_cursor
@@ -0,0 +1,46 @@
+from sqlalchemy import delete, exists, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+
+def toggle_ctes(model, values: dict, extra_values: Optional[dict] = None):
+    # 한 문장 안에서 "있으면 삭제, 없으면 추가" 를 수행하는 CTE 들
+    # 동시 요청으로 같은 행이 먼저 추가된 경우 unique 제약에 걸려 아무 것도 하지 않는다
+    # extra_values 는 행을 찾을 때는 쓰지 않고 추가할 때만 기록하는 값
+    insert_values = {**values, **(extra_values or {})}
+    deleted = (
+        delete(model)
+        .where(*[getattr(model, column) == value for column, value in values.items()])
+        .returning(literal(1).label("row"))
+        .cte("deleted")
+    )
+    inserted = (
+        insert(model)
+        .from_select(
+            list(insert_values),
+            select(*[literal(value) for value in insert_values.values()]).where(
+                ~exists(select(deleted.c.row))
+            ),
+        )
+        .on_conflict_do_nothing()
+        .returning(literal(1).label("row"))
+        .cte("inserted")
+    )
+
+    inserted_count = select(func.count()).select_from(inserted).scalar_subquery()
+    deleted_count = select(func.count()).select_from(deleted).scalar_subquery()
+
+    return [deleted, inserted], inserted_count, deleted_count, inserted_count - deleted_count
+
+
+async def toggled_state(db: AsyncSession, model, values: dict, inserted: int, deleted: int) -> bool:
+    # 토글 후 행이 있는지 (좋아요/팔로우 상태) 를 돌려준다
+    if inserted or deleted:
+        return bool(inserted)
+
+    # 둘 다 0 이면 동시 요청이 먼저 같은 행을 추가해 ON CONFLICT DO NOTHING 이 된 경우
+    # 같은 문장 안에서는 그 행이 보이지 않으므로 새 문장으로 커밋된 상태를 확인
+    where = [getattr(model, column) == value for column, value in values.items()]
+    result = await db.execute(select(exists().where(*where)))
+    return bool(result.scalar_one())
@@ -0,0 +1,160 @@
+import os
+import sys
+import types
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 테스트용 Postgres (예: postgresql+asyncpg://postgres@localhost:5432/test) - 없으면 DB 테스트는 건너뛴다
+# 테스트마다 public 스키마를 지우고 다시 만들므로 운영 DB 를 지정하지 말 것
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+# S3 테스트가 띄우는 moto 서버 포트
+TEST_S3_PORT = int(os.environ.get("TEST_S3_PORT", "5055"))
+
+# 실제 settings 대신 테스트 설정을 사용 (S3/Redis 가 운영 환경을 가리키지 않도록)
+settings = types.ModuleType("config.settings")
+settings.S3_ACCESS_KEY = "testing"
+settings.S3_SECRET_KEY = "testing"
+settings.S3_BUCKET = "test-bucket"
+settings.S3_ENDPOINT_URL = f"http://127.0.0.1:{TEST_S3_PORT}"
+settings.BCRYPT_ROUNDS = 4
+sys.modules["config.settings"] = settings
+
+import config  # noqa: E402
+
+config.settings = settings
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+import config.db  # noqa: E402
+
+# 테스트마다 이벤트 루프가 바뀌므로 커넥션을 풀에 남기지 않는다
+if TEST_DATABASE_URL:
+    config.db.engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+    config.db.AsyncSessionLocal.configure(bind=config.db.engine)
+
+# 실행된 SQL 문 - statements fixture 로 요청 하나의 쿼리 수를 센다
+STATEMENTS = []
+
+
+@event.listens_for(config.db.engine.sync_engine, "before_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    STATEMENTS.append(statement)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    return config.db.engine
+
+
+@pytest.fixture
+async def schema(engine):
+    # 빈 스키마에 마이그레이션을 적용 - 운영과 같은 인덱스/제약으로 테스트
+    from migrations import run_migrations
+
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("DROP SCHEMA public CASCADE")
+        await conn.exec_driver_sql("CREATE SCHEMA public")
+    async with engine.begin() as conn:
+        await conn.run_sync(run_migrations)
+
+    # 프로세스 내부 캐시는 테스트 사이에 공유되지 않도록 비운다
+    from services.auth_service import token_cache
+    from services.feed_cache import InMemoryFeedCacheBackend, feed_cache, set_feed_cache_backend
+    from services.feed_list_cache import feed_list_cache
+    from services.timeline_service import InMemoryTimelineStore, set_timeline_store
+
+    token_cache.clear()
+    feed_list_cache.clear()
+    feed_cache._inflight.clear()
+    set_feed_cache_backend(InMemoryFeedCacheBackend())
+    set_timeline_store(InMemoryTimelineStore())
+    return engine
+
+
+@pytest.fixture
+async def client(schema):
+    import httpx
+    from main import app
+
+    # lifespan (마이그레이션/미디어 워커) 없이 라우터만 호출
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+@pytest.fixture
+async def auth_headers(client):
+    # a@test.com, b@test.com, c@test.com 순서의 Authorization 헤더
+    headers = []
+    for name in "abc":
+        email = f"{name}@test.com"
+        await client.post(
+            "/api/auth/signup",
+            json={"email": email, "password": "password", "nickname": name.upper()},
+        )
+        response = await client.post(
+            "/api/auth/login", json={"email": email, "password": "password"}
+        )
+        headers.append({"Authorization": f"Bearer {response.json()['access_token']}"})
+    return headers
+
+
+@pytest.fixture
+def statements():
+    STATEMENTS.clear()
+    return STATEMENTS
+
+
+@pytest.fixture(scope="session")
+def s3_server():
+    # aiobotocore 는 moto 의 in-process mock 을 거치지 않으므로 로컬 S3 서버를 띄운다
+    moto_server = pytest.importorskip("moto.server")
+    server = moto_server.ThreadedMotoServer(port=TEST_S3_PORT, verbose=False)
+    server.start()
+    yield settings.S3_ENDPOINT_URL
+    server.stop()
+
+
+@pytest.fixture
+async def s3(s3_server):
+    import boto3
+    from config.s3_config import S3_REGION, close_s3_client
+
+    client = boto3.client(
+        "s3",
+        endpoint_url=s3_server,
+        aws_access_key_id=settings.S3_ACCESS_KEY,
+        aws_secret_access_key=settings.S3_SECRET_KEY,
+        region_name=S3_REGION,
+    )
+    client.create_bucket(
+        Bucket=settings.S3_BUCKET,
+        CreateBucketConfiguration={"LocationConstraint": S3_REGION},
+    )
+    yield client
+
+    # 앱의 공유 클라이언트는 이 테스트의 이벤트 루프에 묶여 있으므로 닫는다
+    await close_s3_client()
+    objects = client.list_objects_v2(Bucket=settings.S3_BUCKET).get("Contents", [])
+    for obj in objects:
+        client.delete_object(Bucket=settings.S3_BUCKET, Key=obj["Key"])
+    client.delete_bucket(Bucket=settings.S3_BUCKET)
+
+
+@pytest.fixture
+async def media_workers(schema, s3):
+    from services import media_service
+
+    media_service.start_media_workers()
+    yield media_service
+    await media_service.stop_media_workers()
@@ -0,0 +1,41 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_comments(client, auth_headers, count):
+    response = await client.post(
+        "/api/feed/create", data={"title": "title", "content": "content"}, headers=auth_headers[0]
+    )
+    feed_id = response.json()["id"]
+    for i in range(count):
+        await client.post(
+            "/api/comment/create",
+            json={"content": f"comment {i}", "feed_id": feed_id},
+            headers=auth_headers[i % len(auth_headers)],
+        )
+    return feed_id
+
+
+async def test_comment_page_query_count_does_not_grow_with_limit(client, auth_headers, statements):
+    feed_id = await create_comments(client, auth_headers, 30)
+
+    counts = {}
+    for limit in (5, 30):
+        statements.clear()
+        response = await client.get(f"/api/comment/feed/{feed_id}", params={"limit": limit})
+        assert response.status_code == 200
+        assert len(response.json()) == limit
+        counts[limit] = len(statements)
+
+    # 작성자 닉네임은 댓글마다 조회하지 않고 같은 쿼리에서 함께 읽는다
+    assert counts[5] == counts[30] <= 2
+
+
+async def test_comment_page_resolves_every_author(client, auth_headers):
+    feed_id = await create_comments(client, auth_headers, 6)
+
+    response = await client.get(f"/api/comment/feed/{feed_id}", params={"limit": 6})
+
+    nicknames = {comment["content"]: comment["author_nickname"] for comment in response.json()}
+    assert nicknames == {f"comment {i}": "ABC"[i % 3] for i in range(6)}
@@ -0,0 +1,65 @@
+import pytest
+from config.compression_config import ENCODINGS, negotiate
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_feeds(client, headers, count: int):
+    for i in range(count):
+        await client.post(
+            "/api/feed/create", data={"title": f"title {i}", "content": "c" * 50}, headers=headers
+        )
+
+
+def test_negotiate_prefers_installed_order_and_honors_q0():
+    assert negotiate(None) is None
+    assert negotiate("identity") is None
+    assert negotiate("gzip, deflate") == "gzip"
+    assert negotiate("gzip;q=0, deflate") is None
+    assert negotiate("*") == ENCODINGS[0]
+    # 명시적으로 거부한 인코딩은 "*" 로 다시 허용되지 않는다
+    assert negotiate(f"{ENCODINGS[0]};q=0, *") == (ENCODINGS[1:] or [None])[0]
+    assert negotiate(", ".join(f"{encoding};q=0" for encoding in ENCODINGS) + ", *") is None
+    assert negotiate("*;q=0") is None
+
+
+async def test_json_list_is_compressed_with_vary(client, auth_headers):
+    await create_feeds(client, auth_headers[0], 20)
+
+    plain = await client.get(
+        "/api/feed/list-by-user",
+        params={"user_id": 1, "limit": 20},
+        headers={"Accept-Encoding": "identity"},
+    )
+    response = await client.get(
+        "/api/feed/list-by-user",
+        params={"user_id": 1, "limit": 20},
+        headers={"Accept-Encoding": "gzip"},
+    )
+
+    assert "content-encoding" not in plain.headers
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    # httpx 가 이미 풀어 준 본문이 압축하지 않은 응답과 같아야 한다
+    assert response.content == plain.content
+    assert int(response.headers["content-length"]) < len(plain.content)
+
+
+async def test_cached_page_reuses_compressed_bytes(client, auth_headers):
+    await create_feeds(client, auth_headers[0], 20)
+    headers = {"Accept-Encoding": "gzip"}
+
+    first = await client.get("/api/feed/list", params={"limit": 20}, headers=headers)
+    second = await client.get("/api/feed/list", params={"limit": 20}, headers=headers)
+
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.headers["content-encoding"] == "gzip"
+    # ETag 는 압축 전 본문 기준이라 인코딩과 무관하다
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert second.content == first.content
+
+
+async def test_small_responses_are_not_compressed(client):
+    response = await client.get("/health/live", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
@@ -0,0 +1,113 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_feed(client, headers, title: str = "title"):
+    response = await client.post(
+        "/api/feed/create", data={"title": title, "content": "c"}, headers=headers
+    )
+    return response.json()["id"]
+
+
+async def test_unchanged_feed_returns_304_until_liked(client, auth_headers):
+    feed_id = await create_feed(client, auth_headers[0])
+
+    first = await client.get(f"/api/feed/read/{feed_id}")
+    etag = first.headers["ETag"]
+    revalidated = await client.get(f"/api/feed/read/{feed_id}", headers={"If-None-Match": etag})
+
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["ETag"] == etag
+
+    # 좋아요는 update_dt 를 바꾸지 않지만 ETag 는 바뀌어야 한다
+    await client.patch("/api/like/", params={"feed_id": feed_id}, headers=auth_headers[1])
+    response = await client.get(f"/api/feed/read/{feed_id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["like_count"] == 1
+
+
+async def test_version_probe_runs_only_for_revalidation(client, auth_headers, statements):
+    await create_feed(client, auth_headers[0])
+    params = {"email": "a@test.com"}
+
+    statements.clear()
+    first = await client.get("/api/feed/list-by-user", params=params)
+    plain = len(statements)
+
+    statements.clear()
+    revalidated = await client.get(
+        "/api/feed/list-by-user", params=params, headers={"If-None-Match": first.headers["ETag"]}
+    )
+
+    # 일반 200 응답은 버전 조회 없이 읽은 본문으로 ETag 를 만들고,
+    # 304 는 본문 컬럼을 읽지 않는 버전 조회로 끝난다
+    assert revalidated.status_code == 304
+    assert len(statements) == plain
+    assert not any("feeds.content" in statement for statement in statements)
+
+
+async def test_comment_page_etag_changes_with_new_comment(client, auth_headers):
+    feed_id = await create_feed(client, auth_headers[0])
+    await client.post(
+        "/api/comment/create", json={"content": "one", "feed_id": feed_id}, headers=auth_headers[0]
+    )
+    url = f"/api/comment/feed/{feed_id}"
+    etag = (await client.get(url)).headers["ETag"]
+
+    assert (await client.get(url, headers={"If-None-Match": etag})).status_code == 304
+
+    await client.post(
+        "/api/comment/create", json={"content": "two", "feed_id": feed_id}, headers=auth_headers[1]
+    )
+    response = await client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+
+async def test_cached_list_304_keeps_cache_header(client, auth_headers):
+    await create_feed(client, auth_headers[0])
+
+    first = await client.get("/api/feed/list")
+    response = await client.get("/api/feed/list", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert response.status_code == 304
+    assert response.headers["X-Cache"] == "HIT"
+
+
+async def test_etag_changes_when_next_page_appears(client, auth_headers):
+    await create_feed(client, auth_headers[0], "first")
+    # 같은 첫 행, 같은 count (none) 에서 다음 페이지 유무만 바뀌는 경우
+    params = {"email": "a@test.com", "limit": 1, "sort_by": "id_asc", "count_mode": "none"}
+    etag = (await client.get("/api/feed/list-by-user", params=params)).headers["ETag"]
+
+    await create_feed(client, auth_headers[0], "second")
+    response = await client.get(
+        "/api/feed/list-by-user", params=params, headers={"If-None-Match": etag}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["next_cursor"] is not None
+
+
+async def test_comment_page_304_keeps_next_cursor(client, auth_headers):
+    feed_id = await create_feed(client, auth_headers[0])
+    for content in ("one", "two"):
+        await client.post(
+            "/api/comment/create",
+            json={"content": content, "feed_id": feed_id},
+            headers=auth_headers[0],
+        )
+    url = f"/api/comment/feed/{feed_id}"
+    first = await client.get(url, params={"limit": 1})
+
+    response = await client.get(
+        url, params={"limit": 1}, headers={"If-None-Match": first.headers["ETag"]}
+    )
+
+    assert response.status_code == 304
+    assert response.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
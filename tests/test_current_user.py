@@ -0,0 +1,58 @@
+import pytest
+from services.auth_service import token_cache
+
+pytestmark = pytest.mark.anyio
+
+
+def user_lookups(statements) -> int:
+    return sum(1 for statement in statements if statement.lstrip().startswith("SELECT users."))
+
+
+WRITES = [
+    ("post", "/api/feed/create", {"data": {"title": "title", "content": "content"}}),
+    ("patch", "/api/feed/update/1", {"data": {"title": "title 2", "content": "content 2"}}),
+    ("post", "/api/comment/create", {"json": {"content": "comment", "feed_id": 1}}),
+    ("patch", "/api/comment/update/1", {"json": {"content": "comment 2"}}),
+    ("patch", "/api/like/", {"params": {"feed_id": 1}}),
+    ("patch", "/api/follow/2", {}),
+]
+
+
+@pytest.mark.parametrize("cached_token", [False, True])
+async def test_write_resolves_current_user_at_most_once(
+    client, auth_headers, statements, cached_token
+):
+    for method, url, kwargs in WRITES:
+        if not cached_token:
+            token_cache.clear()
+        statements.clear()
+
+        response = await getattr(client, method)(url, headers=auth_headers[0], **kwargs)
+
+        assert response.status_code == 200, url
+        assert user_lookups(statements) <= 1, url
+
+
+async def test_like_and_follow_skip_user_lookup_with_cached_token(client, auth_headers, statements):
+    await client.post(
+        "/api/feed/create", data={"title": "title", "content": "content"}, headers=auth_headers[0]
+    )
+
+    # 토큰 캐시에 id 가 있으므로 like/follow 는 users 를 읽지 않는다
+    for url, params in (("/api/like/", {"feed_id": 1}), ("/api/follow/2", None)):
+        statements.clear()
+        response = await client.patch(url, params=params, headers=auth_headers[0])
+        assert response.status_code == 200
+        assert user_lookups(statements) == 0
+
+
+async def test_update_by_other_user_is_forbidden(client, auth_headers):
+    await client.post(
+        "/api/feed/create", data={"title": "title", "content": "content"}, headers=auth_headers[0]
+    )
+
+    response = await client.patch(
+        "/api/feed/update/1", data={"title": "title", "content": "content"}, headers=auth_headers[1]
+    )
+
+    assert response.status_code == 403
@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import create_async_engine
+import config.db
+from config.db import InstrumentedPool, PoolMetrics
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def metrics(engine, monkeypatch):
+    metrics = PoolMetrics()
+    monkeypatch.setattr(config.db, "pool_metrics", metrics)
+    return metrics
+
+
+async def sleep_on(pool_engine, seconds: float):
+    async with pool_engine.connect() as conn:
+        await conn.exec_driver_sql(f"SELECT pg_sleep({seconds})")
+
+
+async def test_pool_records_waits_when_exhausted(engine, metrics):
+    # 2 + overflow 1 개로 동시에 9 개를 실행하면 6 개는 반납을 기다린다
+    pool_engine = create_async_engine(
+        engine.url, poolclass=InstrumentedPool, pool_size=2, max_overflow=1
+    )
+    try:
+        await asyncio.gather(*[sleep_on(pool_engine, 0.1) for _ in range(9)])
+    finally:
+        await pool_engine.dispose()
+
+    assert metrics.checkouts == 9
+    assert metrics.waits == 6
+    assert metrics.wait_ms_max >= metrics.wait_ms_total / metrics.waits > 0
+
+
+async def test_pool_records_timeouts(engine, metrics):
+    pool_engine = create_async_engine(
+        engine.url,
+        poolclass=InstrumentedPool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    try:
+        results = await asyncio.gather(
+            *[sleep_on(pool_engine, 0.5) for _ in range(3)], return_exceptions=True
+        )
+    finally:
+        await pool_engine.dispose()
+
+    assert sum(isinstance(result, exc.TimeoutError) for result in results) == 2
+    assert metrics.timeouts == 2
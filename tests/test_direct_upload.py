@@ -0,0 +1,115 @@
+import io
+import httpx
+import pytest
+from PIL import Image
+from config import settings
+
+pytestmark = pytest.mark.anyio
+
+
+def jpeg_bytes() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (400, 300), (5, 5, 5)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def s3_keys(s3) -> list:
+    objects = s3.list_objects_v2(Bucket=settings.S3_BUCKET).get("Contents", [])
+    return sorted(obj["Key"] for obj in objects)
+
+
+async def create_feed(client, headers) -> dict:
+    response = await client.post(
+        "/api/feed/create", data={"title": "title", "content": "content"}, headers=headers
+    )
+    return response.json()
+
+
+async def request_uploads(client, headers, feed_id, files):
+    return await client.post(
+        f"/api/feed/upload-url/{feed_id}", json={"files": files}, headers=headers
+    )
+
+
+async def post_to_s3(upload: dict, body: bytes):
+    # 클라이언트가 앱 서버를 거치지 않고 presigned POST 로 바로 올리는 단계
+    async with httpx.AsyncClient() as s3_client:
+        response = await s3_client.post(
+            upload["url"], data=upload["fields"], files={"file": ("a.jpg", body, "image/jpeg")}
+        )
+    assert response.status_code in (200, 204)
+
+
+async def test_direct_upload_is_attached_without_changing_update_dt(
+    client, auth_headers, media_workers, s3
+):
+    feed = await create_feed(client, auth_headers[0])
+    response = await request_uploads(
+        client, auth_headers[0], feed["id"], [{"content_type": "image/jpeg", "size": 1000}]
+    )
+    assert response.status_code == 200
+    upload = response.json()["uploads"][0]
+    await post_to_s3(upload, jpeg_bytes())
+
+    response = await client.post(
+        f"/api/feed/upload-finalize/{feed['id']}",
+        json={"media_ids": [upload["media_id"]]},
+        headers=auth_headers[0],
+    )
+    assert response.status_code == 200
+    assert response.json()["pending_media_ids"] == [upload["media_id"]]
+
+    await media_workers.media_queue.join()
+
+    response = await client.get(f"/api/feed/read/{feed['id']}")
+    attached = response.json()
+    assert attached["pending_media_ids"] == []
+    assert len(attached["image_urls"]) == 1
+    assert attached["update_dt"] == feed["update_dt"]
+    # 임시 업로드 객체는 처리 후 지워진다
+    assert not [key for key in s3_keys(s3) if key.startswith("uploads/")]
+
+
+async def test_upload_url_rejects_other_users_and_bad_files(client, auth_headers, s3):
+    feed = await create_feed(client, auth_headers[0])
+
+    response = await request_uploads(
+        client, auth_headers[1], feed["id"], [{"content_type": "image/jpeg", "size": 10}]
+    )
+    assert response.status_code == 403
+
+    for file in (
+        {"content_type": "text/html", "size": 10},
+        {"content_type": "image/jpeg", "size": 10**10},
+        {"content_type": "image/jpeg", "size": 0},
+    ):
+        response = await request_uploads(client, auth_headers[0], feed["id"], [file])
+        assert response.status_code == 400, file
+
+
+async def test_finalize_checks_uploaded_object(
+    client, auth_headers, media_workers, s3, monkeypatch
+):
+    feed = await create_feed(client, auth_headers[0])
+    response = await request_uploads(
+        client, auth_headers[0], feed["id"], [{"content_type": "image/jpeg", "size": 1000}] * 2
+    )
+    uploaded, missing = response.json()["uploads"]
+    await post_to_s3(uploaded, jpeg_bytes())
+
+    async def finalize(media_ids):
+        return await client.post(
+            f"/api/feed/upload-finalize/{feed['id']}",
+            json={"media_ids": media_ids},
+            headers=auth_headers[0],
+        )
+
+    assert (await finalize(["../other-feed"])).status_code == 400
+    assert (await finalize([missing["media_id"]])).status_code == 404
+
+    # S3 가 content-length-range 를 검사하지 않는 환경에서도 finalize 에서 다시 확인
+    monkeypatch.setattr(media_workers, "DIRECT_UPLOAD_MAX_BYTES", 10)
+    assert (await finalize([uploaded["media_id"]])).status_code == 400
+
+    response = await client.get(f"/api/feed/read/{feed['id']}")
+    assert response.json()["pending_media_ids"] == []
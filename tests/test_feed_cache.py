@@ -0,0 +1,186 @@
+import asyncio
+import pytest
+from services.feed_cache import (
+    FeedCache,
+    InMemoryFeedCacheBackend,
+    RedisFeedCacheBackend,
+    set_feed_cache_backend,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def make_backend(name: str):
+    if name == "redis":
+        fakeredis = pytest.importorskip("fakeredis.aioredis")
+        return RedisFeedCacheBackend(fakeredis.FakeRedis())
+    return InMemoryFeedCacheBackend()
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request, client):
+    # client (schema) 가 기본 백엔드로 되돌린 뒤에 교체
+    backend = make_backend(request.param)
+    set_feed_cache_backend(backend)
+    return backend
+
+
+async def create_feed(client, headers) -> int:
+    response = await client.post(
+        "/api/feed/create", data={"title": "title", "content": "content"}, headers=headers
+    )
+    return response.json()["id"]
+
+
+async def test_repeated_read_is_served_from_cache(client, auth_headers, backend, statements):
+    feed_id = await create_feed(client, auth_headers[0])
+    await client.get(f"/api/feed/read/{feed_id}")
+
+    statements.clear()
+    response = await client.get(f"/api/feed/read/{feed_id}")
+
+    assert response.status_code == 200
+    assert statements == []
+
+
+async def test_like_updates_cached_like_count(client, auth_headers, backend, statements):
+    feed_id = await create_feed(client, auth_headers[0])
+    await client.get(f"/api/feed/read/{feed_id}")
+
+    for expected, headers in enumerate(auth_headers, start=1):
+        await client.patch("/api/like/", params={"feed_id": feed_id}, headers=headers)
+        statements.clear()
+        response = await client.get(f"/api/feed/read/{feed_id}")
+        # 항목을 비우지 않고 like_count 만 바꾸므로 다시 읽지 않는다
+        assert response.json()["like_count"] == expected
+        assert statements == []
+
+    await client.patch("/api/like/", params={"feed_id": feed_id}, headers=auth_headers[0])
+    response = await client.get(f"/api/feed/read/{feed_id}")
+    assert response.json()["like_count"] == len(auth_headers) - 1
+
+
+async def test_update_and_delete_invalidate_cached_feed(client, auth_headers, backend):
+    feed_id = await create_feed(client, auth_headers[0])
+    await client.get(f"/api/feed/read/{feed_id}")
+
+    await client.patch(
+        f"/api/feed/update/{feed_id}",
+        data={"title": "new title", "content": "content"},
+        headers=auth_headers[0],
+    )
+    response = await client.get(f"/api/feed/read/{feed_id}")
+    assert response.json()["title"] == "new title"
+
+    await client.delete(f"/api/feed/delete/{feed_id}", headers=auth_headers[0])
+    response = await client.get(f"/api/feed/read/{feed_id}")
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("name", ["memory", "redis"])
+async def test_concurrent_misses_load_once(name):
+    cache = FeedCache(make_backend(name), ttl=30)
+    loads = 0
+
+    async def loader():
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.05)
+        return {"id": 1, "author_email": "a@test.com", "like_count": 0}
+
+    results = await asyncio.gather(*[cache.get_or_load(1, loader) for _ in range(10)])
+
+    assert loads == 1
+    assert all(result["id"] == 1 for result in results)
+    assert cache.metrics()["coalesced"] == 9
+
+
+@pytest.mark.parametrize("name", ["memory", "redis"])
+async def test_author_invalidation_drops_only_that_author(name):
+    cache = FeedCache(make_backend(name), ttl=30)
+    for feed_id, author_email in ((1, "a@test.com"), (2, "a@test.com"), (3, "b@test.com")):
+        value = {"id": feed_id, "author_email": author_email}
+        await cache.get_or_load(feed_id, lambda value=value: asyncio.sleep(0, value))
+
+    await cache.invalidate_author("a@test.com")
+
+    assert await cache.backend.get("1") is None
+    assert await cache.backend.get("2") is None
+    assert await cache.backend.get("3") == {"id": 3, "author_email": "b@test.com"}
+
+
+@pytest.mark.parametrize("name", ["memory", "redis"])
+async def test_like_count_update_does_not_create_missing_entry(name):
+    cache = FeedCache(make_backend(name), ttl=30)
+
+    await cache.set_like_count(1, 5)
+
+    assert await cache.backend.get("1") is None
+
+
+@pytest.mark.parametrize("name", ["memory", "redis"])
+@pytest.mark.parametrize("change", ["invalidate", "like"])
+async def test_change_during_load_is_not_overwritten(name, change):
+    cache = FeedCache(make_backend(name), ttl=30)
+    loading = asyncio.Event()
+    release = asyncio.Event()
+
+    async def loader():
+        loading.set()
+        await release.wait()
+        return {"id": 1, "author_email": "a@test.com", "like_count": 0}
+
+    task = asyncio.create_task(cache.get_or_load(1, loader))
+    await loading.wait()
+    if change == "invalidate":
+        await cache.invalidate(1)
+    else:
+        await cache.set_like_count(1, 1)
+    release.set()
+    await task
+
+    # 조회 중에 바뀐 값은 이전 조회 결과로 채우지 않는다
+    assert await cache.backend.get("1") is None
+
+
+@pytest.mark.parametrize("change", ["invalidate", "like"])
+async def test_other_worker_change_during_load_is_not_overwritten(change):
+    fakeredis = pytest.importorskip("fakeredis.aioredis")
+    client = fakeredis.FakeRedis()
+    # 같은 Redis 를 쓰는 두 워커 - inflight 는 공유되지 않는다
+    cache = FeedCache(RedisFeedCacheBackend(client), ttl=30)
+    other = FeedCache(RedisFeedCacheBackend(client), ttl=30)
+    loading = asyncio.Event()
+    release = asyncio.Event()
+
+    async def loader():
+        loading.set()
+        await release.wait()
+        return {"id": 1, "author_email": "a@test.com", "like_count": 0}
+
+    task = asyncio.create_task(cache.get_or_load(1, loader))
+    await loading.wait()
+    if change == "invalidate":
+        await other.invalidate(1)
+    else:
+        await other.set_like_count(1, 1)
+    release.set()
+    await task
+
+    assert await cache.backend.get("1") is None
+
+    # 바뀐 뒤에 시작한 조회는 다시 저장된다
+    await cache.get_or_load(1, lambda: asyncio.sleep(0, {"id": 1, "author_email": "a@test.com"}))
+    assert await cache.backend.get("1") == {"id": 1, "author_email": "a@test.com"}
+
+
+async def test_invalidation_during_redis_set_wins():
+    fakeredis = pytest.importorskip("fakeredis.aioredis")
+    backend = RedisFeedCacheBackend(fakeredis.FakeRedis())
+    generation = await backend.generation("1")
+
+    # 세대를 읽은 뒤 저장 전에 들어온 무효화
+    await backend.delete("1")
+
+    assert not await backend.set("1", {"id": 1}, 30, "a@test.com", generation)
+    assert await backend.get("1") is None
@@ -0,0 +1,69 @@
+import asyncio
+import pytest
+from services.feed_list_cache import FeedListCache, feed_list_cache
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_feed(client, headers, title: str = "title"):
+    await client.post("/api/feed/create", data={"title": title, "content": "c"}, headers=headers)
+
+
+async def test_first_page_is_served_from_cache(client, auth_headers, statements):
+    await create_feed(client, auth_headers[0])
+
+    first = await client.get("/api/feed/list")
+    statements.clear()
+    second = await client.get("/api/feed/list")
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.content == first.content
+    assert statements == []
+
+
+async def test_write_clears_cached_pages(client, auth_headers):
+    await create_feed(client, auth_headers[0], "old")
+    await client.get("/api/feed/list")
+
+    await create_feed(client, auth_headers[0], "new")
+    response = await client.get("/api/feed/list")
+
+    assert response.headers["X-Cache"] == "MISS"
+    assert [feed["title"] for feed in response.json()["feeds"]] == ["new", "old"]
+
+
+async def test_cursor_and_deep_pages_bypass_cache(client, auth_headers):
+    await create_feed(client, auth_headers[0])
+
+    response = await client.get("/api/feed/list", params={"skip": 100})
+    assert response.headers["X-Cache"] == "BYPASS"
+    response = await client.get("/api/feed/list", params={"limit": 1000})
+    assert response.headers["X-Cache"] == "BYPASS"
+
+
+async def test_unknown_sort_by_shares_default_entry(client, auth_headers):
+    await create_feed(client, auth_headers[0])
+
+    for i in range(3):
+        await client.get("/api/feed/list", params={"sort_by": f"foo{i}"})
+    await client.get("/api/feed/list")
+
+    # 알 수 없는 정렬 값마다 항목이 생기면 요청만으로 캐시가 끝없이 커진다
+    assert len(feed_list_cache._entries) == 1
+
+
+async def test_invalid_count_mode_is_rejected_before_caching(client):
+    response = await client.get("/api/feed/list", params={"count_mode": "bogus"})
+
+    assert response.status_code == 400
+    assert feed_list_cache._entries == {}
+
+
+async def test_cache_keeps_at_most_max_size_pages():
+    cache = FeedListCache(ttl=30, stale_ttl=30, max_size=2)
+
+    for key in range(5):
+        await cache.get(key, lambda key=key: asyncio.sleep(0, str(key).encode()))
+
+    assert list(cache._entries) == [3, 4]
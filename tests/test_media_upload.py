@@ -0,0 +1,240 @@
+import io
+import os
+import time
+import pytest
+from PIL import Image
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, update
+from config import settings
+from config.db import AsyncSessionLocal
+from config.s3_config import get_s3_key
+from models.feed import Feed
+
+pytestmark = pytest.mark.anyio
+
+
+def image_bytes(color, image_format="JPEG", exif=None) -> bytes:
+    buffer = io.BytesIO()
+    image = Image.new("RGB", (400, 300), color)
+    if exif is not None:
+        image.save(buffer, format=image_format, exif=exif)
+    else:
+        image.save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+def gps_exif() -> Image.Exif:
+    exif = Image.Exif()
+    exif[0x010F] = "camera maker"
+    # GPSInfo IFD - 업로드 원본에 있어도 저장된 이미지에는 남지 않아야 한다
+    exif.get_ifd(0x8825)[2] = (37.0, 33.0, 0.0)
+    return exif
+
+
+def s3_keys(s3) -> list:
+    objects = s3.list_objects_v2(Bucket=settings.S3_BUCKET).get("Contents", [])
+    return sorted(obj["Key"] for obj in objects)
+
+
+async def create_feed(client, headers, images):
+    files = [("images", image) for image in images]
+    response = await client.post(
+        "/api/feed/create",
+        data={"title": "title", "content": "content"},
+        files=files,
+        headers=headers,
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_images_are_uploaded_by_workers(client, auth_headers, media_workers, s3):
+    feed = await create_feed(
+        client,
+        auth_headers[0],
+        [
+            ("a.jpg", image_bytes((200, 10, 10)), "image/jpeg"),
+            ("b.png", image_bytes((10, 200, 10), "PNG"), "image/png"),
+            ("c.txt", b"not an image", "text/plain"),
+        ],
+    )
+    # 요청은 S3 를 기다리지 않고 pending 상태로 바로 응답한다
+    assert feed["image_urls"] == []
+    assert len(feed["pending_media_ids"]) == 3
+
+    await media_workers.media_queue.join()
+
+    response = await client.get(f"/api/feed/read/{feed['id']}")
+    feed = response.json()
+    assert feed["pending_media_ids"] == []
+    assert [url.rsplit("/", 1)[-1] for url in feed["image_urls"]] == [
+        "original.jpg",
+        "original.png",
+    ]
+    # 크기별 변형이 모두 같은 media_id 아래에 올라간다
+    variants = {key.split("/", 1)[1] for key in s3_keys(s3)}
+    for name in ("thumbnail", "medium", "original"):
+        for fmt in media_workers.TRANSCODE_FORMATS:
+            assert f"{name}.{fmt}" in variants
+
+
+async def test_uploaded_original_has_no_exif(client, auth_headers, media_workers, s3):
+    feed = await create_feed(
+        client,
+        auth_headers[0],
+        [("gps.jpg", image_bytes((0, 0, 200), exif=gps_exif()), "image/jpeg")],
+    )
+    await media_workers.media_queue.join()
+
+    response = await client.get(f"/api/feed/read/{feed['id']}")
+    key = get_s3_key(response.json()["image_urls"][0])
+    body = s3.get_object(Bucket=settings.S3_BUCKET, Key=key)["Body"].read()
+
+    with Image.open(io.BytesIO(body)) as image:
+        assert not image.getexif()
+
+
+async def test_update_and_delete_remove_every_variant(client, auth_headers, media_workers, s3):
+    feed = await create_feed(
+        client,
+        auth_headers[0],
+        [
+            ("a.jpg", image_bytes((200, 10, 10)), "image/jpeg"),
+            ("b.jpg", image_bytes((10, 200, 10)), "image/jpeg"),
+        ],
+    )
+    await media_workers.media_queue.join()
+    response = await client.get(f"/api/feed/read/{feed['id']}")
+    removed, kept = response.json()["image_urls"]
+
+    await client.patch(
+        f"/api/feed/update/{feed['id']}",
+        data={"title": "title", "content": "content", "target_image_urls": [removed]},
+        headers=auth_headers[0],
+    )
+    media_ids = {key.split("/", 1)[0] for key in s3_keys(s3)}
+    assert media_ids == {get_s3_key(kept).split("/", 1)[0]}
+
+    await client.delete(f"/api/feed/delete/{feed['id']}", headers=auth_headers[0])
+    assert s3_keys(s3) == []
+
+
+async def test_same_image_is_stored_once_and_removed_with_last_feed(
+    client, auth_headers, media_workers, s3
+):
+    image = ("a.jpg", image_bytes((120, 120, 120)), "image/jpeg")
+    first = await create_feed(client, auth_headers[0], [image])
+    await media_workers.media_queue.join()
+    keys = s3_keys(s3)
+
+    second = await create_feed(client, auth_headers[0], [image])
+    await media_workers.media_queue.join()
+    # 같은 내용은 다시 올리지 않고 참조 수만 늘린다
+    assert s3_keys(s3) == keys
+
+    await client.delete(f"/api/feed/delete/{first['id']}", headers=auth_headers[0])
+    assert s3_keys(s3) == keys
+
+    await client.delete(f"/api/feed/delete/{second['id']}", headers=auth_headers[0])
+    assert s3_keys(s3) == []
+
+
+async def test_images_are_rejected_before_commit_without_workers(client, auth_headers):
+    # lifespan 없이 (워커 없이) 받은 이미지는 피드를 만들기 전에 거절한다
+    response = await client.post(
+        "/api/feed/create",
+        data={"title": "title", "content": "content"},
+        files=[("images", ("a.jpg", image_bytes((1, 2, 3)), "image/jpeg"))],
+        headers=auth_headers[0],
+    )
+    assert response.status_code == 503
+
+    response = await client.get("/api/feed/list-by-user", params={"email": "a@test.com"})
+    assert response.json()["feeds"] == []
+
+
+async def test_expiry_keeps_media_still_queued_in_this_process(client, auth_headers, media_workers):
+    feed = await create_feed(client, auth_headers[0], [])
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(Feed)
+            .where(Feed.id == feed["id"])
+            .values(
+                pending_media_ids=["queued", "lost"],
+                pending_media_since=datetime.now(timezone.utc)
+                - timedelta(seconds=media_workers.MEDIA_PENDING_TIMEOUT * 2),
+            )
+        )
+        await db.commit()
+    media_workers._live_media.add("queued")
+
+    # 큐에 있는 이미지는 남기고 이 프로세스가 모르는 이미지만 정리
+    assert await media_workers.expire_pending_media() == [feed["id"]]
+    async with AsyncSessionLocal() as db:
+        pending_media_ids, pending_media_since = (
+            await db.execute(
+                select(Feed.pending_media_ids, Feed.pending_media_since).where(
+                    Feed.id == feed["id"]
+                )
+            )
+        ).one()
+    assert pending_media_ids == ["queued"]
+    assert pending_media_since is not None
+
+    # 남은 이미지가 모두 처리 중이면 건드리지 않는다
+    assert await media_workers.expire_pending_media() == []
+
+    media_workers._live_media.discard("queued")
+    assert await media_workers.expire_pending_media() == [feed["id"]]
+
+
+async def test_expiry_sweeps_only_unreferenced_staging_files(media_workers, tmp_path, monkeypatch):
+    monkeypatch.setattr(media_workers, "MEDIA_STAGING_DIR", str(tmp_path))
+    own = tmp_path / "own"
+    other = tmp_path / "other"
+    dead = tmp_path / "dead"
+    for directory in (own, other, dead):
+        directory.mkdir()
+    monkeypatch.setattr(media_workers, "_staging_dir", str(own))
+
+    old = time.time() - media_workers.MEDIA_PENDING_TIMEOUT * 2
+    for path in (own / "queued", own / "orphan", other / "working", dead / "left"):
+        path.write_bytes(b"x")
+        os.utime(path, (old, old))
+    os.utime(dead, (old, old))
+    media_workers._live_media.add("queued")
+
+    await media_workers.expire_pending_media()
+
+    # 처리 중인 파일과 heartbeat 가 살아 있는 다른 프로세스의 디렉터리는 남긴다
+    assert sorted(os.listdir(own)) == ["queued"]
+    assert os.listdir(other) == ["working"]
+    assert not dead.exists()
+
+
+async def test_delete_reports_keys_s3_could_not_delete(monkeypatch, caplog):
+    from services import media_service
+
+    class PartialDeleteClient:
+        async def delete_objects(self, Bucket, Delete):
+            # Quiet 모드 응답 - 성공한 키는 빠지고 실패한 키만 Errors 에 남는다
+            return {"Errors": [{"Key": "b/original.jpg", "Code": "AccessDenied", "Message": "x"}]}
+
+    async def get_s3_client():
+        return PartialDeleteClient()
+
+    monkeypatch.setattr(media_service, "get_s3_client", get_s3_client)
+    monkeypatch.setattr(media_service, "media_metrics", media_service.MediaMetrics())
+
+    failed = await media_service.delete_s3_objects(["a/original.jpg", "b/original.jpg"])
+
+    assert failed == ["b/original.jpg"]
+    assert media_service.media_metrics.delete_failed == 1
+    assert "b/original.jpg" in caplog.text and "AccessDenied" in caplog.text
+
+
+async def test_s3_client_is_shared(s3):
+    from config.s3_config import get_s3_client
+
+    # 요청/업로드마다 클라이언트를 만들지 않고 커넥션 풀을 공유한다
+    assert await get_s3_client() is await get_s3_client()
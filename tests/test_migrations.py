@@ -0,0 +1,171 @@
+import json
+import pytest
+from sqlalchemy import event
+from migrations import MIGRATIONS, run_migrations
+
+pytestmark = pytest.mark.anyio
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from plan_nodes(child)
+
+
+async def explain_page_query(client, engine, url: str, table: str, params=None) -> list:
+    # 요청이 실행한 목록 쿼리 (LIMIT 가 붙은 table 조회) 를 같은 파라미터로 EXPLAIN
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if f"FROM {table}" in statement and "LIMIT" in statement:
+            captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        response = await client.get(url, params=params)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+    assert response.status_code == 200
+    assert captured, url
+
+    statement, parameters = captured[-1]
+    async with engine.connect() as conn:
+        # 테스트 데이터는 작아서 순차 스캔이 더 싸므로, 인덱스 순서로 읽을 수 있는지만 확인
+        await conn.exec_driver_sql("SET enable_seqscan = off")
+        await conn.exec_driver_sql("SET enable_bitmapscan = off")
+        result = await conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters)
+        plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return list(plan_nodes(plan[0]["Plan"]))
+
+
+async def create_rows(client, auth_headers):
+    for headers in auth_headers:
+        response = await client.post(
+            "/api/feed/create", data={"title": "title", "content": "content"}, headers=headers
+        )
+        await client.post(
+            "/api/comment/create",
+            json={"content": "comment", "feed_id": response.json()["id"]},
+            headers=headers,
+        )
+    await client.patch("/api/follow/1", headers=auth_headers[1])
+    await client.patch("/api/follow/1", headers=auth_headers[2])
+
+
+@pytest.mark.parametrize(
+    "url, table, params, index",
+    [
+        ("/api/feed/list", "feeds", None, "ix_feeds_create_dt"),
+        (
+            "/api/feed/list",
+            "feeds",
+            {"sort_by": "update_dt_desc", "limit": 7},
+            "ix_feeds_update_dt",
+        ),
+        ("/api/comment/feed/1", "comments", None, "ix_comments_feed_id_create_dt"),
+        (
+            "/api/mypage/1/followers",
+            "users",
+            None,
+            "ix_follows_following_id_follower_id",
+        ),
+    ],
+)
+async def test_list_queries_use_indexes(client, engine, auth_headers, url, table, params, index):
+    await create_rows(client, auth_headers)
+
+    nodes = await explain_page_query(client, engine, url, table, params)
+
+    assert index in {node.get("Index Name") for node in nodes}
+    if table != "users":
+        # 인덱스 순서로 읽으므로 정렬 단계가 없어야 한다
+        assert "Sort" not in {node["Node Type"] for node in nodes}
+
+
+async def test_migrations_are_idempotent(schema):
+    async with schema.begin() as conn:
+        await conn.run_sync(run_migrations)
+        versions = await conn.exec_driver_sql("SELECT version FROM schema_migrations")
+        assert sorted(versions.scalars()) == [version for version, _ in MIGRATIONS]
+
+
+async def test_backfill_cleans_likes_and_dates_pending_media(schema):
+    # 제약이 생기기 전의 DB 처럼 중복 like 와 대상이 없는 like 를 넣고 0002 부터 다시 적용
+    async with schema.begin() as conn:
+        await conn.exec_driver_sql("ALTER TABLE likes DROP CONSTRAINT ck_like_single_target")
+        await conn.exec_driver_sql("DROP INDEX uq_like_user_feed")
+        await conn.exec_driver_sql(
+            "INSERT INTO users (email, password, nickname) VALUES ('a@test.com', 'x', 'A')"
+        )
+        await conn.exec_driver_sql(
+            "INSERT INTO feeds (title, content, author_email) VALUES ('t', 'c', 'a@test.com')"
+        )
+        # 시각 없이 남은 pending 목록 (pending_media_since 이전에 만들어진 피드)
+        await conn.exec_driver_sql(
+            "INSERT INTO feeds (title, content, author_email, pending_media_ids) "
+            "VALUES ('t', 'c', 'a@test.com', '[\"m\"]')"
+        )
+        await conn.exec_driver_sql(
+            "INSERT INTO likes (user_email, feed_id) "
+            "VALUES ('a@test.com', 1), ('a@test.com', 1), ('a@test.com', NULL)"
+        )
+        await conn.exec_driver_sql("DELETE FROM schema_migrations WHERE version <> '0001_initial'")
+
+    async with schema.begin() as conn:
+        await conn.run_sync(run_migrations)
+
+    async with schema.connect() as conn:
+        likes = await conn.exec_driver_sql("SELECT user_email, feed_id FROM likes")
+        assert likes.all() == [("a@test.com", 1)]
+        constraints = await conn.exec_driver_sql(
+            "SELECT conname FROM pg_constraint WHERE conname = 'ck_like_single_target'"
+        )
+        assert constraints.scalars().all() == ["ck_like_single_target"]
+        pending = await conn.exec_driver_sql(
+            "SELECT id FROM feeds WHERE pending_media_since IS NOT NULL"
+        )
+        assert pending.scalars().all() == [2]
+
+
+async def test_failing_migration_stops_startup(client, engine, monkeypatch):
+    import main
+    from sqlalchemy import exc
+
+    def broken_migration(conn):
+        raise exc.ProgrammingError("ALTER TABLE", {}, Exception("syntax error"))
+
+    # 같은 SQL 오류는 재시도해도 반복되므로 기다리지 않고 실패 상태로 남아야 한다
+    monkeypatch.setattr(main, "engine", engine)
+    monkeypatch.setattr(main, "run_migrations", broken_migration)
+    monkeypatch.setattr(main.app.state, "ready", False, raising=False)
+    monkeypatch.setattr(main.app.state, "startup_error", None, raising=False)
+    sweepers = []
+    monkeypatch.setattr(main, "start_media_sweeper", lambda: sweepers.append(True))
+
+    await main.prepare(main.app)
+
+    response = await client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json() == {"status": "failed"}
+    # 스키마가 준비되지 않았으므로 pending 만료 정리도 시작하지 않는다
+    assert sweepers == []
+
+
+async def test_media_sweeper_starts_once_ready(engine, monkeypatch):
+    import main
+
+    async def warm_pool():
+        pass
+
+    monkeypatch.setattr(main, "engine", engine)
+    monkeypatch.setattr(main, "warm_pool", warm_pool)
+    monkeypatch.setattr(main.app.state, "ready", False, raising=False)
+    monkeypatch.setattr(main.app.state, "startup_ms", None, raising=False)
+    sweepers = []
+    monkeypatch.setattr(main, "start_media_sweeper", lambda: sweepers.append(main.app.state.ready))
+
+    await main.prepare(main.app)
+
+    assert sweepers == [True]
@@ -0,0 +1,140 @@
+import asyncio
+import pytest
+from sqlalchemy import func, select
+from config.db import AsyncSessionLocal
+from models.feed import Feed
+from models.follow import Follow
+from models.like import Like
+from models.user import User
+from services import counter_service
+from services.follow_service import toggle_follow
+from services.like_service import toggle_like
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_feed(client, headers) -> int:
+    response = await client.post(
+        "/api/feed/create", data={"title": "title", "content": "content"}, headers=headers
+    )
+    return response.json()["id"]
+
+
+async def race(first, second):
+    # first 의 commit 을 second 가 시작한 뒤로 미뤄 두 트랜잭션이 겹치게 한다
+    gate = asyncio.Event()
+    async with AsyncSessionLocal() as a, AsyncSessionLocal() as b:
+        commit = a.commit
+
+        async def delayed_commit():
+            await gate.wait()
+            await commit()
+
+        a.commit = delayed_commit
+        first_task = asyncio.create_task(first(a))
+        await asyncio.sleep(0.2)
+        second_task = asyncio.create_task(second(b))
+        await asyncio.sleep(0.2)
+        gate.set()
+        return await first_task, await second_task
+
+
+async def test_parallel_likes_keep_like_count_exact(client, auth_headers):
+    feed_id = await create_feed(client, auth_headers[0])
+
+    responses = await asyncio.gather(
+        *[
+            client.patch("/api/like/", params={"feed_id": feed_id}, headers=headers)
+            for headers in auth_headers
+        ]
+    )
+    assert all(response.json()["liked"] for response in responses)
+
+    async with AsyncSessionLocal() as db:
+        rows = await db.scalar(
+            select(func.count()).select_from(Like).where(Like.feed_id == feed_id)
+        )
+    response = await client.get(f"/api/feed/read/{feed_id}")
+    assert rows == response.json()["like_count"] == len(auth_headers)
+
+
+async def test_concurrent_like_reports_committed_state(client, auth_headers):
+    feed_id = await create_feed(client, auth_headers[0])
+
+    # 같은 사용자의 동시 요청 - 늦게 끝난 쪽도 실제 상태(좋아요 됨)를 돌려줘야 한다
+    results = await race(
+        lambda db: toggle_like(db, "b@test.com", 2, feed_id=feed_id),
+        lambda db: toggle_like(db, "b@test.com", 2, feed_id=feed_id),
+    )
+    assert results == (True, True)
+
+    response = await client.get(f"/api/feed/read/{feed_id}")
+    assert response.json()["like_count"] == 1
+
+
+async def test_concurrent_follow_reports_committed_state(client, auth_headers):
+    results = await race(
+        lambda db: toggle_follow(db, 2, 1),
+        lambda db: toggle_follow(db, 2, 1),
+    )
+    assert results == ({"action": "followed"}, {"action": "followed"})
+
+    for count_mode in ("exact", "cached"):
+        response = await client.get("/api/mypage/1/followers", params={"count_mode": count_mode})
+        assert response.json()["pagination"]["total_count"] == 1
+
+
+async def test_many_concurrent_toggles_keep_counts_exact(client, auth_headers, statements):
+    # 사용자 16명 x 피드 8개 좋아요 + 사용자 16명 x 8명 팔로우 = 라운드당 256 개의 토글
+    async with AsyncSessionLocal() as db:
+        db.add_all(
+            User(email=f"user{i}@test.com", password="-", nickname=f"user{i}") for i in range(16)
+        )
+        await db.commit()
+        users = (await db.execute(select(User.id, User.email).order_by(User.id))).all()
+    feed_ids = [await create_feed(client, auth_headers[0]) for _ in range(8)]
+
+    likes = [(user, feed_id) for user in users for feed_id in feed_ids]
+    follows = [
+        (user.id, users[(index + step) % len(users)].id)
+        for index, user in enumerate(users)
+        for step in range(1, 9)
+    ]
+    # NullPool 이라 토글마다 연결을 하나씩 연다 - max_connections 안에서 동시에 실행
+    slots = asyncio.Semaphore(50)
+
+    async def like(user, feed_id):
+        async with slots, AsyncSessionLocal() as db:
+            await toggle_like(db, user.email, user.id, feed_id=feed_id)
+
+    async def follow(follower_id, following_id):
+        async with slots, AsyncSessionLocal() as db:
+            await toggle_follow(db, follower_id, following_id)
+
+    # 두 번째 라운드는 일부를 다시 토글해 취소 경로도 함께 겹치게 한다
+    for round_likes, round_follows in ((likes, follows), (likes[::3], follows[::3])):
+        statements.clear()
+        await asyncio.gather(
+            *[like(*pair) for pair in round_likes], *[follow(*pair) for pair in round_follows]
+        )
+        # 같은 행을 동시에 토글하지 않으면 토글 하나가 한 문장으로 끝나야 한다
+        assert len(statements) == len(round_likes) + len(round_follows)
+
+    async with AsyncSessionLocal() as db:
+        for feed_id in feed_ids:
+            rows = await db.scalar(
+                select(func.count()).select_from(Like).where(Like.feed_id == feed_id)
+            )
+            like_count = await db.scalar(select(Feed.like_count).where(Feed.id == feed_id))
+            assert like_count == rows
+
+        for user in users:
+            for scope, column in (
+                (counter_service.FOLLOWERS, Follow.following_id),
+                (counter_service.FOLLOWINGS, Follow.follower_id),
+            ):
+                rows = await db.scalar(
+                    select(func.count()).select_from(Follow).where(column == user.id)
+                )
+                cached = await db.scalar(counter_service.cached_count_query(scope, user.id))
+                assert cached == rows